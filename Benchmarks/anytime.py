@@ -0,0 +1,38 @@
+import sys
+import numpy as np
+from time import perf_counter
+from vagabond.systems import node
+from vagabond.environmental import gridenv, astar, arastar
+
+#! Anytime planning benchmark ------------------------------------------
+# Gives ARA* growing deadlines on a large map and reports the cost and the
+# suboptimality bound of the path it returns, next to a full A* query.
+
+size = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+deadlines = [float(deadline) for deadline in sys.argv[2:]] or [0.01, 0.05, 0.2, 1.0, 5.0]
+
+rng = np.random.default_rng(0)
+costs = rng.uniform(1, 3, (size, size))
+costs[rng.random((size, size)) < 0.25] = np.inf
+start, end = (0, 0), (size - 1, size - 1)
+costs[start] = costs[end] = 1
+
+grid = gridenv(costs)
+
+def heuristic(a, b):
+    return grid.min_cost * (abs(a[0] - b[0]) + abs(a[1] - b[1]))
+
+started = perf_counter()
+optimal = astar(grid.neighbors, heuristic=heuristic).path(node(value=start), node(value=end))
+print("{0}x{0} grid, astar: cost {1:.2f} in {2:.3f} s".format(size, optimal[-1].cost, perf_counter() - started))
+
+for deadline in deadlines:
+    planner = arastar(grid.neighbors, heuristic, weight=3.0, weight_step=0.5)
+    started = perf_counter()
+    path = planner.path(node(value=start), node(value=end), max_time=deadline)
+    elapsed = perf_counter() - started
+    if path is None:
+        print("deadline {:>6.3f} s: no path yet".format(deadline))
+        continue
+    print("deadline {:>6.3f} s: cost {:>8.2f} ({:.3f} x optimal), bound {:.3f}, returned after {:.3f} s".format(
+        deadline, path[-1].cost, path[-1].cost / optimal[-1].cost, planner.bound, elapsed))
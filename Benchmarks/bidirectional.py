@@ -0,0 +1,51 @@
+import sys
+import numpy as np
+from time import perf_counter
+from vagabond.systems import node, pathnode
+from vagabond.environmental import gridenv, dijkstra, bfs, biastar, bidijkstra, bibfs
+
+#! Bidirectional search benchmark --------------------------------------
+# Tiles the 5x5 free space grid of the Examples into a large map and compares
+# the expansions of the one-way and bidirectional searches across its middle.
+
+tiles = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+
+#example free space grids (1 is free, 0 is occupied)
+free_space_grid = np.array([
+    [1, 0.8, 0.5, 0.5, 0.8],
+    [0.9, 0, 0, 0.8, 0.6],
+    [0, 0.8, 0.9, 0.9, 0.9],
+    [0.8, 0.9, 0, 0, 0.9],
+    [0.6, 0.5, 0.2, 0.2, 1]
+])
+free_space_grid = np.tile(free_space_grid, (tiles, tiles))
+size = free_space_grid.shape[0]
+
+grid = gridenv(gridenv.free_space_costs(free_space_grid))
+costs = grid.grid
+
+# Edges into a cell cost as much as entering it, so the backward search needs the reverse edges
+def get_reverse_neighbors(child_node):
+    cost = costs[child_node.value]
+    return [pathnode(value=neighbor.value, cost=cost) for neighbor in grid.neighbors(child_node)]
+
+def heuristic(a, b):
+    return grid.min_cost * (abs(a[0] - b[0]) + abs(a[1] - b[1]))
+
+low, high = size // 4, 3 * size // 4
+pairs = [(node(value=(low, low)), node(value=(high, high))), (node(value=(low, high)), node(value=(high, low))),
+         (node(value=(size // 2, low)), node(value=(size // 2, high)))]
+
+def run(name, planner):
+    started = perf_counter()
+    planner.path_many(pairs)
+    elapsed = perf_counter() - started
+    expansions = sum(stats['expansions'] for stats in planner.stats)
+    print("{:<12} {:>9} expansions  {:>8.3f} s".format(name, expansions, elapsed))
+
+print("{0}x{0} grid".format(size))
+run("dijkstra", dijkstra(grid.neighbors))
+run("bidijkstra", bidijkstra(grid.neighbors, get_reverse_neighbors))
+run("biastar", biastar(grid.neighbors, heuristic, get_reverse_neighbors))
+run("bfs", bfs(grid.neighbors))
+run("bibfs", bibfs(grid.neighbors, get_reverse_neighbors))
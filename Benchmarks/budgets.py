@@ -0,0 +1,41 @@
+import sys
+import numpy as np
+from vagabond.systems import node
+from vagabond.environmental import gridenv, astar
+
+#! Bounded search benchmark --------------------------------------------
+# Queries a goal walled off from the start on a large map. Without a budget
+# every planner explores the whole reachable map before it gives up; with an
+# expansion or time budget it fails fast and returns a partial path.
+
+size = int(sys.argv[1]) if len(sys.argv) > 1 else 400
+max_expansions = int(sys.argv[2]) if len(sys.argv) > 2 else 5000
+max_time = float(sys.argv[3]) if len(sys.argv) > 3 else 0.01
+
+rng = np.random.default_rng(0)
+costs = rng.uniform(1, 3, (size, size))
+costs[rng.random((size, size)) < 0.2] = np.inf
+start, end = (0, 0), (size - 5, size - 5)
+costs[start] = costs[end] = 1
+costs[size - 10:, size - 10] = np.inf
+costs[size - 10, size - 10:] = np.inf
+
+grid = gridenv(costs, connectivity=8)
+
+def heuristic(a, b):
+    return grid.min_cost * max(abs(a[0] - b[0]), abs(a[1] - b[1]))
+
+def report(label, result):
+    closest = result.partial[-1].value if result.partial else None
+    print("{:<28} {:<9} {:>8} expansions {:>8.4f} s  closest {}".format(label, result.status, result.expansions, result.time, closest))
+
+print("{0}x{0} grid, goal walled off".format(size))
+for algorithm in ('astar', 'dijkstra', 'bfs'):
+    report("grid " + algorithm, grid.search(start, end, algorithm))
+    report("grid {} {} exp".format(algorithm, max_expansions), grid.search(start, end, algorithm, max_expansions=max_expansions))
+    report("grid {} {} s".format(algorithm, max_time), grid.search(start, end, algorithm, max_time=max_time))
+
+planner = astar(grid.neighbors, heuristic=heuristic)
+report("astar", planner.search(node(value=start), node(value=end)))
+report("astar {} exp".format(max_expansions), planner.search(node(value=start), node(value=end), max_expansions=max_expansions))
+report("astar {} s".format(max_time), planner.search(node(value=start), node(value=end), max_time=max_time))
@@ -0,0 +1,52 @@
+import sys
+import random
+from time import perf_counter
+from vagabond.systems import node, pathnode
+from vagabond.environmental import dijkstra
+from vagabond.contraction import chgraph
+
+#! Contraction hierarchy benchmark -------------------------------------
+# Builds a road-like graph (a lattice of two-way streets with random lengths and
+# some streets missing), contracts it once and compares the query throughput
+# to dijkstra on the same random point-to-point queries.
+
+side = int(sys.argv[1]) if len(sys.argv) > 1 else 60
+queries = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+
+random.seed(0)
+edges = []
+for x in range(side):
+    for y in range(side):
+        for nx, ny in ((x + 1, y), (x, y + 1)):
+            if nx < side and ny < side and random.random() < 0.85:
+                length = random.uniform(1, 10)
+                edges.append(((x, y), (nx, ny), length))
+                edges.append(((nx, ny), (x, y), length))
+
+adjacency = {}
+for a, b, cost in edges:
+    adjacency.setdefault(a, []).append((b, cost))
+
+def get_neighbors(parent_node):
+    return [pathnode(value=value, cost=cost) for value, cost in adjacency.get(parent_node.value, ())]
+
+started = perf_counter()
+hierarchy = chgraph(edges=edges)
+print("{} nodes, {} edges, {} shortcuts, built in {:.2f} s".format(len(hierarchy.values), len(edges), hierarchy.shortcuts, perf_counter() - started))
+
+values = hierarchy.values
+pairs = [(node(value=random.choice(values)), node(value=random.choice(values))) for _ in range(queries)]
+
+def run(name, planner):
+    started = perf_counter()
+    paths = planner.path_many(pairs)
+    elapsed = perf_counter() - started
+    expansions = sum(stats['expansions'] for stats in planner.stats)
+    print("{:<10} {:>9.0f} queries/s  {:>8.0f} expansions per query".format(name, queries / elapsed, expansions / queries))
+    return [path[-1].cost if path else None for path in paths]
+
+costs = run("chgraph", hierarchy)
+references = run("dijkstra", dijkstra(get_neighbors))
+mismatches = sum(1 for cost, reference in zip(costs, references)
+                 if (cost is None) != (reference is None) or (cost is not None and abs(cost - reference) > 1e-9))
+print("mismatches: {}".format(mismatches))
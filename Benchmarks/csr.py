@@ -0,0 +1,56 @@
+import sys
+import random
+from time import perf_counter
+from vagabond.systems import node, pathnode
+from vagabond.environmental import dijkstra, astar
+from vagabond.graph import csrgraph
+
+#! CSR graph benchmark -------------------------------------------------
+# Compares an adjacency list behind a get_neighbors callback to the same graph
+# in a csrgraph, in memory and in the time of a batch of dijkstra queries.
+
+side = int(sys.argv[1]) if len(sys.argv) > 1 else 80
+queries = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+
+# A lattice of two-way streets with random lengths and some streets missing
+random.seed(0)
+edges = []
+for x in range(side):
+    for y in range(side):
+        for nx, ny in ((x + 1, y), (x, y + 1)):
+            if nx < side and ny < side and random.random() < 0.85:
+                length = float(random.randint(1, 10))
+                edges.append(((x, y), (nx, ny), length))
+                edges.append(((nx, ny), (x, y), length))
+
+adjacency = {}
+for a, b, cost in edges:
+    adjacency.setdefault(a, []).append((b, cost))
+
+def get_neighbors(parent_node):
+    return [pathnode(value=value, parent=parent_node, cost=cost) for value, cost in adjacency.get(parent_node.value, ())]
+
+def manhattan(a, b):
+    return abs(a[0] - b[0]) + abs(a[1] - b[1])
+
+graph = csrgraph.from_edges(edges)
+arrays = graph.offsets.nbytes + graph.targets.nbytes + graph.weights.nbytes
+lists = sys.getsizeof(adjacency) + sum(sys.getsizeof(targets) + len(targets) * (sys.getsizeof((None, None)) + sys.getsizeof(1.0))
+                                       for targets in adjacency.values())
+print("{} nodes, {} edges: {:.0f} KB of CSR arrays, {:.0f} KB of adjacency lists".format(len(graph), len(edges), arrays / 1024, lists / 1024))
+
+values = list(adjacency)
+pairs = [(node(value=random.choice(values)), node(value=random.choice(values))) for _ in range(queries)]
+
+def run(name, planner):
+    started = perf_counter()
+    paths = planner.path_many(pairs)
+    elapsed = perf_counter() - started
+    print("{:<18} {:>8.4f} s per query".format(name, elapsed / queries))
+    return [path[-1].cost if path else None for path in paths]
+
+references = run("dijkstra callback", dijkstra(get_neighbors))
+costs = run("dijkstra csrgraph", dijkstra(graph))
+run("astar callback", astar(get_neighbors, heuristic=manhattan))
+run("astar csrgraph", astar(graph, heuristic=manhattan))
+print("mismatches: {}".format(sum(1 for cost, reference in zip(costs, references) if cost != reference)))
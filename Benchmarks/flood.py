@@ -0,0 +1,47 @@
+import sys
+import numpy as np
+from time import perf_counter
+from vagabond.environmental import gridenv
+
+#! Flood fill benchmark ------------------------------------------------
+# Hop counts from one cell to the whole map: the flat bfs expands one cell at
+# a time, the level-synchronous tree(algorithm='bfs') a whole frontier at a
+# time with NumPy. An open map has wide frontiers and few levels; a serpentine
+# maze has a frontier of one cell and as many levels as cells.
+
+size = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+maze_size = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+
+def walled(costs):
+    # The goal in the corner is walled off, so the flat bfs visits every reachable cell
+    n = costs.shape[0]
+    costs[n - 2:, n - 2] = np.inf
+    costs[n - 2, n - 2:] = np.inf
+    costs[0, 0] = costs[n - 1, n - 1] = 1
+    return costs
+
+rng = np.random.default_rng(0)
+open_map = np.ones((size, size))
+open_map[rng.random((size, size)) < 0.2] = np.inf
+
+maze = np.ones((maze_size, maze_size))
+for row in range(1, maze_size - 2, 2):
+    maze[row, :] = np.inf
+    maze[row, maze_size - 1 if row % 4 == 1 else 0] = 1
+
+for label, costs, connectivity in (("open {0}x{0}".format(size), walled(open_map), 8), ("maze {0}x{0}".format(maze_size), walled(maze), 4)):
+    grid = gridenv(costs, connectivity)
+    n = costs.shape[0]
+
+    started = perf_counter()
+    result = grid.search((0, 0), (n - 1, n - 1), 'bfs')
+    flat_time = perf_counter() - started
+
+    started = perf_counter()
+    tree = grid.tree((0, 0), algorithm='bfs')
+    flood_time = perf_counter() - started
+
+    reached = int(np.isfinite(tree.distances).sum())
+    levels = int(tree.distances[np.isfinite(tree.distances)].max())
+    print("{:<14} {:>8} cells {:>7} levels  flat bfs {:>8.4f} s  flood {:>8.4f} s  x{:.1f}".format(
+        label, reached, levels, flat_time, flood_time, flat_time / flood_time))
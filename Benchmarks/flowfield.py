@@ -0,0 +1,56 @@
+import sys
+import random
+import numpy as np
+from time import perf_counter
+from vagabond.environmental import gridenv
+from vagabond.flowfield import flowfield
+
+#! Flow field benchmark ------------------------------------------------
+# Routes many agents to one dock: one A* query per agent against one flow
+# field for the goal, followed by every agent.
+
+size = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+agents = int(sys.argv[2]) if len(sys.argv) > 2 else 300
+
+rng = np.random.default_rng(0)
+costs = rng.uniform(1, 2, (size, size))
+costs[rng.random((size, size)) < 0.2] = np.inf
+dock = (size // 2, size // 2)
+costs[dock] = 1
+
+grid = gridenv(costs, connectivity=8)
+random.seed(0)
+free = [tuple(cell) for cell in np.argwhere(np.isfinite(costs))]
+starts = [random.choice(free) for _ in range(agents)]
+
+started = perf_counter()
+paths = grid.path_many([(start, dock) for start in starts])
+astar_time = perf_counter() - started
+
+started = perf_counter()
+field = flowfield(grid, dock)
+build_time = perf_counter() - started
+started = perf_counter()
+field_paths = [field.path(start) for start in starts]
+extract_time = perf_counter() - started
+
+# Move every agent one step at a time until they all stop
+started = perf_counter()
+cells = np.array(starts)
+steps = 0
+while True:
+    moved = field.step(cells)
+    if np.array_equal(moved, cells):
+        break
+    cells = moved
+    steps += 1
+step_time = perf_counter() - started
+
+mismatches = sum(1 for path, field_path in zip(paths, field_paths)
+                 if (path is None) != (field_path is None) or (path is not None and abs(path[-1].cost - field_path[-1].cost) > 1e-9))
+print("{0}x{0} grid, {1} agents".format(size, agents))
+print("{:<22} {:>8.3f} s".format("astar per agent", astar_time))
+print("{:<22} {:>8.3f} s".format("flowfield build", build_time))
+print("{:<22} {:>8.3f} s".format("flowfield paths", extract_time))
+print("{:<22} {:>8.3f} s  ({} batched steps)".format("flowfield steps", step_time, steps))
+print("mismatches: {}".format(mismatches))
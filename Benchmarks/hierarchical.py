@@ -0,0 +1,48 @@
+import sys
+import random
+import numpy as np
+from time import perf_counter
+from vagabond.hierarchical import hpastar
+
+#! Hierarchical pathfinding benchmark ----------------------------------
+# Builds the HPA* abstraction of a random obstacle map once, then compares its
+# long cross-map queries to the flat A* of gridenv in expansions, time and cost.
+
+size = int(sys.argv[1]) if len(sys.argv) > 1 else 512
+cluster_size = int(sys.argv[2]) if len(sys.argv) > 2 else 32
+queries = int(sys.argv[3]) if len(sys.argv) > 3 else 20
+
+rng = np.random.default_rng(0)
+costs = np.ones((size, size))
+costs[rng.random((size, size)) < 0.25] = np.inf
+
+started = perf_counter()
+planner = hpastar(costs, cluster_size=cluster_size)
+print("{0}x{0} grid, {1}x{1} clusters, {2} entrances, built in {3:.2f} s".format(size, cluster_size, planner.entrances(), perf_counter() - started))
+
+# Long queries between opposite sides of the map
+random.seed(0)
+free = np.argwhere(np.isfinite(planner.grid))
+left = [tuple(cell) for cell in free[free[:, 1] < size // 8]]
+right = [tuple(cell) for cell in free[free[:, 1] >= size - size // 8]]
+pairs = [(random.choice(left), random.choice(right)) for _ in range(queries)]
+
+paths = []
+expansions = 0
+started = perf_counter()
+for start, end in pairs:
+    paths.append(planner.path(start, end))
+    expansions += planner.expansions
+hierarchical_time = perf_counter() - started
+
+environment = planner.environment
+started = perf_counter()
+references = environment.path_many(pairs, algorithm='astar')
+flat_time = perf_counter() - started
+
+found = [(path, reference) for path, reference in zip(paths, references) if reference is not None]
+ratio = max(path[-1].cost / reference[-1].cost for path, reference in found) if found else 1.0
+print("{:<8} {:>8.4f} s per query  {:>9.0f} expansions per query".format("hpastar", hierarchical_time / queries, expansions / queries))
+print("{:<8} {:>8.4f} s per query  {:>9.0f} expansions per query".format("astar", flat_time / queries,
+      sum(stats['expansions'] for stats in environment.stats) / queries))
+print("worst cost ratio {:.3f}".format(ratio))
@@ -0,0 +1,70 @@
+import sys
+import random
+import numpy as np
+from time import perf_counter
+from vagabond.systems import node
+from vagabond.environmental import gridenv, dstarlite
+
+#! Incremental replanning benchmark ------------------------------------
+# Changes a few random cells of a map between queries, as an occupancy grid
+# update would, and compares the D* Lite repair to planning again from scratch.
+
+size = int(sys.argv[1]) if len(sys.argv) > 1 else 150
+updates = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+changed_cells = int(sys.argv[3]) if len(sys.argv) > 3 else 5
+
+rng = np.random.default_rng(0)
+costs = rng.uniform(1, 2, (size, size))
+costs[rng.random((size, size)) < 0.2] = np.inf
+start, end = (0, 0), (size - 1, size - 1)
+costs[start] = costs[end] = 1
+
+grid = gridenv(costs)
+cells = grid.grid
+
+def heuristic(a, b):
+    return grid.min_cost * (abs(a[0] - b[0]) + abs(a[1] - b[1]))
+
+# Every update toggles a few cells away from the start and the end
+random.seed(0)
+batches = []
+for _ in range(updates):
+    batch = []
+    while len(batch) < changed_cells:
+        cell = (random.randrange(size), random.randrange(size))
+        if cell != start and cell != end:
+            batch.append(cell)
+    batches.append(batch)
+
+incremental = dstarlite(grid.neighbors, heuristic, grid.reverse_neighbors)
+repair_time = 0
+scratch_time = 0
+astar_time = 0
+mismatches = 0
+incremental.path(node(value=start), node(value=end))
+
+for batch in batches:
+    for cell in batch:
+        cells[cell] = 1.5 if cells[cell] == np.inf else np.inf
+
+    started = perf_counter()
+    incremental.update(batch)
+    path = incremental.path(node(value=start), node(value=end))
+    repair_time += perf_counter() - started
+
+    started = perf_counter()
+    dstarlite(grid.neighbors, heuristic, grid.reverse_neighbors).path(node(value=start), node(value=end))
+    scratch_time += perf_counter() - started
+
+    started = perf_counter()
+    reference = grid.path(node(value=start), node(value=end), algorithm='astar')
+    astar_time += perf_counter() - started
+
+    if (path is None) != (reference is None) or (path is not None and abs(path[-1].cost - reference[-1].cost) > 1e-9):
+        mismatches += 1
+
+print("{0}x{0} grid, {1} updates of {2} cells".format(size, updates, changed_cells))
+print("{:<22} {:>8.4f} s per update".format("dstarlite repair", repair_time / updates))
+print("{:<22} {:>8.4f} s per update".format("dstarlite from scratch", scratch_time / updates))
+print("{:<22} {:>8.4f} s per update".format("gridenv astar", astar_time / updates))
+print("mismatches: {}".format(mismatches))
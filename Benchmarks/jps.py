@@ -0,0 +1,32 @@
+import sys
+import numpy as np
+from time import perf_counter
+from vagabond.environmental import gridenv
+
+#! Jump point search benchmark -----------------------------------------
+# Compares A* and jump point search on uniform-cost grids: an open warehouse
+# with long shelves and a grid with random obstacles.
+
+size = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+
+warehouse = np.ones((size, size))
+for row in range(size // 20, size - size // 20, size // 20):
+    warehouse[row, size // 50:size - size // 50] = np.inf
+    warehouse[row, size // 2:size // 2 + 3] = 1
+
+rng = np.random.default_rng(0)
+scattered = np.where(rng.random((size, size)) < 0.1, np.inf, 1.0)
+scattered[0, 0] = scattered[-1, -1] = 1
+
+pairs = [((0, 0), (size - 1, size - 1)), ((size // 100, size // 2), (size - size // 100 - 1, size // 3))]
+
+for name, grid in (("warehouse", warehouse), ("scattered", scattered)):
+    for connectivity in (4, 8):
+        environment = gridenv(grid, connectivity)
+        for algorithm in ('astar', 'jps'):
+            started = perf_counter()
+            environment.path_many(pairs, algorithm)
+            elapsed = perf_counter() - started
+            expansions = sum(stats['expansions'] for stats in environment.stats)
+            costs = ", ".join("{:.2f}".format(stats['cost']) for stats in environment.stats if stats['found'])
+            print("{:<10} {}-connected {:<6} {:>9} expansions  {:>7.3f} s  costs {}".format(name, connectivity, algorithm, expansions, elapsed, costs))
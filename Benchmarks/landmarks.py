@@ -0,0 +1,47 @@
+import sys
+import random
+import numpy as np
+from time import perf_counter
+from vagabond.systems import node
+from vagabond.environmental import gridenv, astar, dijkstra
+from vagabond.landmarks import landmarks
+
+#! Landmark heuristic benchmark ----------------------------------------
+# Builds a maze-like map of long walls with a single gap each, where the distance
+# between coordinates is a poor estimate, and compares the expansions of A*
+# with the Manhattan distance and with the landmark heuristic.
+
+size = int(sys.argv[1]) if len(sys.argv) > 1 else 81
+count = int(sys.argv[2]) if len(sys.argv) > 2 else 8
+queries = int(sys.argv[3]) if len(sys.argv) > 3 else 30
+
+# Every fourth row is a wall with one gap, alternating between the two sides
+random.seed(0)
+costs = np.ones((size, size))
+for row in range(2, size - 1, 4):
+    costs[row, :] = np.inf
+    gap = random.randrange(size // 4) if row % 8 == 2 else size - 1 - random.randrange(size // 4)
+    costs[row, gap] = 1
+
+grid = gridenv(costs)
+free = [tuple(cell) for cell in np.argwhere(np.isfinite(costs))]
+
+def manhattan(a, b):
+    return abs(a[0] - b[0]) + abs(a[1] - b[1])
+
+started = perf_counter()
+heuristic = landmarks(grid.neighbors, node(value=free[0]), count, grid.reverse_neighbors)
+print("{0}x{0} maze, {1} landmarks over {2} cells, built in {3:.2f} s".format(size, count, len(free), perf_counter() - started))
+
+pairs = [(node(value=random.choice(free)), node(value=random.choice(free))) for _ in range(queries)]
+
+def run(name, planner):
+    started = perf_counter()
+    planner.path_many(pairs)
+    elapsed = perf_counter() - started
+    expansions = sum(stats['expansions'] for stats in planner.stats)
+    print("{:<10} {:>9} expansions  {:>8.3f} s".format(name, expansions, elapsed))
+
+run("dijkstra", dijkstra(grid.neighbors))
+run("manhattan", astar(grid.neighbors, heuristic=manhattan))
+run("landmarks", astar(grid.neighbors, heuristic=heuristic))
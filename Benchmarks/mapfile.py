@@ -0,0 +1,46 @@
+import os
+import sys
+import tempfile
+import numpy as np
+from time import perf_counter
+from vagabond.environmental import gridenv
+from vagabond import mapfile
+
+#! Map file startup benchmark ------------------------------------------
+# Compares the startup of a planner that builds its gridenv from a .npy cost
+# grid (read, validate and scan the whole grid) to opening a map file, which
+# only maps the grid and reads it page by page as queries touch it.
+
+size = int(sys.argv[1]) if len(sys.argv) > 1 else 4000
+
+rng = np.random.default_rng(0)
+costs = rng.uniform(1, 3, (size, size))
+costs[rng.random((size, size)) < 0.2] = np.inf
+
+directory = tempfile.mkdtemp()
+array_file = os.path.join(directory, "costs.npy")
+map_file = os.path.join(directory, "costs.map")
+np.save(array_file, costs)
+mapfile.save(map_file, gridenv(costs))
+del costs
+
+started = perf_counter()
+from_array = gridenv(np.load(array_file))
+array_time = perf_counter() - started
+
+started = perf_counter()
+from_map = mapfile.load(map_file)
+map_time = perf_counter() - started
+
+print("{0}x{0} grid, {1:.0f} MB".format(size, from_map.grid.nbytes / 2 ** 20))
+print("{:<16} {:>10.4f} s".format("np.load + gridenv", array_time))
+print("{:<16} {:>10.4f} s".format("mapfile.load", map_time))
+
+start, end = (size // 2, size // 2), (size // 2 + 50, size // 2 + 50)
+costs = [path[-1].cost if path else None for path in (from_array.path(start, end), from_map.path(start, end))]
+print("same path cost: {}".format(costs[0] == costs[1]))
+
+del from_array, from_map
+os.remove(array_file)
+os.remove(map_file)
+os.rmdir(directory)
@@ -0,0 +1,41 @@
+import sys
+import tracemalloc
+import numpy as np
+from time import perf_counter
+from vagabond.systems import node
+from vagabond.environmental import gridenv, astar, idastar, smastar
+
+#! Memory-bounded search benchmark -------------------------------------
+# Reports the peak memory traced during one query of astar, idastar and
+# smastar with a few node caps, on a grid with scattered obstacles where
+# the heuristic is close to the true cost. idastar gets a time budget, as
+# it expands the many equal paths of a grid again and again.
+
+size = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+max_time = float(sys.argv[2]) if len(sys.argv) > 2 else 10.0
+caps = [int(cap) for cap in sys.argv[3:]] or [20000, 2000, 500]
+
+rng = np.random.default_rng(0)
+costs = np.ones((size, size))
+costs[rng.random((size, size)) < 0.1] = np.inf
+start, end = (0, 0), (size - 1, size - 1)
+costs[start] = costs[end] = 1
+
+grid = gridenv(costs)
+
+def heuristic(a, b):
+    return abs(a[0] - b[0]) + abs(a[1] - b[1])
+
+planners = [("astar", astar(grid.neighbors, heuristic=heuristic)), ("idastar", idastar(grid.neighbors, heuristic))]
+planners += [("smastar {}".format(cap), smastar(grid.neighbors, heuristic, max_nodes=cap)) for cap in caps]
+
+print("{0}x{0} grid".format(size))
+for label, planner in planners:
+    tracemalloc.start()
+    started = perf_counter()
+    result = planner.search(node(value=start), node(value=end), max_time=max_time)
+    elapsed = perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    cost = "{:.1f}".format(result.cost) if result else result.status
+    print("{:<14} cost {:>8}  {:>9} expansions  peak {:>9.1f} KiB  {:.3f} s".format(label, cost, result.expansions, peak / 1024, elapsed))
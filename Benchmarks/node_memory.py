@@ -0,0 +1,35 @@
+import sys
+import tracemalloc
+from vagabond.systems import node, pathnode
+
+#! Node memory benchmark ---------------------------------------------
+# Measures the memory taken per node, excluding the list that holds them.
+# Targets on 64-bit CPython: node <= 128 bytes, pathnode <= 72 bytes.
+
+count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+
+# A node with an instance dictionary, for reference
+class dict_node:
+    def __init__(self, value=None, childs=None, parent=None, cost=0, name=None):
+        self.childs = [] if childs is None else childs
+        self.value = value
+        self.name = name
+        self.parent = parent
+        self.cost = cost
+
+def measure(make):
+    tracemalloc.start()
+    nodes = [make() for _ in range(count)]
+    used = tracemalloc.get_traced_memory()[0] - sys.getsizeof(nodes)
+    tracemalloc.stop()
+    return used / count
+
+results = {
+    "dict node": measure(dict_node),
+    "node": measure(node),
+    "pathnode": measure(pathnode),
+}
+
+print("Nodes created: {}".format(count))
+for name, size in results.items():
+    print("{:<10} {:>8.1f} bytes/node  ({:.1f} MB per million)".format(name, size, size * 1e6 / 2**20))
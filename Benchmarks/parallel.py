@@ -0,0 +1,33 @@
+import os
+import sys
+import numpy as np
+from time import perf_counter
+from vagabond.environmental import gridenv
+from vagabond.parallel import gridpool
+
+#! Parallel planning benchmark ----------------------------------------
+# Plans the same batch with 1, 2, 4, ... worker processes and reports the speedup.
+
+size = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+queries = int(sys.argv[2]) if len(sys.argv) > 2 else 400
+
+if __name__ == "__main__":
+    rng = np.random.default_rng(0)
+    free_space_grid = np.where(rng.random((size, size)) < 0.2, 0, rng.random((size, size)))
+    costs = gridenv.free_space_costs(free_space_grid)
+    free = np.argwhere(free_space_grid > 0)
+    pairs = [(tuple(free[a]), tuple(free[b])) for a, b in rng.integers(0, len(free), (queries, 2))]
+
+    started = perf_counter()
+    gridenv(costs).path_many(pairs, raw=True)
+    serial = perf_counter() - started
+    print("serial       {:>9.1f} q/s".format(queries / serial))
+
+    processes = 1
+    while processes <= (os.cpu_count() or 1):
+        with gridpool(costs, processes=processes) as pool:
+            started = perf_counter()
+            pool.path_many(pairs)
+            elapsed = perf_counter() - started
+        print("{:>2} processes {:>9.1f} q/s   x{:.2f}".format(processes, queries / elapsed, serial / elapsed))
+        processes *= 2
@@ -0,0 +1,53 @@
+import sys
+import numpy as np
+from time import perf_counter
+from vagabond.systems import node
+from vagabond.environmental import gridenv, astar, dijkstra, bfs
+
+#! Batch query benchmark ---------------------------------------------
+# Compares path_many against a loop of single path() calls, in queries/second.
+# Both sides run on the same planner instance with the same cache settings,
+# and the neighbor cache is emptied before each side, so the only difference
+# is the batch.
+
+size = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+queries = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+
+rng = np.random.default_rng(0)
+free_space_grid = np.where(rng.random((size, size)) < 0.2, 0, rng.random((size, size)))
+free = np.argwhere(free_space_grid > 0)
+pairs = [(tuple(free[a]), tuple(free[b])) for a, b in rng.integers(0, len(free), (queries, 2))]
+
+def report(name, looped, batched):
+    print("{:<24} loop {:>9.1f} q/s   path_many {:>9.1f} q/s   x{:.2f}".format(name, queries / looped, queries / batched, looped / batched))
+
+#! Grid environment ---------------------------------------------------
+
+grid = gridenv(gridenv.free_space_costs(free_space_grid))
+for algorithm in ('astar', 'dijkstra', 'bfs'):
+    started = perf_counter()
+    for start, end in pairs:
+        grid.path(start, end, algorithm)
+    looped = perf_counter() - started
+
+    started = perf_counter()
+    grid.path_many(pairs, algorithm)
+    batched = perf_counter() - started
+    report("gridenv " + algorithm, looped, batched)
+
+#! get_neighbors environments ----------------------------------------
+
+node_pairs = [(node(value=start), node(value=end)) for start, end in pairs]
+for planner in (astar, dijkstra, bfs):
+    for cache_size in (None, size * size):
+        environment = planner(grid.neighbors, cache_size=cache_size)
+        started = perf_counter()
+        for start, end in node_pairs:
+            environment.path(start, end)
+        looped = perf_counter() - started
+
+        environment.invalidate()
+        started = perf_counter()
+        environment.path_many(node_pairs)
+        batched = perf_counter() - started
+        report(planner.__name__ + (" (cached)" if cache_size else ""), looped, batched)
@@ -0,0 +1,242 @@
+import sys
+import os
+import json
+import platform
+import subprocess
+import tracemalloc
+import numpy as np
+from time import perf_counter, strftime
+from vagabond.systems import pathnode
+from vagabond.environmental import gridenv, astar, dijkstra, bfs, dfs, biastar, bidijkstra, bibfs
+from vagabond.graph import csrgraph
+
+#! Benchmark suite -----------------------------------------------------
+# Runs every planner on random, maze, open-field and corridor grids and on
+# random sparse graphs, from 10^2 cells up to a maximum size, and writes the
+# time, expansions, status and peak traced memory of every run to a JSON
+# report. Two reports, e.g. of two commits, are compared with 'compare'.
+#
+#   python suite.py run [report.json] [max_cells] [max_time] [label]
+#   python suite.py compare old.json new.json [threshold]
+#
+# Maps are generated from a fixed seed, so runs are reproducible. Every query
+# goes through search() with max_time, so a planner that is too slow for a
+# size reports 'budget' instead of hanging. Time is the best of a few runs of
+# the query, and memory comes from another run, as tracing memory slows the
+# search down. Node-based planners allocate a node object per expansion, so
+# past 10^5 cells they mostly measure their budget; the flat gridenv searches
+# and csrgraph runs reach 10^7.
+
+SEED = 0
+REPEATS = 3
+INF = float('inf')
+
+#! Maps ----------------------------------------------------------------
+
+# Uniform random costs with 20% of the cells blocked
+def random_grid(side, rng):
+    costs = rng.uniform(1, 3, (side, side))
+    costs[rng.random((side, side)) < 0.2] = np.inf
+    costs[0, 0] = costs[side - 1, side - 1] = 1
+    return costs, (0, 0), (side - 1, side - 1)
+
+# A perfect maze over the odd cells (binary tree algorithm): every cell opens to the north or to the west
+def maze_grid(side, rng):
+    side = max(side | 1, 5)
+    costs = np.full((side, side), np.inf)
+    costs[1::2, 1::2] = 1
+    rows, columns = np.meshgrid(np.arange(1, side - 1, 2), np.arange(1, side - 1, 2), indexing='ij')
+    north = rng.random(rows.shape) < 0.5
+    north[:, 0] = True
+    north[0, :] = False
+    west = ~north
+    west[0, 0] = False
+    costs[rows[north] - 1, columns[north]] = 1
+    costs[rows[west], columns[west] - 1] = 1
+    end = side - 2 if (side - 2) % 2 else side - 3
+    return costs, (1, 1), (end, end)
+
+# Uniform costs with 2% of the cells blocked
+def open_grid(side, rng):
+    costs = np.ones((side, side))
+    costs[rng.random((side, side)) < 0.02] = np.inf
+    costs[0, 0] = costs[side - 1, side - 1] = 1
+    return costs, (0, 0), (side - 1, side - 1)
+
+# Walls across every fourth row, each with two gaps, so paths run along long corridors
+def corridor_grid(side, rng):
+    costs = np.ones((side, side))
+    for row in range(3, side - 1, 4):
+        costs[row, :] = np.inf
+        costs[row, rng.integers(0, side, 2)] = 1
+    return costs, (0, 0), (side - 1, side - 1)
+
+# A ring through every node, so the last node is reachable, plus three random edges per node
+def random_graph(n, rng):
+    ring = np.arange(n, dtype=np.int64)
+    sources = np.concatenate([ring[:-1], np.repeat(ring, 3)])
+    targets = np.concatenate([ring[1:], rng.integers(0, n, 3 * n)])
+    weights = np.concatenate([np.full(n - 1, 10.0), rng.uniform(1, 10, 3 * n)])
+    order = np.argsort(sources, kind='stable')
+    offsets = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(sources, minlength=n), out=offsets[1:])
+    return csrgraph(offsets, targets[order], weights[order]), 0, n - 1
+
+GRIDS = [('random', random_grid), ('maze', maze_grid), ('open', open_grid), ('corridor', corridor_grid)]
+
+#! Planners ------------------------------------------------------------
+
+# The (name, query) pairs of a grid, every query returns a searchresult
+def grid_planners(grid, start, end, max_time):
+    octile = grid.connectivity == 8
+
+    def heuristic(a, b):
+        dx, dy = abs(a[0] - b[0]), abs(a[1] - b[1])
+        return grid.min_cost * (max(dx, dy) + 0.41421356 * min(dx, dy) if octile else dx + dy)
+
+    def node_query(planner):
+        return lambda: planner.search(pathnode(value=start), pathnode(value=end), max_time=max_time)
+
+    def flat_query(algorithm):
+        return lambda: grid.search(start, end, algorithm, max_time=max_time)
+
+    planners = [
+        ('astar', node_query(astar(grid.neighbors, heuristic=heuristic))),
+        ('dijkstra', node_query(dijkstra(grid.neighbors))),
+        ('bfs', node_query(bfs(grid.neighbors))),
+        ('dfs', node_query(dfs(grid.neighbors))),
+        ('biastar', node_query(biastar(grid.neighbors, heuristic, grid.reverse_neighbors))),
+        ('grid astar', flat_query('astar')),
+        ('grid dijkstra', flat_query('dijkstra')),
+        ('grid bfs', flat_query('bfs')),
+    ]
+    if grid.uniform_cost is not None:
+        planners.append(('grid jps', flat_query('jps')))
+    planners.append(('grid flood', lambda: flood(grid, start, end)))
+    return planners
+
+# The (name, query) pairs of a csrgraph
+def graph_planners(graph, start, end, max_time):
+
+    def query(planner):
+        return lambda: planner.search(pathnode(value=start), pathnode(value=end), max_time=max_time)
+
+    return [
+        ('dijkstra', query(dijkstra(graph))),
+        ('bfs', query(bfs(graph))),
+        ('dfs', query(dfs(graph))),
+        ('bidijkstra', query(bidijkstra(graph))),
+        ('bibfs', query(bibfs(graph))),
+    ]
+
+# The level-synchronous bfs tree of the start, reported as a query to the end
+def flood(grid, start, end):
+    tree = grid.tree(start, algorithm='bfs')
+    hops = tree.cost_to(end)
+    return {'status': 'found' if hops is not None else 'exhausted', 'cost': hops,
+            'expansions': int(np.isfinite(tree.distances).sum())}
+
+#! Runs ----------------------------------------------------------------
+
+# Run a query for its time, the best of up to REPEATS runs if it is fast, then once under tracemalloc for its peak memory
+def measure(query):
+    elapsed = INF
+    for _ in range(REPEATS):
+        started = perf_counter()
+        result = query()
+        elapsed = min(elapsed, perf_counter() - started)
+        if elapsed > 0.5:
+            break
+
+    tracemalloc.start()
+    query()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    if not isinstance(result, dict):
+        result = {'status': result.status, 'cost': result.cost, 'expansions': result.expansions}
+    return dict(result, time=elapsed, peak_bytes=peak)
+
+# Get the commit of the working tree, if it is a git repository
+def commit():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], cwd=os.path.dirname(os.path.abspath(__file__)),
+                                       stderr=subprocess.DEVNULL).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def run(filename, max_cells, max_time, label):
+    report = {
+        'meta': {'label': label, 'commit': commit(), 'created': strftime('%Y-%m-%dT%H:%M:%S'), 'python': platform.python_version(),
+                 'numpy': np.__version__, 'machine': platform.machine(), 'max_time': max_time, 'seed': SEED},
+        'results': [],
+    }
+    sizes = [10 ** exponent for exponent in range(2, 8) if 10 ** exponent <= max_cells]
+
+    print("{:<10} {:>9} {:<14} {:<10} {:>9} {:>10} {:>11}".format("map", "cells", "planner", "status", "expanded", "s", "peak KiB"))
+    for cells in sizes:
+        side = int(round(cells ** 0.5))
+        maps = [(name, make(side, np.random.default_rng(SEED))) for name, make in GRIDS]
+        maps.append(('graph', random_graph(cells, np.random.default_rng(SEED))))
+
+        for name, (item, start, end) in maps:
+            if name == 'graph':
+                planners = graph_planners(item, start, end, max_time)
+            else:
+                planners = grid_planners(gridenv(item, connectivity=8), start, end, max_time)
+            for planner, query in planners:
+                row = dict(map=name, cells=cells, planner=planner, **measure(query))
+                report['results'].append(row)
+                print("{:<10} {:>9} {:<14} {:<10} {:>9} {:>10.4f} {:>11.1f}".format(
+                    name, cells, planner, row['status'], row['expansions'], row['time'], row['peak_bytes'] / 1024), flush=True)
+
+    with open(filename, 'w') as file:
+        json.dump(report, file, indent=1)
+    print("Report written to {}".format(filename))
+
+def compare(old_filename, new_filename, threshold):
+    with open(old_filename) as file:
+        old = json.load(file)
+    with open(new_filename) as file:
+        new = json.load(file)
+
+    key = lambda row: (row['map'], row['cells'], row['planner'])
+    before = {key(row): row for row in old['results']}
+    regressions = 0
+    print("{} ({}) -> {} ({})".format(old_filename, old['meta'].get('commit'), new_filename, new['meta'].get('commit')))
+    print("{:<10} {:>9} {:<14} {:>10} {:>10} {:>7} {:>10} {:>7}  {}".format("map", "cells", "planner", "old s", "new s", "time", "expanded", "memory", ""))
+    for row in new['results']:
+        previous = before.get(key(row))
+        if previous is None:
+            continue
+        # A run stopped by its budget always takes its budget, so its speed is the expansions it got through
+        if row['status'] == previous['status'] == 'budget':
+            time_ratio = previous['expansions'] / max(row['expansions'], 1)
+        else:
+            time_ratio = row['time'] / max(previous['time'], 1e-9)
+        memory_ratio = row['peak_bytes'] / max(previous['peak_bytes'], 1)
+        flags = []
+        if row['status'] != previous['status']:
+            flags.append("{} -> {}".format(previous['status'], row['status']))
+        if time_ratio > threshold and max(row['time'], previous['time']) > 0.005:
+            flags.append("slower")
+        if memory_ratio > threshold and row['peak_bytes'] > 65536:
+            flags.append("more memory")
+        regressions += bool(flags)
+        print("{:<10} {:>9} {:<14} {:>10.4f} {:>10.4f} {:>6.2f}x {:>+10} {:>6.2f}x  {}".format(
+            row['map'], row['cells'], row['planner'], previous['time'], row['time'], time_ratio,
+            row['expansions'] - previous['expansions'], memory_ratio, ", ".join(flags)))
+    print("{} regression(s) over x{}".format(regressions, threshold))
+    return regressions
+
+if __name__ == '__main__':
+    if len(sys.argv) > 1 and sys.argv[1] == 'compare':
+        if len(sys.argv) < 4:
+            sys.exit("usage: python suite.py compare old.json new.json [threshold]")
+        sys.exit(1 if compare(sys.argv[2], sys.argv[3], float(sys.argv[4]) if len(sys.argv) > 4 else 1.25) else 0)
+    arguments = sys.argv[2:] if len(sys.argv) > 1 and sys.argv[1] == 'run' else sys.argv[1:]
+    filename = arguments[0] if len(arguments) > 0 else 'benchmark.json'
+    max_cells = int(float(arguments[1])) if len(arguments) > 1 else 10 ** 5
+    max_time = float(arguments[2]) if len(arguments) > 2 else 5.0
+    label = arguments[3] if len(arguments) > 3 else None
+    run(filename, max_cells, max_time, label)
@@ -0,0 +1,47 @@
+import sys
+import time
+import numpy as np
+from vagabond.systems import pathnode
+from vagabond.environmental import gridenv, bfs, dfs
+from vagabond.graph import csrgraph
+
+#! Traversal scaling benchmark ------------------------------------------
+# Runs bfs and dfs over the whole reachable map (the goal is walled off) on
+# grids of growing size. With constant-time frontier membership the time per
+# expanded cell stays flat as the map grows; a linear scan of the frontier
+# would make it grow with the size of the frontier.
+
+sizes = [int(size) for size in sys.argv[1].split(',')] if len(sys.argv) > 1 else [100, 200, 400]
+
+def run(planner, start, end):
+    began = time.perf_counter()
+    result = planner.search(start, end)
+    return result.expansions, time.perf_counter() - began
+
+print("{:<10} {:<14} {:>10} {:>10} {:>14}".format("size", "planner", "expanded", "s", "us per cell"))
+for size in sizes:
+    rng = np.random.default_rng(0)
+    costs = rng.uniform(1, 3, (size, size))
+    costs[rng.random((size, size)) < 0.2] = np.inf
+    costs[0, 0] = costs[size - 1, size - 1] = 1
+    costs[size - 2:, size - 2] = np.inf
+    costs[size - 2, size - 2:] = np.inf
+
+    grid = gridenv(costs, connectivity=8)
+    # The crawled graph, with the walled-off goal added as a node without edges
+    crawled = csrgraph.from_neighbors(grid.neighbors, pathnode(value=(0, 0)))
+    graph = csrgraph.from_edges(crawled.edges(), values=crawled.values + [(size - 1, size - 1)])
+    start, end = pathnode(value=(0, 0)), pathnode(value=(size - 1, size - 1))
+
+    rows = [
+        ("bfs", run(bfs(grid.neighbors), start, end)),
+        ("dfs", run(dfs(grid.neighbors), start, end)),
+        ("bfs csrgraph", run(bfs(graph), start, end)),
+        ("dfs csrgraph", run(dfs(graph), start, end)),
+    ]
+    began = time.perf_counter()
+    result = grid.search((0, 0), (size - 1, size - 1), 'bfs')
+    rows.append(("grid bfs", (result.expansions, time.perf_counter() - began)))
+
+    for label, (expansions, elapsed) in rows:
+        print("{:<10} {:<14} {:>10} {:>10.4f} {:>14.3f}".format("{0}x{0}".format(size), label, expansions, elapsed, 1e6 * elapsed / max(expansions, 1)))
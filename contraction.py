@@ -0,0 +1,400 @@
+from heapq import heappush, heappop
+from time import perf_counter
+import numpy as np
+from vagabond.systems import node, pathnode
+from vagabond.environmental import env, INF
+
+class chgraph:
+
+    """
+    A contraction hierarchy for fast point-to-point queries on a static graph.
+    Nodes are contracted one by one, least important first, and shortcut edges
+    keep the shortest path costs between the remaining nodes. A query is then a
+    bidirectional Dijkstra that only climbs to more important nodes, so it
+    settles a few hundred nodes where dijkstra settles most of the graph.
+    Paths are unpacked into the original edges and have the same cost as dijkstra.
+    The graph is given either through get_neighbors_func, explored from a root
+    node, or as an explicit list of (value_a, value_b, cost) directed edges.
+    As in dijkstra, the cost of every neighbor is the cost of the edge to it.
+    Args:
+        get_neighbors_func (function, optional): A function that returns the neighbors of a given node.
+        root_node (node, optional): The node the graph is explored from with get_neighbors_func.
+        edges (iterable, optional): The (value_a, value_b, cost) directed edges of the graph.
+        witness_limit (int, optional): The number of nodes a witness search may settle before a shortcut
+            is added anyway. Higher values add fewer shortcuts but build slower. Defaults to 500.
+    Attributes:
+        values (list): The node values, indexed by node id.
+        rank (list): The contraction rank of every node id.
+        shortcuts (int): The number of shortcut edges added.
+        nodes (list): The last path found.
+        stats (list): The stats of every query of the last path_many call.
+    Methods:
+        path(start_node, end_node): Finds the shortest path between two nodes.
+        path_many(pairs): Finds the paths of a batch of (start_node, end_node) pairs.
+        save(filename): Saves the hierarchy to a .npz file.
+        load(filename): Loads a hierarchy saved with save().
+    """
+
+    def __init__(self, get_neighbors_func=None, root_node=None, edges=None, witness_limit=500):
+
+        if not isinstance(witness_limit, int) or witness_limit <= 0:
+            raise ValueError("witness_limit must be a positive integer. Got '{}' instead".format(witness_limit))
+        if edges is None:
+            if get_neighbors_func is None or root_node is None:
+                raise ValueError("chgraph needs either edges or get_neighbors_func and root_node")
+            if not isinstance(root_node, node):
+                raise TypeError("root_node must be an instance of the node class. Got '{}' instead".format(type(root_node)))
+            edges, names = self._explore(get_neighbors_func, root_node)
+        else:
+            names = {}
+
+        self.values = []
+        self.index = {}
+        outgoing = []
+        incoming = []
+        # (id, id) -> cost of the original edge, the cheapest of parallel edges
+        self.original = {}
+
+        for value_a, value_b, cost in edges:
+            if cost < 0:
+                raise ValueError("edge costs must be non-negative. Got '{}' instead".format(cost))
+            a = self._id(value_a, outgoing, incoming)
+            b = self._id(value_b, outgoing, incoming)
+            if a == b or cost >= outgoing[a].get(b, INF):
+                continue
+            outgoing[a][b] = cost
+            incoming[b][a] = cost
+            self.original[(a, b)] = cost
+
+        self.names = [names.get(value) for value in self.values]
+        self.nodes = []
+        self.stats = []
+        self.expansions = 0
+        self._contract(outgoing, incoming, witness_limit)
+
+    def path(self, start_node=None, end_node=None):
+
+        """
+        Finds the shortest path between two nodes.
+        Args:
+            start_node (node): The starting node of the path.
+            end_node (node): The ending node of the path.
+        Returns:
+            list: The shortest path as a list of nodes, with the cost from the start as their cost.
+                Returns None if no path is found.
+        Raises:
+            TypeError: If start_node or end_node is not an instance of the node class.
+            ValueError: If start_node or end_node is not defined.
+        """
+
+        env._check_nodes(start_node, end_node)
+
+        path, self.expansions = self._search(start_node, end_node)
+        if path is None:
+            return None
+        self.nodes = path
+        return self.nodes
+
+    def path_many(self, pairs):
+
+        """
+        Finds the paths of a batch of (start_node, end_node) pairs.
+        Args:
+            pairs (iterable): The (start_node, end_node) pairs.
+        Returns:
+            list: The path (or None) of every pair, in order.
+                The found flag, length, cost, expansions and time of every query are stored in stats.
+        Raises:
+            TypeError: If a start_node or end_node is not an instance of the node class.
+            ValueError: If a start_node or end_node is not defined.
+        """
+
+        results = []
+        self.stats = []
+        for start_node, end_node in pairs:
+            env._check_nodes(start_node, end_node)
+            started = perf_counter()
+            path, expansions = self._search(start_node, end_node)
+            self.stats.append(env._query_stats(path, expansions, perf_counter() - started))
+            results.append(path)
+        return results
+
+    def save(self, filename):
+
+        """
+        Saves the hierarchy to a .npz file.
+        Node values and names are stored as pickled object arrays, so only load files you trust.
+        Args:
+            filename (str): The path of the file.
+        Returns:
+            None
+        """
+
+        def objects(items):
+            array = np.empty(len(items), dtype=object)
+            array[:] = items
+            return array
+
+        def csr(adjacency):
+            offsets = np.zeros(len(adjacency) + 1, dtype=np.int64)
+            offsets[1:] = np.cumsum([len(edges) for edges in adjacency])
+            targets = np.array([target for edges in adjacency for target, _ in edges], dtype=np.int64)
+            costs = np.array([cost for edges in adjacency for _, cost in edges], dtype=np.float64)
+            return offsets, targets, costs
+
+        up_offsets, up_targets, up_costs = csr(self.up)
+        down_offsets, down_targets, down_costs = csr(self.down)
+        middle = np.array([(a, b, m) for (a, b), m in self.middle.items()], dtype=np.int64).reshape(-1, 3)
+        original = np.array([(a, b) for a, b in self.original], dtype=np.int64).reshape(-1, 2)
+        original_costs = np.array(list(self.original.values()), dtype=np.float64)
+        np.savez(filename, values=objects(self.values), names=objects(self.names), rank=np.array(self.rank, dtype=np.int64),
+                 up_offsets=up_offsets, up_targets=up_targets, up_costs=up_costs,
+                 down_offsets=down_offsets, down_targets=down_targets, down_costs=down_costs,
+                 middle=middle, original=original, original_costs=original_costs)
+
+    @classmethod
+    def load(cls, filename):
+
+        """
+        Loads a hierarchy saved with save().
+        Args:
+            filename (str): The path of the file.
+        Returns:
+            chgraph: The hierarchy, ready for queries.
+        """
+
+        def adjacency(offsets, targets, costs):
+            targets = targets.tolist()
+            costs = costs.tolist()
+            offsets = offsets.tolist()
+            return [list(zip(targets[start:end], costs[start:end])) for start, end in zip(offsets, offsets[1:])]
+
+        with np.load(filename, allow_pickle=True) as data:
+            graph = cls.__new__(cls)
+            graph.values = data['values'].tolist()
+            graph.names = data['names'].tolist()
+            graph.rank = data['rank'].tolist()
+            graph.up = adjacency(data['up_offsets'], data['up_targets'], data['up_costs'])
+            graph.down = adjacency(data['down_offsets'], data['down_targets'], data['down_costs'])
+            graph.middle = {(a, b): m for a, b, m in data['middle'].tolist()}
+            graph.original = {tuple(edge): cost for edge, cost in zip(data['original'].tolist(), data['original_costs'].tolist())}
+        graph.index = {value: i for i, value in enumerate(graph.values)}
+        graph.shortcuts = len(graph.middle)
+        graph.nodes = []
+        graph.stats = []
+        graph.expansions = 0
+        return graph
+
+    # Get the id of a node value, adding it if it is new
+    def _id(self, value, outgoing, incoming):
+        i = self.index.get(value)
+        if i is None:
+            i = self.index[value] = len(self.values)
+            self.values.append(value)
+            outgoing.append({})
+            incoming.append({})
+        return i
+
+    # Explore the graph reachable from a root node, returns its edges and the names of its nodes
+    @staticmethod
+    def _explore(get_neighbors, root_node):
+        edges = []
+        names = {root_node.value: root_node.name}
+        stack = [root_node]
+        while stack:
+            current_node = stack.pop()
+            for neighbor in get_neighbors(current_node):
+                edges.append((current_node.value, neighbor.value, neighbor.cost))
+                if neighbor.value not in names:
+                    names[neighbor.value] = neighbor.name
+                    stack.append(neighbor)
+        return edges, names
+
+    # Contract every node, least important first, and build the upward and downward edge lists
+    def _contract(self, outgoing, incoming, witness_limit):
+
+        n = len(self.values)
+        contracted = bytearray(n)
+        neighbors_contracted = [0] * n
+        self.rank = [0] * n
+        self.middle = {}
+        self.up = [None] * n
+        self.down = [None] * n
+
+        def importance(v):
+            shortcuts = self._shortcuts(v, outgoing, incoming, contracted, witness_limit)
+            return len(shortcuts) - len(outgoing[v]) - len(incoming[v]) + neighbors_contracted[v], shortcuts
+
+        heap = [(importance(v)[0], v) for v in range(n)]
+        heap.sort()
+        rank = 0
+
+        while heap:
+            _, v = heappop(heap)
+            # Lazy update: contract v only if it is still the least important node
+            priority, shortcuts = importance(v)
+            if heap and priority > heap[0][0]:
+                heappush(heap, (priority, v))
+                continue
+
+            contracted[v] = 1
+            self.rank[v] = rank
+            rank += 1
+
+            # The remaining neighbors are all more important, so these are the final upward edges of v
+            self.up[v] = list(outgoing[v].items())
+            self.down[v] = list(incoming[v].items())
+
+            for u in incoming[v]:
+                del outgoing[u][v]
+                neighbors_contracted[u] += 1
+            for w in outgoing[v]:
+                del incoming[w][v]
+                neighbors_contracted[w] += 1
+            for u, w, cost in shortcuts:
+                if cost < outgoing[u].get(w, INF):
+                    outgoing[u][w] = cost
+                    incoming[w][u] = cost
+                    self.middle[(u, w)] = v
+            outgoing[v] = {}
+            incoming[v] = {}
+
+        self.shortcuts = len(self.middle)
+
+    # Get the (u, w, cost) shortcuts needed to contract v, those without a witness path avoiding v
+    @staticmethod
+    def _shortcuts(v, outgoing, incoming, contracted, witness_limit):
+
+        shortcuts = []
+        targets = outgoing[v]
+        if not targets:
+            return shortcuts
+
+        for u, first in incoming[v].items():
+            limit = first + max(targets.values())
+
+            # Dijkstra from u that skips v, bounded by the longest path through v
+            distances = {u: 0.0}
+            settled = set()
+            heap = [(0.0, u)]
+            while heap and len(settled) < witness_limit:
+                cost, current = heappop(heap)
+                if current in settled:
+                    continue
+                if cost > limit:
+                    break
+                settled.add(current)
+                for neighbor, edge in outgoing[current].items():
+                    if neighbor == v or contracted[neighbor]:
+                        continue
+                    new_cost = cost + edge
+                    if new_cost < distances.get(neighbor, INF):
+                        distances[neighbor] = new_cost
+                        heappush(heap, (new_cost, neighbor))
+
+            for w, second in targets.items():
+                if w != u and first + second < distances.get(w, INF):
+                    shortcuts.append((u, w, first + second))
+        return shortcuts
+
+    # Bidirectional upward Dijkstra, returns the unpacked path (or None) and the number of expansions
+    def _search(self, start_node, end_node):
+
+        if start_node == end_node:
+            start = self.index.get(start_node.value)
+            if start is None:
+                start_node.cost = 0
+                return [start_node], 0
+            return self._build_path([start]), 0
+        start = self.index.get(start_node.value)
+        end = self.index.get(end_node.value)
+        if start is None or end is None:
+            return None, 0
+
+        up = self.up
+        down = self.down
+        distances = ({start: 0.0}, {end: 0.0})
+        parents = ({start: -1}, {end: -1})
+        settled = (set(), set())
+        heaps = ([(0.0, start)], [(0.0, end)])
+        edges = (up, down)
+        best = INF
+        meeting = -1
+        expansions = 0
+
+        # Every direction may stop once its queue cannot improve the best meeting cost
+        while True:
+            forward = heaps[0][0][0] if heaps[0] else INF
+            backward = heaps[1][0][0] if heaps[1] else INF
+            if min(forward, backward) >= best:
+                break
+            side = 0 if forward <= backward else 1
+
+            cost, current = heappop(heaps[side])
+            if current in settled[side]:
+                continue
+            settled[side].add(current)
+            expansions += 1
+
+            other = distances[1 - side].get(current)
+            if other is not None and cost + other < best:
+                best = cost + other
+                meeting = current
+
+            distance = distances[side]
+            parent = parents[side]
+            heap = heaps[side]
+            for neighbor, edge in edges[side][current]:
+                new_cost = cost + edge
+                if new_cost < distance.get(neighbor, INF):
+                    distance[neighbor] = new_cost
+                    parent[neighbor] = current
+                    heappush(heap, (new_cost, neighbor))
+
+        if meeting == -1:
+            return None, expansions
+
+        # Join the two halves at the meeting node and unpack the shortcuts
+        chain = []
+        current = meeting
+        while current != -1:
+            chain.append(current)
+            current = parents[0][current]
+        chain.reverse()
+        current = parents[1][meeting]
+        while current != -1:
+            chain.append(current)
+            current = parents[1][current]
+
+        ids = [chain[0]]
+        for a, b in zip(chain, chain[1:]):
+            ids.extend(self._unpack(a, b))
+        return self._build_path(ids), expansions
+
+    # Get the ids after a along the original edges of a (possibly shortcut) edge a -> b
+    def _unpack(self, a, b):
+        ids = []
+        stack = [(a, b)]
+        middle = self.middle
+        while stack:
+            a, b = stack.pop()
+            m = middle.get((a, b))
+            if m is None:
+                ids.append(b)
+            else:
+                stack.append((m, b))
+                stack.append((a, m))
+        return ids
+
+    # Build the list of path nodes from node ids
+    def _build_path(self, ids):
+        path = []
+        previous = None
+        cost = 0.0
+        for position, i in enumerate(ids):
+            if position:
+                cost += self.original[(ids[position - 1], i)]
+            current = pathnode(value=self.values[i], parent=previous, cost=cost, name=self.names[i])
+            path.append(current)
+            previous = current
+        return path
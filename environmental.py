@@ -1,5 +1,14 @@
-from vagabond.systems import node
+from vagabond.systems import node, pathnode, frontier
+from vagabond.graph import csrgraph
 from graphviz import Digraph
+from array import array
+from collections import OrderedDict, deque
+from heapq import heappush, heappop, heapify
+from time import perf_counter
+import numpy as np
+
+INF = float('inf')
+SQRT2 = 2 ** 0.5
 
 # This is a class that will be have all the different path finding algorithms
 class env:
@@ -8,9 +17,16 @@ class env:
     A class representing an environment.
     Attributes:
     - get_neighbors (function): A function that returns the neighbors of a node.
-    - path (list): A list representing the path in the environment.
+    - graph (csrgraph): The graph passed in place of get_neighbors_func, or None.
+      dijkstra and astar search it by node id when the neighbor cache is disabled.
+    - nodes (list): A list representing the path found by the last search.
+    - stats (list): The stats of every query of the last path_many call.
+    - cache_size (int): The maximum number of cached expansions, or None if the neighbor cache is disabled.
+    - cache_hits (int): The number of expansions served from the neighbor cache.
+    - cache_misses (int): The number of expansions that called get_neighbors.
+    - profile (searchprofile): The instrumentation counters of the last query, if instrumented.
     Methods:
-    - __init__(get_neighbors_func): Initializes the environment with the given get_neighbors function.
+    - __init__(get_neighbors_func, cache_size=None): Initializes the environment with the given get_neighbors function or csrgraph.
     - __getitem__(index): Returns the node at the specified index in the path.
     - __len__(): Returns the length of the path.
     - __repr__(): Returns a string representation of the path.
@@ -21,6 +37,13 @@ class env:
     - remove(node): Removes a node from the path.
     - clear(): Clears the path.
     - get_raw(): Returns an array of values from the path.
+    - path_many(pairs): Finds the paths of a batch of (start_node, end_node) pairs.
+    - search(start_node, end_node, max_expansions=None, max_cost=None, max_time=None): Finds a path within a budget.
+    - iter_search(start_node, end_node, every=1, ...): Runs a search step by step, as a generator.
+    - instrument(enabled=True, callback=None): Records the counters and phase times of every query.
+    - expand(node): Returns the neighbors of a node, using the neighbor cache if it is enabled.
+    - invalidate(keys=None): Removes expansions from the neighbor cache.
+    - cache_info(): Returns the neighbor cache counters.
     - display_path(filename='graph', directory='.'): Displays the path in a graph and saves it as a PNG file.
     """
 
@@ -28,64 +51,588 @@ class env:
     get_neighbors = None
 
     #Other Variables
-    path = []
+    nodes = []
+    stats = []
+
+    # Budget of the running search() or iter_search() call, None if unbounded:
+    # (max expansions, max cost, deadline, heuristic, goal value, expansions between events or 0)
+    limits = None
+
+    # Instrumentation, off unless instrument() is called: the profile of the last query and its callback
+    instrumented = False
+    profile = None
+    profile_callback = None
 
     #Constructor
-    def __init__(self, get_neighbors_func):
+    def __init__(self, get_neighbors_func, cache_size=None):
+
+        # A csrgraph is searched through its neighbor functions
+        self.graph = None
+        if isinstance(get_neighbors_func, csrgraph):
+            self.graph = get_neighbors_func
+            get_neighbors_func = self.graph.neighbors
         self.get_neighbors = get_neighbors_func
     
         if not self.get_neighbors:
             raise ValueError("get_neighbors function is not defined")
 
+        if cache_size is not None and (not isinstance(cache_size, int) or cache_size <= 0):
+            raise ValueError("cache_size must be a positive integer or None. Got '{}' instead".format(cache_size))
+
+        # Neighbor cache -- node value -> [(node class, value, cost, name), ...] in LRU order
+        self.cache_size = cache_size
+        self.cache = OrderedDict()
+        self.cache_hits = 0
+        self.cache_misses = 0
+
     # Get a node from the path
     def __getitem__(self, index):
         try:
-            return self.path[index]
+            return self.nodes[index]
         except IndexError:
             raise IndexError("Index out of range") from None
 
     # Get the length of the path
     def __len__(self):
-        return len(self.path)
+        return len(self.nodes)
     
     # Print the path
     def __repr__(self):
-        return str(self.path)
+        return str(self.nodes)
     
     # Print the path
     def __str__(self):
-        return str(self.path)
+        return str(self.nodes)
     
     # Make it iterable
     def __iter__(self):
-        return iter(self.path)
+        return iter(self.nodes)
     
     # Get the path as a list of nodes
     def get(self):
-        return self.path
+        return self.nodes
     
     #Add a node to the path
-    def add(self, node):
-        if not isinstance(node, node):
-            raise TypeError("node must be an instance of the node class. Got '{}' instead".format(type(node)))
-        self.path.append(node)
+    def add(self, node_):
+        if not isinstance(node_, node):
+            raise TypeError("node must be an instance of the node class. Got '{}' instead".format(type(node_)))
+        self.nodes.append(node_)
 
     # Remove a node from the path
-    def remove(self, node):
-        if not isinstance(node, node):
-            raise TypeError("node must be an instance of the node class. Got '{}' instead".format(type(node)))
-        self.path.remove(node)
+    def remove(self, node_):
+        if not isinstance(node_, node):
+            raise TypeError("node must be an instance of the node class. Got '{}' instead".format(type(node_)))
+        self.nodes.remove(node_)
 
     # Clear the path
     def clear(self):
-        self.path = []
+        self.nodes = []
     
     # Get array of values from the path
     def get_raw(self):
-        if self.path == []:
+        if self.nodes == []:
             return []
         else:
-            return [node.value for node in self.path]
+            return [node.value for node in self.nodes]
+
+    # Check the start and end nodes of a query
+    @staticmethod
+    def _check_nodes(start_node, end_node):
+        if start_node is not None:
+            if not isinstance(start_node, node):
+                raise TypeError("start_node must be an instance of the node class. Got '{}' instead".format(type(start_node)))
+        else:
+            raise ValueError("start_node is not defined")
+
+        if end_node is not None:
+            if not isinstance(end_node, node):
+                raise TypeError("end_node must be an instance of the node class. Got '{}' instead".format(type(end_node)))
+        else:
+            raise ValueError("end_node is not defined")
+
+    # Get the stats of a query
+    @staticmethod
+    def _query_stats(path, expansions, elapsed, cost=None):
+        if cost is None and path:
+            cost = path[-1].cost
+        return {
+            'found': path is not None,
+            'length': len(path) if path is not None else 0,
+            'cost': cost,
+            'expansions': expansions,
+            'time': elapsed,
+        }
+
+    # Find the paths of a batch of queries
+    def path_many(self, pairs):
+
+        """
+        Finds the paths of a batch of (start_node, end_node) pairs.
+        The search buffers (open and closed sets) are allocated once and reused
+        by every query, and the neighbor cache, if enabled, is shared by the batch.
+        Args:
+            pairs (iterable): The (start_node, end_node) pairs.
+        Returns:
+            list: The path (or None) of every pair, in order.
+                The found flag, length, cost, expansions and time of every query are stored in stats.
+        Raises:
+            TypeError: If a start_node or end_node is not an instance of the node class.
+            ValueError: If a start_node or end_node is not defined.
+        """
+
+        buffers = self._buffers()
+        results = []
+        self.stats = []
+
+        for start_node, end_node in pairs:
+            self._check_nodes(start_node, end_node)
+            started = perf_counter()
+            path, expansions = self._search(start_node, end_node, buffers)
+            self.stats.append(self._query_stats(path, expansions, perf_counter() - started))
+            results.append(path)
+        return results
+
+    # Create the search buffers, implemented by the algorithms
+    def _buffers(self):
+        raise NotImplementedError("{} does not implement path_many".format(type(self).__name__))
+
+    # Search with the given buffers, returns the path (or None) and the number of expansions
+    def _search(self, start_node, end_node, buffers):
+        steps = self._steps(start_node, end_node, buffers)
+        if self.instrumented:
+            steps = self._observed(steps, buffers)
+        return self._drive(steps)
+
+    # Search with the given buffers as a generator of expansion events, implemented by the algorithms
+    # It returns the path (or None) and the number of expansions, and only yields inside iter_search()
+    def _steps(self, start_node, end_node, buffers):
+        raise NotImplementedError("{} does not implement step-wise search".format(type(self).__name__))
+        yield
+
+    # Run a step-wise search that yields no events to its end, returns its return value
+    @staticmethod
+    def _drive(steps):
+        try:
+            while True:
+                next(steps)
+        except StopIteration as stop:
+            return stop.value
+
+    # Turn the instrumentation on or off
+    def instrument(self, enabled=True, callback=None):
+
+        """
+        Turns the instrumentation of the queries of the planner on or off.
+        While it is on, every query of path(), search(), iter_search() and path_many() records
+        a searchprofile in profile and passes it to the callback. The queries yield to the
+        instrumentation before every expansion, and get_neighbors and the heuristic are timed,
+        which slows them down. While it is off, a query only checks the flag.
+        Args:
+            enabled (bool, optional): Whether to instrument the queries. Defaults to True.
+            callback (function, optional): A function called with the searchprofile of every query. Defaults to None.
+        Returns:
+            None
+        """
+
+        self.instrumented = bool(enabled)
+        self.profile_callback = callback if enabled else None
+        if not enabled:
+            self.profile = None
+
+    # Wrap a function so its calls and the time spent in them add up in a [calls, time] list
+    @staticmethod
+    def _timed(function, totals):
+        def timed(*args):
+            started = perf_counter()
+            try:
+                return function(*args)
+            finally:
+                totals[0] += 1
+                totals[1] += perf_counter() - started
+        return timed
+
+    # Get the size of the open set from the search buffers, None if the planner does not keep it there
+    # closed is the number of node values expanded so far
+    def _open_size(self, buffers, closed):
+        return None
+
+    # Run a step-wise search under the instrumentation, as a generator that passes on the events asked for
+    # The search yields before every expansion, so the expanded values and the open set are sampled every time
+    def _observed(self, steps, buffers):
+
+        limits = self.limits
+        every = limits[5] if limits is not None else 0
+        if limits is None:
+            self._bound(None, None, None, None, None)
+        self.limits = self.limits[:5] + (1,)
+
+        # Count and time the callbacks of the planner
+        neighbors = [0, 0.0]
+        estimates = [0, 0.0]
+        callbacks = {}
+        for name, totals in (('get_neighbors', neighbors), ('get_reverse_neighbors', neighbors), ('heuristic', estimates)):
+            function = getattr(self, name, None)
+            if function is not None:
+                callbacks[name] = function
+                setattr(self, name, self._timed(function, totals))
+
+        expanded = set()
+        reopens = 0
+        peak = None
+        started = perf_counter()
+        try:
+            while True:
+                try:
+                    event = next(steps)
+                except StopIteration as stop:
+                    result = stop.value
+                    break
+                value = event[1]
+                if value in expanded:
+                    reopens += 1
+                else:
+                    expanded.add(value)
+                size = self._open_size(buffers, len(expanded))
+                if size is not None and (peak is None or size > peak):
+                    peak = size
+                if every and not event[0] % every:
+                    yield event
+        finally:
+            steps.close()
+            elapsed = perf_counter() - started
+            for name, function in callbacks.items():
+                setattr(self, name, function)
+            self.limits = limits
+
+        phases = {'neighbors': neighbors[1], 'heuristic': estimates[1], 'search': max(0.0, elapsed - neighbors[1] - estimates[1])}
+        self.profile = searchprofile(type(self).__name__, result[0] is not None, result[1], len(expanded), reopens, peak,
+                                     neighbors[0], estimates[0], elapsed, phases)
+        if self.profile_callback is not None:
+            self.profile_callback(self.profile)
+        return result
+
+    # Find a path within a budget
+    def search(self, start_node=None, end_node=None, max_expansions=None, max_cost=None, max_time=None, heuristic=None):
+
+        """
+        Finds a path between two nodes within an expansion, cost and wall-clock budget.
+        The budget is checked before every expansion, so a query whose goal cannot be
+        reached, or is too far, stops early instead of exploring the whole graph.
+        Args:
+            start_node (node): The starting node of the path.
+            end_node (node): The ending node of the path.
+            max_expansions (int, optional): The most nodes to expand. Defaults to None (no limit).
+            max_cost (float, optional): Stop before expanding a node whose cost exceeds this bound: its cost from
+                the start, its queue cost for astar without a heuristic, its depth for bfs, dfs and bibfs, or its cost
+                to the end for dstarlite. Defaults to None (no limit).
+            max_time (float, optional): The wall-clock budget in seconds. Defaults to None (no limit).
+            heuristic (function, optional): An estimate heuristic(value_a, value_b) used to pick the expanded node closest
+                to the end for the partial path. Defaults to the heuristic of the planner, if it has one.
+        Returns:
+            searchresult: The status, the path or the partial path, the number of expansions and the time of the search.
+        Raises:
+            TypeError: If start_node or end_node is not an instance of the node class.
+            ValueError: If start_node or end_node is not defined.
+        """
+
+        self._check_nodes(start_node, end_node)
+        if heuristic is None:
+            heuristic = getattr(self, 'heuristic', None)
+
+        started = self._bound(max_expansions, max_cost, max_time, heuristic, end_node.value)
+        try:
+            path, expansions = self._search(start_node, end_node, self._buffers())
+        finally:
+            self.limits = None
+        return self._result(path, expansions, started)
+
+    # Run a search step by step
+    def iter_search(self, start_node=None, end_node=None, every=1, max_expansions=None, max_cost=None, max_time=None, heuristic=None):
+
+        """
+        Runs a search as a generator, so it can be interleaved with other work without threads.
+        The search is paused at every event and resumes when the next one is requested.
+        Closing the generator (or dropping it) aborts the search. The planner must not
+        run other queries while the generator is paused, and max_time counts the pauses.
+        Args:
+            start_node (node): The starting node of the path.
+            end_node (node): The ending node of the path.
+            every (int, optional): The number of expansions between two events. Defaults to 1.
+            max_expansions, max_cost, max_time, heuristic (optional): The budget, as in search().
+        Yields:
+            tuple: An (expansions, node value, cost) event before every every-th expansion, starting with the first,
+                where cost is the cost checked against max_cost.
+            searchresult: The result of the search, as the last item.
+        Raises:
+            TypeError: If start_node or end_node is not an instance of the node class.
+            ValueError: If start_node or end_node is not defined, or if every is not a positive integer.
+        """
+
+        self._check_nodes(start_node, end_node)
+        if not isinstance(every, int) or every <= 0:
+            raise ValueError("every must be a positive integer. Got '{}' instead".format(every))
+        if heuristic is None:
+            heuristic = getattr(self, 'heuristic', None)
+
+        started = self._bound(max_expansions, max_cost, max_time, heuristic, end_node.value, every)
+        try:
+            buffers = self._buffers()
+            steps = self._steps(start_node, end_node, buffers)
+            if self.instrumented:
+                steps = self._observed(steps, buffers)
+            path, expansions = yield from steps
+        finally:
+            self.limits = None
+        yield self._result(path, expansions, started)
+
+    # Start the budget of a search, returns its start time
+    def _bound(self, max_expansions, max_cost, max_time, heuristic, goal, every=0):
+        started = perf_counter()
+        self.limits = (INF if max_expansions is None else max_expansions,
+                       INF if max_cost is None else max_cost,
+                       INF if max_time is None else started + max_time,
+                       heuristic, goal, every)
+        self.exceeded = False
+        self.closest = (INF, None)
+        self.partial = None
+        return started
+
+    # Check the budget before an expansion, and keep the expanded node closest to the goal
+    # key is what the planner builds the partial path from, value is None for nodes of a backward search
+    def _spent(self, key, value, expansions, cost):
+        max_expansions, max_cost, deadline, heuristic, goal, _ = self.limits
+        if heuristic is not None and value is not None:
+            estimate = heuristic(value, goal)
+            if estimate < self.closest[0]:
+                self.closest = (estimate, key)
+        if expansions >= max_expansions or cost > max_cost or perf_counter() >= deadline:
+            self.exceeded = True
+            return True
+        return False
+
+    # Get the result of a bounded search
+    def _result(self, path, expansions, started):
+        elapsed = perf_counter() - started
+        if path is not None:
+            self.nodes = path
+            return searchresult('found', path, None, expansions, elapsed)
+        if self.exceeded:
+            return searchresult('budget', None, self.partial, expansions, elapsed)
+        return searchresult('exhausted', None, None, expansions, elapsed)
+
+    # Get the path ending at a node, following the parent of every node or a parent map
+    @staticmethod
+    def _unwind(current_node, parent_map=None):
+        if current_node is None:
+            return None
+        path = []
+        while current_node:
+            path.append(current_node)
+            current_node = parent_map[current_node] if parent_map is not None else current_node.parent
+        return path[::-1]
+
+    # Best-first search over the node ids of a csrgraph, returns the path (or None) and the number of expansions
+    # No node object is created until the path is built, the costs of the path nodes are their costs from the start
+    def _search_graph(self, start_node, end_node, heuristic=None):
+
+        graph = self.graph
+        try:
+            start = graph.id(start_node.value)
+            end = graph.id(end_node.value)
+        except KeyError:
+            return ([start_node] if start_node == end_node else None), 0
+
+        offsets = graph._offsets
+        targets = graph._targets
+        weights = graph._weights
+        values = graph.values
+        goal = end_node.value
+
+        g = {start: 0.0}
+        parents = {start: -1}
+        closed = set()
+        heap = [(heuristic(start_node.value, goal) if heuristic else 0.0, start)]
+        expansions = 0
+        limits = self.limits
+
+        def build(current):
+            chain = []
+            while current != -1:
+                chain.append(current)
+                current = parents[current]
+            start_node.cost = 0
+            path = [start_node]
+            for i in reversed(chain[:-1]):
+                value = values[i] if values is not None else i
+                path.append(pathnode(value=value, parent=path[-1], cost=g[i], name=str(value)))
+            return path
+
+        while heap:
+            _, current = heappop(heap)
+            if current in closed:
+                continue
+            if current == end:
+                return build(current), expansions
+            current_g = g[current]
+            if limits is not None:
+                if self._spent(current, values[current] if values is not None else current, expansions, current_g):
+                    if self.closest[1] is not None:
+                        self.partial = build(self.closest[1])
+                    return None, expansions
+                if limits[5] and not expansions % limits[5]:
+                    yield expansions, values[current] if values is not None else current, current_g
+            closed.add(current)
+            expansions += 1
+
+            for edge in range(offsets[current], offsets[current + 1]):
+                neighbor = targets[edge]
+                if neighbor in closed:
+                    continue
+                new_g = current_g + weights[edge]
+                if new_g < g.get(neighbor, INF):
+                    g[neighbor] = new_g
+                    parents[neighbor] = current
+                    if heuristic:
+                        new_g += heuristic(values[neighbor] if values is not None else neighbor, goal)
+                    heappush(heap, (new_g, neighbor))
+        return None, expansions
+
+    # Breadth-first (or depth-first if lifo) traversal over the node ids of a csrgraph, returns the path (or None) and the number of expansions
+    # A flat bitset marks the discovered ids, the costs of the path nodes are their edge costs as in graph.neighbors
+    def _traverse_graph(self, start_node, end_node, lifo=False):
+
+        graph = self.graph
+        try:
+            start = graph.id(start_node.value)
+            end = graph.id(end_node.value)
+        except KeyError:
+            return ([start_node] if start_node == end_node else None), 0
+
+        offsets = graph._offsets
+        targets = graph._targets
+        weights = graph._weights
+        values = graph.values
+
+        discovered = bytearray(len(graph))
+        discovered[start] = 1
+        parents = {start: -1}
+        depths = {start: 0}
+        frontier = deque([start])
+        pop = frontier.pop if lifo else frontier.popleft
+        expansions = 0
+        limits = self.limits
+
+        def build(current):
+            chain = []
+            while current != -1:
+                chain.append(current)
+                current = parents[current]
+            path = [start_node]
+            for parent, i in zip(chain[:0:-1], chain[-2::-1]):
+                for edge in range(offsets[parent], offsets[parent + 1]):
+                    if targets[edge] == i:
+                        break
+                value = values[i] if values is not None else i
+                path.append(pathnode(value=value, parent=path[-1], cost=weights[edge], name=str(value)))
+            return path
+
+        while frontier:
+            current = pop()
+            if current == end:
+                return build(current), expansions
+
+            # Depths are only kept for the cost budget of a bounded search
+            if limits is not None:
+                value = values[current] if values is not None else current
+                if self._spent(current, value, expansions, depths[current]):
+                    if self.closest[1] is not None:
+                        self.partial = build(self.closest[1])
+                    return None, expansions
+                if limits[5] and not expansions % limits[5]:
+                    yield expansions, value, depths[current]
+            expansions += 1
+
+            for edge in range(offsets[current], offsets[current + 1]):
+                neighbor = targets[edge]
+                if discovered[neighbor]:
+                    continue
+                discovered[neighbor] = 1
+                parents[neighbor] = current
+                frontier.append(neighbor)
+                if limits is not None:
+                    depths[neighbor] = depths[current] + 1
+        return None, expansions
+
+    # Get the neighbors of a node, through the neighbor cache if it is enabled
+    def expand(self, current_node):
+
+        """
+        Returns the neighbors of a node.
+        When the neighbor cache is enabled, the expansion of every node value is
+        remembered and later expansions of the same value rebuild the neighbors
+        from the cache instead of calling get_neighbors. The cache is only valid
+        if get_neighbors depends on the node value alone (a static map).
+        Args:
+            current_node (node): The node to expand.
+        Returns:
+            list: The neighbor nodes, with current_node as their parent.
+        """
+
+        if self.cache_size is None:
+            return self.get_neighbors(current_node)
+
+        cache = self.cache
+        key = current_node.value
+        entries = cache.get(key)
+        if entries is not None:
+            self.cache_hits += 1
+            cache.move_to_end(key)
+            return [cls(value=value, parent=current_node, cost=cost, name=name) for cls, value, cost, name in entries]
+
+        self.cache_misses += 1
+        neighbors = self.get_neighbors(current_node)
+        cache[key] = [(type(neighbor), neighbor.value, neighbor.cost, neighbor.name) for neighbor in neighbors]
+        if len(cache) > self.cache_size:
+            cache.popitem(last=False)
+        return neighbors
+
+    # Remove expansions from the neighbor cache
+    def invalidate(self, keys=None):
+
+        """
+        Removes expansions from the neighbor cache, e.g. after the map changes.
+        Args:
+            keys (optional): The node values to remove, or a function that takes a node value
+                and returns True if it must be removed (a region). Removes everything if None.
+        Returns:
+            int: The number of removed expansions.
+        """
+
+        cache = self.cache
+        if keys is None:
+            removed = len(cache)
+            cache.clear()
+            return removed
+
+        if callable(keys):
+            keys = [key for key in cache if keys(key)]
+
+        removed = 0
+        for key in keys:
+            if cache.pop(key, None) is not None:
+                removed += 1
+        return removed
+
+    # Get the neighbor cache counters
+    def cache_info(self):
+
+        """
+        Returns the neighbor cache counters.
+        Returns:
+            dict: The hits, misses, current size and maximum size of the neighbor cache.
+        """
+
+        return {'hits': self.cache_hits, 'misses': self.cache_misses, 'size': len(self.cache), 'maxsize': self.cache_size}
 
     # display the path in a graph
     def display_path(self, filename='graph', directory='.'):
@@ -101,13 +648,13 @@ class env:
             ValueError: If the path is empty.
         """
 
-        if not self.path:
+        if not self.nodes:
             raise ValueError("Path is empty. Cannot display graph.")
 
         dot = Digraph()
         dot.node_attr.update(shape='rectangle')
 
-        for node in self.path:
+        for node in self.nodes:
             make_str = "Node: " + node.name
             if node.value is not None:
                 make_str += "\n----------\nValue: \n" + str(node.value)
@@ -125,10 +672,18 @@ class astar(env):
 
     """
     A* algorithm implementation for pathfinding in a graph.
+    Without a heuristic, the cost of every neighbor is its priority, so get_neighbors_func
+    adds its own estimate. With a heuristic, the cost of every neighbor is the cost of the
+    edge to it, as in dijkstra, and the queue is ordered by the cost from the start plus
+    heuristic(neighbor value, end value), e.g. a landmarks heuristic. A csrgraph
+    gives edge costs, so over a csrgraph the costs from the start are always
+    accumulated, with a heuristic of zero if none is given.
     Args:
         get_neighbors_func (function): A function that returns the neighbors of a given node.
+        cache_size (int, optional): The size of the neighbor cache. Disabled if None.
+        heuristic (function, optional): A consistent estimate heuristic(value_a, value_b) of the cost between two node values.
     Attributes:
-        path (list): The path found by the A* algorithm.
+        nodes (list): The path found by the A* algorithm.
     Methods:
         path(start_node, end_node): Finds the shortest path from start_node to end_node using the A* algorithm.
     """
@@ -137,6 +692,7 @@ class astar(env):
     Initializes the A* algorithm.
     Args:
         get_neighbors_func (function): A function that returns the neighbors of a given node.
+        cache_size (int, optional): The size of the neighbor cache. Disabled if None.
     """
     """
     Finds the shortest path from start_node to end_node using the A* algorithm.
@@ -150,8 +706,9 @@ class astar(env):
         ValueError: If start_node or end_node is not defined.
     """
 
-    def __init__(self, get_neighbors_func):
-        super().__init__(get_neighbors_func)
+    def __init__(self, get_neighbors_func, cache_size=None, heuristic=None):
+        super().__init__(get_neighbors_func, cache_size)
+        self.heuristic = heuristic
         
     def path(self, start_node = None, end_node = None):
 
@@ -167,34 +724,49 @@ class astar(env):
             ValueError: If start_node or end_node is not defined.
         """
         
-        if start_node is not None:
-            if not isinstance(start_node, node):
-                raise TypeError("start_node must be an instance of the node class. Got '{}' instead".format(type(start_node)))
-        else:
-            raise ValueError("start_node is not defined")
-        
-        if end_node is not None:
-            if not isinstance(end_node, node):
-                raise TypeError("end_node must be an instance of the node class. Got '{}' instead".format(type(end_node)))
-        else:
-            raise ValueError("end_node is not defined")
-        
-        unvisited = []
-        visited = []
+        self._check_nodes(start_node, end_node)
+
+        path, _ = self._search(start_node, end_node, self._buffers())
+        if path is None:
+            return None
+        self.nodes = path
+        return self.nodes
+
+    # Create the search buffers, reused across the queries of path_many
+    def _buffers(self):
+        return frontier(), set()
+
+    # Get the size of the open set, unless the search runs over the ids of a csrgraph
+    def _open_size(self, buffers, closed):
+        if self.graph is not None and self.cache_size is None:
+            return None
+        return len(buffers[0])
+
+    # Search with the given buffers as a generator of expansion events, returns the path (or None) and the number of expansions
+    def _steps(self, start_node, end_node, buffers):
+
+        # The neighbors of a csrgraph have edge costs, so its searches always accumulate the cost from the start
+        if self.heuristic is not None or self.graph is not None:
+            return (yield from self._informed(start_node, end_node, buffers))
+
+        # Open set as a binary heap keyed by node value, closed set as a hash set
+        unvisited, visited = buffers
+        unvisited.clear()
+        visited.clear()
+        expansions = 0
+
+        limits = self.limits
 
         # Add the start node to the unvisited list
-        unvisited.append(start_node)
+        unvisited.push(start_node.value, start_node.cost, start_node)
 
         while unvisited:
 
-            # Get the node with the minimum cost
-            current_node = min(unvisited, key=lambda x: x.cost)
-
-            # Remove the current node from the unvisited list
-            unvisited.remove(current_node)
+            # Remove the node with the minimum cost from the unvisited list
+            _, current_node, _ = unvisited.pop()
 
             # Add the current node to the visited list
-            visited.append(current_node)
+            visited.add(current_node.value)
 
             # Check if the current node is the end node
             if current_node == end_node:
@@ -202,177 +774,900 @@ class astar(env):
                 while current_node:
                     path.append(current_node)
                     current_node = current_node.parent
+                return path[::-1], expansions
 
-                self.path = path[::-1]
-                return self.path
+            # Stop if the budget of a bounded search is spent
+            if limits is not None:
+                if self._spent(current_node, current_node.value, expansions, current_node.cost):
+                    self.partial = self._unwind(self.closest[1])
+                    return None, expansions
+                if limits[5] and not expansions % limits[5]:
+                    yield expansions, current_node.value, current_node.cost
 
             # Get the neighbors of the current node
-            neighbors = self.get_neighbors(current_node)
+            neighbors = self.expand(current_node)
+            expansions += 1
 
             # Loop through the neighbors
             for neighbor_node in neighbors:
                 
                 # Check if the neighbor is in the visited list
-                if neighbor_node in visited:
+                if neighbor_node.value in visited:
                     continue
 
-                # Check if the neighbor is in the unvisited list
-                if neighbor_node not in unvisited:
-                    unvisited.append(neighbor_node)
-                else:
-                    # Replace the neighbor node with the new node if the new node has a lower cost
-                    for i, node_ in enumerate(unvisited):
-                        if node_ == neighbor_node and node_.cost > neighbor_node.cost:
-                            unvisited[i] = neighbor_node
-        return None
-
-class bfs(env):
+                # Add the neighbor to the unvisited list, or replace the queued node if the new node has a lower cost
+                unvisited.push(neighbor_node.value, neighbor_node.cost, neighbor_node)
+        return None, expansions
 
-    """
-    Initializes a breadth-first search algorithm.
-    Parameters:
-    - get_neighbors_func: A function that takes a node as input and returns a list of its neighboring nodes.
-    """
-    """
-    Finds the shortest path from start_node to end_node using breadth-first search algorithm.
-    Parameters:
-    - start_node: The starting node of the path. Must be an instance of the node class.
-    - end_node: The ending node of the path. Must be an instance of the node class.
-    Returns:
-    - path: A list of nodes representing the shortest path from start_node to end_node.
-        Returns None if no path is found.
-    """
+    # Search with edge costs and the heuristic, the costs of the path nodes are their costs from the start
+    def _informed(self, start_node, end_node, buffers):
 
-    def __init__(self, get_neighbors_func):
-        super().__init__(get_neighbors_func)
-        
-    def path(self, start_node=None, end_node=None):
+        if self.graph is not None and self.cache_size is None:
+            return (yield from self._search_graph(start_node, end_node, self.heuristic))
 
-        """
-        Finds the path from start_node to end_node using breadth-first search algorithm.
-        Args:
-            start_node (node, optional): The starting node. Defaults to None.
-            end_node (node, optional): The target node. Defaults to None.
-        Raises:
-            TypeError: If start_node or end_node is not an instance of the node class.
-            ValueError: If start_node or end_node is not defined.
-        Returns:
-            list: The path from start_node to end_node, represented as a list of nodes.
-                Returns None if no path is found.
-        """
+        unvisited, visited = buffers
+        unvisited.clear()
+        visited.clear()
+        heuristic = self.heuristic
+        if heuristic is None:
+            heuristic = lambda value_a, value_b: 0.0
+        goal = end_node.value
+        expansions = 0
+        limits = self.limits
+        start_node.cost = 0
+        unvisited.push(start_node.value, heuristic(start_node.value, goal), start_node)
 
-        if start_node is not None:
-            if not isinstance(start_node, node):
-                raise TypeError("start_node must be an instance of the node class. Got '{}' instead".format(type(start_node)))
-        else:
-            raise ValueError("start_node is not defined")
-        
-        if end_node is not None:
-            if not isinstance(end_node, node):
-                raise TypeError("end_node must be an instance of the node class. Got '{}' instead".format(type(end_node)))
-        else:
-            raise ValueError("end_node is not defined")
-        
-        queue = [start_node]
-        visited = set()
-        parent_map = {start_node: None}
+        while unvisited:
+            _, current_node, _ = unvisited.pop()
+            visited.add(current_node.value)
 
-        while queue:
-            current_node = queue.pop(0)
             if current_node == end_node:
                 path = []
                 while current_node:
                     path.append(current_node)
-                    current_node = parent_map[current_node]
-                self.path = path[::-1]
-                return self.path
-            
-            visited.add(current_node)
-            neighbors = self.get_neighbors(current_node)
+                    current_node = current_node.parent
+                return path[::-1], expansions
+            if limits is not None:
+                if self._spent(current_node, current_node.value, expansions, current_node.cost):
+                    self.partial = self._unwind(self.closest[1])
+                    return None, expansions
+                if limits[5] and not expansions % limits[5]:
+                    yield expansions, current_node.value, current_node.cost
+
+            neighbors = self.expand(current_node)
+            expansions += 1
             for neighbor in neighbors:
-                if neighbor not in visited and neighbor not in queue:
-                    parent_map[neighbor] = current_node
-                    queue.append(neighbor)
-        return None
+                if neighbor.value in visited:
+                    continue
+                new_cost = current_node.cost + neighbor.cost
+                # Queue the neighbor, or lower its priority if it is already queued with a higher one
+                if unvisited.push(neighbor.value, new_cost + heuristic(neighbor.value, goal), neighbor):
+                    neighbor.cost = new_cost
+                    neighbor.parent = current_node
+        return None, expansions
 
-class dfs(env):
+class arastar(astar):
 
     """
-    Initializes a depth-first search algorithm.
-    Parameters:
-    - get_neighbors_func: A function that returns the neighbors of a given node.
-    Returns:
-    None
-    """
-    """
-    Finds a path from the start node to the end node using depth-first search.
-    Parameters:
-    - start_node: The starting node of the path. Must be an instance of the node class.
-    - end_node: The ending node of the path. Must be an instance of the node class.
-    Returns:
-    - path: A list of nodes representing the path from the start node to the end node.
-        Returns None if no path is found.
+    Anytime Repairing A* (ARA*), an anytime planner for deadlines.
+    A first path is found quickly with the heuristic inflated by weight, then the
+    weight is lowered step by step and every search reuses the previous one,
+    until the weight reaches 1 (an optimal path) or the time or expansion
+    budget runs out. The best path found so far is always returned, with a
+    bound on how far its cost can be from the optimal one.
+    As in astar with a heuristic, the cost of every neighbor is the cost of the edge to it.
+    Args:
+        get_neighbors_func (function): A function that returns the neighbors of a given node.
+        heuristic (function): A consistent estimate heuristic(value_a, value_b) of the cost between two node values.
+        weight (float, optional): The initial heuristic weight, at least 1. Defaults to 3.0.
+        weight_step (float, optional): How much the weight is lowered after every search. Defaults to 0.5.
+        max_time (float, optional): The wall-clock budget of a query in seconds. Defaults to None (no limit).
+        max_expansions (int, optional): The expansion budget of a query. Defaults to None (no limit).
+        cache_size (int, optional): The size of the neighbor cache. Disabled if None.
+    Attributes:
+        nodes (list): The best path found by the last query.
+        bound (float): The suboptimality bound of the best path: its cost is at most bound times the optimal cost.
+        solutions (list): The cost, bound, weight, expansions and time of every path published by the last query.
+        expansions (int): The number of expansions of the last query.
+    Methods:
+        path(start_node, end_node, max_time=None, max_expansions=None): Finds the best path within the budget.
+        improve(start_node, end_node, max_time=None, max_expansions=None): Yields every improved path and its bound.
     """
 
-    def __init__(self, get_neighbors_func):
-        super().__init__(get_neighbors_func)
-        
-    def path(self, start_node=None, end_node=None):
+    def __init__(self, get_neighbors_func, heuristic, weight=3.0, weight_step=0.5, max_time=None, max_expansions=None, cache_size=None):
+        super().__init__(get_neighbors_func, cache_size, heuristic)
+        if heuristic is None:
+            raise ValueError("heuristic function is not defined")
+        if weight < 1:
+            raise ValueError("weight must be at least 1. Got '{}' instead".format(weight))
+        if weight_step <= 0:
+            raise ValueError("weight_step must be positive. Got '{}' instead".format(weight_step))
+        self.weight = weight
+        self.weight_step = weight_step
+        self.max_time = max_time
+        self.max_expansions = max_expansions
+        self.bound = INF
+        self.solutions = []
+
+    def path(self, start_node=None, end_node=None, max_time=None, max_expansions=None):
 
         """
-        Finds a path from the start_node to the end_node using a depth-first search algorithm.
+        Finds the best path between two nodes within the budget.
         Args:
             start_node (node): The starting node of the path.
-            end_node (node): The target node to reach.
+            end_node (node): The ending node of the path.
+            max_time (float, optional): The wall-clock budget in seconds. Defaults to the budget of the planner.
+            max_expansions (int, optional): The expansion budget. Defaults to the budget of the planner.
         Returns:
-            list: A list of nodes representing the path from start_node to end_node, 
-                or None if no path is found.
+            list: The best path found as a list of nodes, with the cost from the start as their cost.
+                Returns None if no path is found within the budget.
         Raises:
             TypeError: If start_node or end_node is not an instance of the node class.
             ValueError: If start_node or end_node is not defined.
         """
 
-        if start_node is not None:
-            if not isinstance(start_node, node):
-                raise TypeError("start_node must be an instance of the node class. Got '{}' instead".format(type(start_node)))
-        else:
-            raise ValueError("start_node is not defined")
-        
-        if end_node is not None:
-            if not isinstance(end_node, node):
-                raise TypeError("end_node must be an instance of the node class. Got '{}' instead".format(type(end_node)))
-        else:
-            raise ValueError("end_node is not defined")
-        
-        stack = [start_node]
-        visited = set()
-        parent_map = {start_node: None}
+        self._check_nodes(start_node, end_node)
 
-        while stack:
-            current_node = stack.pop()
-            if current_node == end_node:
-                path = []
-                while current_node:
-                    path.append(current_node)
-                    current_node = parent_map[current_node]
-                self.path = path[::-1]
-                return self.path
-            
-            visited.add(current_node)
-            neighbors = self.get_neighbors(current_node)
-            for neighbor in neighbors:
-                if neighbor not in visited and neighbor not in stack:
-                    parent_map[neighbor] = current_node
-                    stack.append(neighbor)
-        return None
+        steps = self._steps(start_node, end_node, None, max_time, max_expansions)
+        if self.instrumented:
+            steps = self._observed(steps, None)
+        path, _ = self._drive(steps)
+        if path is None:
+            return None
+        self.nodes = path
+        return self.nodes
 
-class dijkstra(env):
+    def improve(self, start_node=None, end_node=None, max_time=None, max_expansions=None):
 
-    """
-    Initializes a Dijkstra object.
-    Parameters:
-    - get_neighbors_func (function): A function that returns the neighbors of a given node.
-    Returns:
+        """
+        Yields every improved path between two nodes until the budget runs out or the path is optimal.
+        The caller may stop iterating at any time, e.g. when its own deadline is near.
+        Args:
+            start_node (node): The starting node of the path.
+            end_node (node): The ending node of the path.
+            max_time (float, optional): The wall-clock budget in seconds. Defaults to the budget of the planner.
+            max_expansions (int, optional): The expansion budget. Defaults to the budget of the planner.
+        Yields:
+            tuple: The (path, bound) of every improvement, where bound is the suboptimality bound of the path.
+        Raises:
+            TypeError: If start_node or end_node is not an instance of the node class.
+            ValueError: If start_node or end_node is not defined.
+        """
+
+        self._check_nodes(start_node, end_node)
+        for kind, item in self._improve(start_node, end_node, max_time, max_expansions):
+            if kind == 'path':
+                yield item
+
+    # Improve the path as a generator of ('path', (path, bound)) and ('expand', expansion event) items
+    def _improve(self, start_node, end_node, max_time=None, max_expansions=None):
+
+        self.bound = INF
+        self.solutions = []
+        self.expansions = 0
+        max_time = self.max_time if max_time is None else max_time
+        max_expansions = self.max_expansions if max_expansions is None else max_expansions
+        started = perf_counter()
+        deadline = started + max_time if max_time is not None else INF
+        expansion_limit = max_expansions if max_expansions is not None else INF
+
+        heuristic = self.heuristic
+        goal = end_node.value
+        start_node.cost = 0
+        g = {start_node.value: 0.0}
+        parents = {start_node.value: None}
+        # The cost of the edge from the parent of every node value
+        steps = {start_node.value: 0.0}
+        found = {start_node.value: start_node}
+        unvisited = frontier()
+        inconsistent = set()
+        expansions = 0
+        limits = self.limits
+        weight = self.weight
+        unvisited.push(start_node.value, weight * heuristic(start_node.value, goal))
+
+        while True:
+            # Improve the path: expand until no queued node can lead to a cheaper path at this weight
+            closed = set()
+            while unvisited:
+                value, _, priority = unvisited.peek()
+                if g.get(goal, INF) <= priority:
+                    break
+                if expansions >= expansion_limit or perf_counter() >= deadline:
+                    return
+                if limits is not None:
+                    if self._spent(value, value, expansions, g[value]):
+                        if goal not in g and self.closest[1] is not None:
+                            self.partial = self._build(self.closest[1], parents, steps, found)
+                        return
+                    if limits[5] and not expansions % limits[5]:
+                        yield 'expand', (expansions, value, g[value])
+                unvisited.pop()
+                closed.add(value)
+                expansions += 1
+                self.expansions = expansions
+
+                current_g = g[value]
+                for neighbor in self.expand(found[value]):
+                    new_g = current_g + neighbor.cost
+                    if new_g < g.get(neighbor.value, INF):
+                        g[neighbor.value] = new_g
+                        parents[neighbor.value] = value
+                        steps[neighbor.value] = neighbor.cost
+                        found.setdefault(neighbor.value, neighbor)
+                        if neighbor.value in closed:
+                            inconsistent.add(neighbor.value)
+                        else:
+                            unvisited.push(neighbor.value, new_g + weight * heuristic(neighbor.value, goal))
+
+            if goal not in g:
+                return
+
+            # The g-costs below an inconsistent node are stale until it is expanded again, so the path can be
+            # cheaper than g[goal]. The bound compares its cost to the lowest unweighted estimate left to explore
+            path = self._build(goal, parents, steps, found)
+            cost = path[-1].cost
+            lowest = min([g[value] + heuristic(value, goal) for value in unvisited.best] +
+                         [g[value] + heuristic(value, goal) for value in inconsistent] + [cost])
+            bound = min(weight, cost / lowest) if lowest > 0 else 1.0
+            if not self.solutions or cost < self.solutions[-1]['cost'] or bound < self.bound:
+                self.bound = bound
+                self.solutions.append({'cost': cost, 'bound': bound, 'weight': weight,
+                                       'expansions': expansions, 'time': perf_counter() - started})
+                yield 'path', (path, bound)
+            if bound <= 1.0:
+                return
+
+            # Lower the weight, and queue the inconsistent nodes again with the new priorities
+            weight = max(1.0, weight - self.weight_step)
+            queued = list(unvisited.best) + list(inconsistent)
+            inconsistent.clear()
+            unvisited.clear()
+            for value in queued:
+                unvisited.push(value, g[value] + weight * heuristic(value, goal))
+
+    # Build the list of path nodes ending at a node value, with the cost from the start along the path as their cost
+    @staticmethod
+    def _build(goal, parents, steps, found):
+        chain = []
+        value = goal
+        while value is not None:
+            chain.append(value)
+            value = parents[value]
+        path = []
+        previous = None
+        cost = 0.0
+        for value in reversed(chain):
+            source = found[value]
+            cost += steps[value]
+            current = pathnode(value=value, parent=previous, cost=cost, name=source.name)
+            path.append(current)
+            previous = current
+        return path
+
+    # The open set of every search is local to it
+    def _open_size(self, buffers, closed):
+        return None
+
+    # Search within the budget (the budget of the planner by default) as a generator of expansion events,
+    # returns the best path (or None) and the number of expansions
+    def _steps(self, start_node, end_node, buffers, max_time=None, max_expansions=None):
+        path = None
+        for kind, item in self._improve(start_node, end_node, max_time, max_expansions):
+            if kind == 'path':
+                path = item[0]
+            else:
+                yield item
+        return path, self.expansions
+
+class idastar(env):
+
+    """
+    Iterative deepening A* (IDA*), a memory-bounded A*.
+    Depth-first searches are repeated with a growing bound on the cost from the
+    start plus the heuristic, each bound set to the lowest estimate that went
+    over the previous one. Only the current path and the neighbors of its nodes
+    are kept, so memory grows with the depth of the path instead of the explored
+    area, at the price of expanding nodes again at every iteration. On graphs
+    with many paths to the same node, or when the end cannot be reached, the
+    expansions grow exponentially, so run such queries through search() with a budget.
+    As in dijkstra, the cost of every neighbor is the cost of the edge to it.
+    Args:
+        get_neighbors_func (function): A function that returns the neighbors of a given node.
+        heuristic (function, optional): A consistent estimate heuristic(value_a, value_b) of the cost between two node values.
+            Without one, every iteration only grows the bound to the next path cost, which is slow.
+        cache_size (int, optional): The size of the neighbor cache. Disabled if None.
+    Attributes:
+        nodes (list): The path found by the last search.
+        iterations (int): The number of depth-first searches of the last query.
+    Methods:
+        path(start_node, end_node): Finds the shortest path from start_node to end_node.
+    """
+
+    def __init__(self, get_neighbors_func, heuristic=None, cache_size=None):
+        super().__init__(get_neighbors_func, cache_size)
+        self.heuristic = heuristic
+        self.iterations = 0
+
+    def path(self, start_node=None, end_node=None):
+
+        """
+        Finds the shortest path between two nodes in the graph.
+        Args:
+            start_node (node): The starting node of the path.
+            end_node (node): The ending node of the path.
+        Returns:
+            list: The shortest path as a list of nodes, with the cost from the start as their cost.
+                Returns None if no path is found.
+        Raises:
+            TypeError: If start_node or end_node is not an instance of the node class.
+            ValueError: If start_node or end_node is not defined.
+        """
+
+        self._check_nodes(start_node, end_node)
+
+        path, _ = self._search(start_node, end_node, self._buffers())
+        if path is None:
+            return None
+        self.nodes = path
+        return self.nodes
+
+    # Searches share no buffers between queries
+    def _buffers(self):
+        return None
+
+    # Search with growing bounds as a generator of expansion events, returns the path (or None) and the number of expansions
+    def _steps(self, start_node, end_node, buffers):
+
+        heuristic = self.heuristic
+        goal = end_node.value
+        h = (lambda value: heuristic(value, goal)) if heuristic is not None else (lambda value: 0.0)
+        limits = self.limits
+        expansions = 0
+        self.iterations = 0
+        start_node.cost = 0
+        start_node.parent = None
+        bound = h(start_node.value)
+
+        while bound < INF:
+            self.iterations += 1
+            minimum = INF
+
+            # The current path, the neighbors left to try at every node of it, and its values to skip cycles
+            stack = [start_node]
+            pending = [None]
+            on_path = {start_node.value}
+
+            while stack:
+                current_node = stack[-1]
+                if pending[-1] is None:
+                    estimate = current_node.cost + h(current_node.value)
+                    if estimate > bound:
+                        if estimate < minimum:
+                            minimum = estimate
+                        on_path.discard(stack.pop().value)
+                        pending.pop()
+                        continue
+                    if current_node == end_node:
+                        return self._unwind(current_node), expansions
+                    if limits is not None:
+                        if self._spent(current_node, current_node.value, expansions, current_node.cost):
+                            self.partial = self._unwind(self.closest[1])
+                            return None, expansions
+                        if limits[5] and not expansions % limits[5]:
+                            yield expansions, current_node.value, current_node.cost
+                    expansions += 1
+                    pending[-1] = iter(self.expand(current_node))
+
+                # Descend into the next neighbor off the path, or backtrack
+                for neighbor in pending[-1]:
+                    if neighbor.value not in on_path:
+                        neighbor.cost = current_node.cost + neighbor.cost
+                        neighbor.parent = current_node
+                        stack.append(neighbor)
+                        pending.append(None)
+                        on_path.add(neighbor.value)
+                        break
+                else:
+                    on_path.discard(stack.pop().value)
+                    pending.pop()
+            bound = minimum
+        return None, expansions
+
+# A node held in the memory of smastar
+class _record:
+
+    __slots__ = ('node', 'parent', 'g', 'f', 'depth', 'children', 'forgotten', 'queued')
+
+    def __init__(self, node_, parent, g, f, depth):
+        self.node = node_
+        self.parent = parent
+        self.g = g
+        self.f = f
+        self.depth = depth
+        self.children = {}
+        self.forgotten = INF
+        self.queued = 0
+
+class smastar(env):
+
+    """
+    Simplified memory-bounded A* (SMA*), an A* that never holds more than max_nodes nodes.
+    It runs as A* until its memory is full, then forgets the queued leaf with
+    the highest estimate (the shallowest of them on ties) and backs its
+    estimate up into its parent, which is queued again to regenerate it if the
+    rest of its subtree turns out worse. The path found is optimal if it has
+    fewer than max_nodes nodes, and the search fails otherwise. A small memory
+    may regenerate the same nodes many times, so bound the query with search().
+    As in dijkstra, the cost of every neighbor is the cost of the edge to it.
+    Args:
+        get_neighbors_func (function): A function that returns the neighbors of a given node.
+        heuristic (function, optional): A consistent estimate heuristic(value_a, value_b) of the cost between two node values.
+        max_nodes (int, optional): The most nodes held in memory. Defaults to 100000.
+        cache_size (int, optional): The size of the neighbor cache. Disabled if None.
+    Attributes:
+        nodes (list): The path found by the last search.
+        peak (int): The most nodes held in memory by the last query.
+        forgotten (int): The number of nodes forgotten by the last query.
+    Methods:
+        path(start_node, end_node): Finds the shortest path from start_node to end_node.
+    """
+
+    def __init__(self, get_neighbors_func, heuristic=None, max_nodes=100000, cache_size=None):
+        super().__init__(get_neighbors_func, cache_size)
+        if not isinstance(max_nodes, int) or max_nodes < 2:
+            raise ValueError("max_nodes must be an integer of at least 2. Got '{}' instead".format(max_nodes))
+        self.heuristic = heuristic
+        self.max_nodes = max_nodes
+        self.peak = 0
+        self.forgotten = 0
+
+    def path(self, start_node=None, end_node=None):
+
+        """
+        Finds the shortest path between two nodes within the memory bound.
+        Args:
+            start_node (node): The starting node of the path.
+            end_node (node): The ending node of the path.
+        Returns:
+            list: The shortest path as a list of nodes, with the cost from the start as their cost.
+                Returns None if no path is found, or if the shortest path does not fit in memory.
+        Raises:
+            TypeError: If start_node or end_node is not an instance of the node class.
+            ValueError: If start_node or end_node is not defined.
+        """
+
+        self._check_nodes(start_node, end_node)
+
+        path, _ = self._search(start_node, end_node, self._buffers())
+        if path is None:
+            return None
+        self.nodes = path
+        return self.nodes
+
+    # Searches share no buffers between queries
+    def _buffers(self):
+        return None
+
+    # Search within the memory bound as a generator of expansion events, returns the path (or None) and the number of expansions
+    def _steps(self, start_node, end_node, buffers):
+
+        heuristic = self.heuristic
+        goal = end_node.value
+        h = (lambda value: heuristic(value, goal)) if heuristic is not None else (lambda value: 0.0)
+        limits = self.limits
+        max_nodes = self.max_nodes
+        expansions = 0
+        self.forgotten = 0
+
+        start_node.cost = 0
+        start_node.parent = None
+        root = _record(start_node, None, 0.0, h(start_node.value), 0)
+        held = 1
+        cheapest = {start_node.value: root}
+
+        # Lazy heaps of the queued records: best first for expansion, worst first for forgetting
+        # Entries carry the queue stamp of their record and are skipped once it changes
+        best = []
+        worst = []
+        stamp = 0
+
+        def queue(record):
+            nonlocal stamp
+            stamp += 1
+            record.queued = stamp
+            heappush(best, (record.f, -record.depth, stamp, record))
+            heappush(worst, (-record.f, record.depth, stamp, record))
+            # Stale entries hold forgotten records, drop them before they outnumber the records in memory
+            if len(best) + len(worst) > 3 * held + 32:
+                for heap in (best, worst):
+                    heap[:] = [entry for entry in heap if entry[3].queued == entry[2]]
+                    heapify(heap)
+
+        def forget():
+            # Forget the worst queued leaf, never the root
+            nonlocal held
+            kept = []
+            while worst:
+                entry = heappop(worst)
+                record = entry[3]
+                if record.queued != entry[2]:
+                    continue
+                if record.children or record.parent is None:
+                    kept.append(entry)
+                    continue
+                parent = record.parent
+                held -= 1
+                del parent.children[record.node.value]
+                if cheapest.get(record.node.value) is record:
+                    del cheapest[record.node.value]
+                record.queued = 0
+                record.node = None
+                if record.f < parent.forgotten:
+                    parent.forgotten = record.f
+                if not parent.queued:
+                    queue(parent)
+                self.forgotten += 1
+                break
+            for entry in kept:
+                heappush(worst, entry)
+
+        def backup(record):
+            # The estimate of a record is the lowest estimate of its children, remembered or forgotten
+            while record is not None:
+                lowest = min([child.f for child in record.children.values()] + [record.forgotten])
+                if lowest <= record.f:
+                    break
+                record.f = lowest
+                if record.queued:
+                    queue(record)
+                record = record.parent
+
+        queue(root)
+        self.peak = 1
+
+        while best:
+            f, _, entry_stamp, record = heappop(best)
+            if record.queued != entry_stamp:
+                continue
+            # Only dead ends are left
+            if f == INF:
+                break
+            current_node = record.node
+            if current_node == end_node:
+                return self._unwind(current_node), expansions
+            if limits is not None:
+                if self._spent(current_node, current_node.value, expansions, record.g):
+                    self.partial = self._unwind(self.closest[1])
+                    return None, expansions
+                if limits[5] and not expansions % limits[5]:
+                    yield expansions, current_node.value, record.g
+            record.queued = 0
+            expansions += 1
+
+            # Generate the children that are not in memory, deeper than memory allows they are dead ends
+            record.forgotten = INF
+            for neighbor in self.expand(current_node):
+                value = neighbor.value
+                if value in record.children:
+                    continue
+                g = record.g + neighbor.cost
+                known = cheapest.get(value)
+                if known is not None and known.g <= g:
+                    continue
+                neighbor.cost = g
+                neighbor.parent = current_node
+                if record.depth + 2 >= max_nodes and neighbor != end_node:
+                    estimate = INF
+                else:
+                    estimate = max(record.f, g + h(value))
+                child = _record(neighbor, record, g, estimate, record.depth + 1)
+                record.children[value] = child
+                cheapest[value] = child
+                held += 1
+                queue(child)
+                if held > max_nodes:
+                    forget()
+            self.peak = max(self.peak, held)
+
+            # A dead end keeps its estimate of infinity in memory, so it is the first leaf forgotten
+            backup(record)
+            if not record.children:
+                queue(record)
+        return None, expansions
+
+class bfs(env):
+
+    """
+    Initializes a breadth-first search algorithm.
+    Parameters:
+    - get_neighbors_func: A function that takes a node as input and returns a list of its neighboring nodes.
+    - cache_size (optional): The size of the neighbor cache. Disabled if None.
+    """
+    """
+    Finds the shortest path from start_node to end_node using breadth-first search algorithm.
+    Parameters:
+    - start_node: The starting node of the path. Must be an instance of the node class.
+    - end_node: The ending node of the path. Must be an instance of the node class.
+    Returns:
+    - path: A list of nodes representing the shortest path from start_node to end_node.
+        Returns None if no path is found.
+    """
+
+    def __init__(self, get_neighbors_func, cache_size=None):
+        super().__init__(get_neighbors_func, cache_size)
+        
+    def path(self, start_node=None, end_node=None):
+
+        """
+        Finds the path from start_node to end_node using breadth-first search algorithm.
+        Args:
+            start_node (node, optional): The starting node. Defaults to None.
+            end_node (node, optional): The target node. Defaults to None.
+        Raises:
+            TypeError: If start_node or end_node is not an instance of the node class.
+            ValueError: If start_node or end_node is not defined.
+        Returns:
+            list: The path from start_node to end_node, represented as a list of nodes.
+                Returns None if no path is found.
+        """
+
+        self._check_nodes(start_node, end_node)
+
+        path, _ = self._search(start_node, end_node, self._buffers())
+        if path is None:
+            return None
+        self.nodes = path
+        return self.nodes
+
+    # Create the search buffers, reused across the queries of path_many
+    def _buffers(self):
+        return deque(), {}, {}
+
+    # Get the length of the queue, unless the search runs over the ids of a csrgraph
+    def _open_size(self, buffers, closed):
+        if self.graph is not None and self.cache_size is None:
+            return None
+        return len(buffers[0])
+
+    # Search with the given buffers as a generator of expansion events, returns the path (or None) and the number of expansions
+    def _steps(self, start_node, end_node, buffers):
+
+        # A csrgraph is traversed over its node ids
+        if self.graph is not None and self.cache_size is None:
+            return (yield from self._traverse_graph(start_node, end_node, False))
+
+        # The parent map doubles as the discovered set, so every node is queued at most once
+        queue, parent_map, depths = buffers
+        queue.clear()
+        parent_map.clear()
+        depths.clear()
+        queue.append(start_node)
+        parent_map[start_node] = None
+        depths[start_node] = 0
+        expansions = 0
+        limits = self.limits
+
+        while queue:
+            current_node = queue.popleft()
+            if current_node == end_node:
+                path = []
+                while current_node:
+                    path.append(current_node)
+                    current_node = parent_map[current_node]
+                return path[::-1], expansions
+
+            # Depths are only kept for the cost budget of a bounded search
+            if limits is not None:
+                if self._spent(current_node, current_node.value, expansions, depths[current_node]):
+                    self.partial = self._unwind(self.closest[1], parent_map)
+                    return None, expansions
+                if limits[5] and not expansions % limits[5]:
+                    yield expansions, current_node.value, depths[current_node]
+
+            neighbors = self.expand(current_node)
+            expansions += 1
+            for neighbor in neighbors:
+                if neighbor not in parent_map:
+                    parent_map[neighbor] = current_node
+                    queue.append(neighbor)
+                    if limits is not None:
+                        depths[neighbor] = depths[current_node] + 1
+        return None, expansions
+
+class dfs(env):
+
+    """
+    Initializes a depth-first search algorithm.
+    By default the search remembers every node it discovers. With a max_depth, or
+    with iterative set, it only keeps the current path and the neighbors left to
+    try along it, so memory grows with the depth instead of the explored space.
+    Nodes are only skipped if they are on the current path, so a node reached by
+    several paths is expanded once per path.
+    Parameters:
+    - get_neighbors_func: A function that returns the neighbors of a given node.
+    - cache_size (optional): The size of the neighbor cache. Disabled if None.
+    - max_depth (optional): Depth-limited search: nodes deeper than this number of moves from the start are not searched. Unlimited if None.
+    - iterative (optional): Iterative deepening: depth-limited searches are repeated with limits 0, 1, 2, ... up to max_depth,
+        so the path found has the fewest moves. Defaults to False.
+    Attributes:
+    - iterations: The number of depth-limited searches of the last query.
+    - depth_expansions: The number of expansions at every depth in the last query, over all iterations.
+    Returns:
+    None
+    """
+    """
+    Finds a path from the start node to the end node using depth-first search.
+    Parameters:
+    - start_node: The starting node of the path. Must be an instance of the node class.
+    - end_node: The ending node of the path. Must be an instance of the node class.
+    Returns:
+    - path: A list of nodes representing the path from the start node to the end node.
+        Returns None if no path is found.
+    """
+
+    def __init__(self, get_neighbors_func, cache_size=None, max_depth=None, iterative=False):
+        super().__init__(get_neighbors_func, cache_size)
+
+        if max_depth is not None and (not isinstance(max_depth, int) or max_depth < 0):
+            raise ValueError("max_depth must be a non-negative integer or None. Got '{}' instead".format(max_depth))
+        if not isinstance(iterative, bool):
+            raise ValueError("iterative must be True or False. Got '{}' instead".format(iterative))
+        self.max_depth = max_depth
+        self.iterative = iterative
+        self.iterations = 0
+        self.depth_expansions = []
+        
+    def path(self, start_node=None, end_node=None):
+
+        """
+        Finds a path from the start_node to the end_node using a depth-first search algorithm.
+        Args:
+            start_node (node): The starting node of the path.
+            end_node (node): The target node to reach.
+        Returns:
+            list: A list of nodes representing the path from start_node to end_node, 
+                or None if no path is found.
+        Raises:
+            TypeError: If start_node or end_node is not an instance of the node class.
+            ValueError: If start_node or end_node is not defined.
+        """
+
+        self._check_nodes(start_node, end_node)
+
+        path, _ = self._search(start_node, end_node, self._buffers())
+        if path is None:
+            return None
+        self.nodes = path
+        return self.nodes
+
+    # Create the search buffers, reused across the queries of path_many
+    def _buffers(self):
+        return [], {}, {}
+
+    # Get the height of the stack, unless the search runs over the ids of a csrgraph or keeps only the current path
+    def _open_size(self, buffers, closed):
+        if (self.graph is not None and self.cache_size is None) or self.max_depth is not None or self.iterative:
+            return None
+        return len(buffers[0])
+
+    # Search with the given buffers as a generator of expansion events, returns the path (or None) and the number of expansions
+    def _steps(self, start_node, end_node, buffers):
+
+        if self.max_depth is not None or self.iterative:
+            return (yield from self._deepening(start_node, end_node))
+
+        # A csrgraph is traversed over its node ids
+        if self.graph is not None and self.cache_size is None:
+            return (yield from self._traverse_graph(start_node, end_node, True))
+
+        # The parent map doubles as the discovered set, so every node is queued at most once
+        stack, parent_map, depths = buffers
+        stack.clear()
+        parent_map.clear()
+        depths.clear()
+        stack.append(start_node)
+        parent_map[start_node] = None
+        depths[start_node] = 0
+        expansions = 0
+        limits = self.limits
+
+        while stack:
+            current_node = stack.pop()
+            if current_node == end_node:
+                path = []
+                while current_node:
+                    path.append(current_node)
+                    current_node = parent_map[current_node]
+                return path[::-1], expansions
+
+            # Depths are only kept for the cost budget of a bounded search
+            if limits is not None:
+                if self._spent(current_node, current_node.value, expansions, depths[current_node]):
+                    self.partial = self._unwind(self.closest[1], parent_map)
+                    return None, expansions
+                if limits[5] and not expansions % limits[5]:
+                    yield expansions, current_node.value, depths[current_node]
+
+            neighbors = self.expand(current_node)
+            expansions += 1
+            for neighbor in neighbors:
+                if neighbor not in parent_map:
+                    parent_map[neighbor] = current_node
+                    stack.append(neighbor)
+                    if limits is not None:
+                        depths[neighbor] = depths[current_node] + 1
+        return None, expansions
+
+    # Depth-limited or iterative deepening search keeping only the current path, as a generator of expansion events
+    def _deepening(self, start_node, end_node):
+
+        limits = self.limits
+        max_depth = INF if self.max_depth is None else self.max_depth
+        limit = 0 if self.iterative else max_depth
+        expansions = 0
+        self.iterations = 0
+        self.depth_expansions = []
+        depth_expansions = self.depth_expansions
+        start_node.parent = None
+
+        while True:
+            self.iterations += 1
+            cutoff = False
+
+            # The current path, the neighbors left to try at every node of it, and its values to skip cycles
+            stack = [start_node]
+            pending = [None]
+            on_path = {start_node.value}
+
+            while stack:
+                current_node = stack[-1]
+                if pending[-1] is None:
+                    if current_node == end_node:
+                        return list(stack), expansions
+                    depth = len(stack) - 1
+                    if depth >= limit:
+                        cutoff = True
+                        on_path.discard(stack.pop().value)
+                        pending.pop()
+                        continue
+                    if limits is not None:
+                        if self._spent(current_node, current_node.value, expansions, depth):
+                            self.partial = self._unwind(self.closest[1])
+                            return None, expansions
+                        if limits[5] and not expansions % limits[5]:
+                            yield expansions, current_node.value, depth
+                    expansions += 1
+                    if depth == len(depth_expansions):
+                        depth_expansions.append(0)
+                    depth_expansions[depth] += 1
+                    pending[-1] = iter(self.expand(current_node))
+
+                # Descend into the next neighbor off the path, or backtrack
+                for neighbor in pending[-1]:
+                    if neighbor.value not in on_path:
+                        neighbor.parent = current_node
+                        stack.append(neighbor)
+                        pending.append(None)
+                        on_path.add(neighbor.value)
+                        break
+                else:
+                    on_path.discard(stack.pop().value)
+                    pending.pop()
+
+            # Deepen only if the limit cut some path short
+            if not cutoff or limit >= max_depth:
+                return None, expansions
+            limit += 1
+
+class dijkstra(env):
+
+    """
+    Initializes a Dijkstra object.
+    Parameters:
+    - get_neighbors_func (function): A function that returns the neighbors of a given node.
+    - cache_size (int, optional): The size of the neighbor cache. Disabled if None.
+    Returns:
     - None
     """
     """
@@ -385,8 +1680,8 @@ class dijkstra(env):
     - None: If no path is found.
     """
 
-    def __init__(self, get_neighbors_func):
-        super().__init__(get_neighbors_func)
+    def __init__(self, get_neighbors_func, cache_size=None):
+        super().__init__(get_neighbors_func, cache_size)
         
     def path(self, start_node=None, end_node=None):
         
@@ -402,44 +1697,1716 @@ class dijkstra(env):
             ValueError: If start_node or end_node is not defined.
         """
         
-        if start_node:
-            if not isinstance(start_node, node):
-                raise TypeError("start_node must be an instance of the node class. Got '{}' instead".format(type(start_node)))
-        else:
-            raise ValueError("start_node is not defined")
-        
-        if end_node:
-            if not isinstance(end_node, node):
-                raise TypeError("end_node must be an instance of the node class. Got '{}' instead".format(type(end_node)))
-        else:
-            raise ValueError("end_node is not defined")
-        
-        unvisited = []
-        visited = []
+        self._check_nodes(start_node, end_node)
+
+        path, _ = self._search(start_node, end_node, self._buffers())
+        if path is None:
+            return None
+        self.nodes = path
+        return self.nodes
+
+    # Create the search buffers, reused across the queries of path_many
+    def _buffers(self):
+        return frontier(), set()
+
+    # Get the size of the open set, unless the search runs over the ids of a csrgraph
+    def _open_size(self, buffers, closed):
+        if self.graph is not None and self.cache_size is None:
+            return None
+        return len(buffers[0])
+
+    def tree(self, start_node=None, max_cost=None):
+
+        """
+        Builds the shortest path tree of a start node.
+        The search runs until every reachable node is settled, or until the
+        cost bound is reached, and the tree answers path queries to any
+        settled node in O(path length) without searching again.
+        Args:
+            start_node (node): The root of the tree.
+            max_cost (float, optional): Stop once the cost from the start exceeds this bound. Defaults to None (no bound).
+        Returns:
+            pathtree: The shortest path tree.
+        Raises:
+            TypeError: If start_node is not an instance of the node class.
+            ValueError: If start_node is not defined.
+        """
+
+        self._check_nodes(start_node, start_node)
+
+        unvisited = frontier()
+        settled = {}
         start_node.cost = 0
-        unvisited.append(start_node)
+        unvisited.push(start_node.value, 0, start_node)
 
         while unvisited:
-            current_node = min(unvisited, key=lambda x: x.cost)
-            unvisited.remove(current_node)
-            visited.append(current_node)
+            _, current_node, cost = unvisited.pop()
+            if max_cost is not None and cost > max_cost:
+                break
+            settled[current_node.value] = current_node
 
-            if current_node == end_node:
-                path = []
-                while current_node:
-                    path.append(current_node)
-                    current_node = current_node.parent
-                self.path = path[::-1]
-                return self.path
+            for neighbor in self.expand(current_node):
+                if neighbor.value in settled:
+                    continue
+                new_cost = cost + neighbor.cost
+                if unvisited.push(neighbor.value, new_cost, neighbor):
+                    neighbor.cost = new_cost
+                    neighbor.parent = current_node
+        return pathtree(start_node, settled)
+
+    # Search with the given buffers as a generator of expansion events, returns the path (or None) and the number of expansions
+    def _steps(self, start_node, end_node, buffers):
+
+        if self.graph is not None and self.cache_size is None:
+            return (yield from self._search_graph(start_node, end_node))
+
+        # Open set as a binary heap keyed by node value, closed set as a hash set
+        unvisited, visited = buffers
+        unvisited.clear()
+        visited.clear()
+        expansions = 0
+        limits = self.limits
+        start_node.cost = 0
+        unvisited.push(start_node.value, 0, start_node)
+
+        while unvisited:
+            _, current_node, _ = unvisited.pop()
+            visited.add(current_node.value)
+
+            if current_node == end_node:
+                path = []
+                while current_node:
+                    path.append(current_node)
+                    current_node = current_node.parent
+                return path[::-1], expansions
+            if limits is not None:
+                if self._spent(current_node, current_node.value, expansions, current_node.cost):
+                    self.partial = self._unwind(self.closest[1])
+                    return None, expansions
+                if limits[5] and not expansions % limits[5]:
+                    yield expansions, current_node.value, current_node.cost
 
-            neighbors = self.get_neighbors(current_node)
+            neighbors = self.expand(current_node)
+            expansions += 1
             for neighbor in neighbors:
-                if neighbor in visited:
+                if neighbor.value in visited:
                     continue
                 new_cost = current_node.cost + neighbor.cost
-                if neighbor not in unvisited or new_cost < neighbor.cost:
+                # Queue the neighbor, or lower its cost if it is already queued with a higher one
+                if unvisited.push(neighbor.value, new_cost, neighbor):
                     neighbor.cost = new_cost
                     neighbor.parent = current_node
-                    if neighbor not in unvisited:
-                        unvisited.append(neighbor)
+        return None, expansions
+
+class biastar(env):
+
+    """
+    Bidirectional A* for pathfinding in a graph.
+    A forward search from the start and a backward search from the end meet in
+    the middle. Both use the average potential (h(v, end) - h(v, start)) / 2,
+    so the search can stop with an optimal path as soon as the two smallest
+    frontier keys add up to the cost of the best path found. Without a
+    heuristic it is a bidirectional Dijkstra search.
+    As in dijkstra, the cost of every neighbor returned by get_neighbors_func
+    is the cost of the edge to it.
+    Args:
+        get_neighbors_func (function): A function that returns the neighbors of a given node.
+        heuristic (function, optional): A consistent estimate heuristic(value_a, value_b) of the cost between two node values.
+        get_reverse_neighbors_func (function, optional): A function that returns the nodes with an edge into a given node,
+            with the cost of that edge as their cost. Defaults to get_neighbors_func (an undirected graph).
+        cache_size (int, optional): The size of the neighbor cache. Disabled if None.
+    Attributes:
+        nodes (list): The path found by the last search.
+    Methods:
+        path(start_node, end_node): Finds the shortest path from start_node to end_node.
+    """
+
+    def __init__(self, get_neighbors_func, heuristic=None, get_reverse_neighbors_func=None, cache_size=None):
+        super().__init__(get_neighbors_func, cache_size)
+        self.heuristic = heuristic
+        self.get_reverse_neighbors = get_reverse_neighbors_func
+        if get_reverse_neighbors_func is None and self.graph is not None:
+            self.get_reverse_neighbors = self.graph.reverse_neighbors
+
+    def path(self, start_node=None, end_node=None):
+
+        """
+        Finds the shortest path between two nodes in the graph.
+        Args:
+            start_node (node): The starting node of the path.
+            end_node (node): The ending node of the path.
+        Returns:
+            list: The shortest path as a list of nodes, with the cost from the start as their cost.
+                Returns None if no path is found.
+        Raises:
+            TypeError: If start_node or end_node is not an instance of the node class.
+            ValueError: If start_node or end_node is not defined.
+        """
+
+        self._check_nodes(start_node, end_node)
+
+        path, _ = self._search(start_node, end_node, self._buffers())
+        if path is None:
+            return None
+        self.nodes = path
+        return self.nodes
+
+    # Create the search buffers (open set, costs, parents and nodes of each direction), reused across the queries of path_many
+    def _buffers(self):
+        return (frontier(), {}, {}, {}), (frontier(), {}, {}, {})
+
+    # Get the size of the open sets of both directions
+    def _open_size(self, buffers, closed):
+        return len(buffers[0][0]) + len(buffers[1][0])
+
+    # Get the nodes with an edge into a node, for the backward search
+    def _expand_reverse(self, current_node):
+        if self.get_reverse_neighbors is None:
+            return self.expand(current_node)
+        return self.get_reverse_neighbors(current_node)
+
+    # Search with the given buffers as a generator of expansion events, returns the path (or None) and the number of expansions
+    def _steps(self, start_node, end_node, buffers):
+
+        for side in buffers:
+            for buffer in side:
+                buffer.clear()
+
+        start = start_node.value
+        end = end_node.value
+        heuristic = self.heuristic
+        if heuristic is None:
+            potential = lambda value: 0.0
+        else:
+            potential = lambda value: (heuristic(value, end) - heuristic(value, start)) / 2
+
+        # Forward keys add the potential, backward keys subtract it
+        forward, backward = buffers
+        directions = ((forward, backward, self.expand, 1), (backward, forward, self._expand_reverse, -1))
+        for (unvisited, costs, parents, found), first_node, sign in ((forward, start_node, 1), (backward, end_node, -1)):
+            value = first_node.value
+            unvisited.push(value, sign * potential(value), first_node)
+            costs[value] = 0
+            parents[value] = None
+            found[value] = first_node
+
+        best = 0 if start == end else INF
+        meeting = start if start == end else None
+        closed = (set(), set())
+        expansions = 0
+        limits = self.limits
+
+        while forward[0] and backward[0]:
+            if forward[0].peek()[2] + backward[0].peek()[2] >= best:
+                break
+
+            # Expand the direction with the smaller frontier
+            direction = 0 if len(forward[0]) <= len(backward[0]) else 1
+            (unvisited, costs, parents, found), other, expand, sign = directions[direction]
+            value, current_node, _ = unvisited.pop()
+            current_cost = costs[value]
+
+            # Only forward nodes are candidates for the partial path of a bounded search
+            if limits is not None:
+                if self._spent(value, value if direction == 0 else None, expansions, current_cost):
+                    if meeting is None:
+                        self.partial = self._forward(self.closest[1], forward)
+                        return None, expansions
+                    break
+                if limits[5] and not expansions % limits[5]:
+                    yield expansions, value, current_cost
+            closed[direction].add(value)
+            expansions += 1
+            other_costs = other[1]
+
+            for neighbor in expand(current_node):
+                neighbor_value = neighbor.value
+                if neighbor_value in closed[direction]:
+                    continue
+                new_cost = current_cost + neighbor.cost
+                if new_cost < costs.get(neighbor_value, INF):
+                    costs[neighbor_value] = new_cost
+                    parents[neighbor_value] = value
+                    found[neighbor_value] = neighbor
+                    unvisited.push(neighbor_value, new_cost + sign * potential(neighbor_value), neighbor)
+
+                    # Update the best path if the other direction has reached this node
+                    other_cost = other_costs.get(neighbor_value)
+                    if other_cost is not None and new_cost + other_cost < best:
+                        best = new_cost + other_cost
+                        meeting = neighbor_value
+
+        if meeting is None:
+            return None, expansions
+        return self._join(meeting, best, buffers), expansions
+
+    # Get the path from the start to a value reached by the forward search
+    @staticmethod
+    def _forward(value, side):
+        if value is None:
+            return None
+        _, costs, parents, found = side
+        values = []
+        while value is not None:
+            values.append(value)
+            value = parents[value]
+        path = []
+        previous = None
+        for value in reversed(values):
+            current_node = found[value]
+            current_node.cost = costs[value]
+            current_node.parent = previous
+            path.append(current_node)
+            previous = current_node
+        return path
+
+    # Join the forward and backward halves of the path at the meeting value
+    @staticmethod
+    def _join(meeting, total, buffers):
+
+        (_, forward_costs, forward_parents, forward_found), (_, backward_costs, backward_parents, backward_found) = buffers
+
+        # Values from the start to the meeting value, then on to the end
+        values = []
+        value = meeting
+        while value is not None:
+            values.append(value)
+            value = forward_parents[value]
+        values.reverse()
+        middle = len(values)
+        value = backward_parents[meeting]
+        while value is not None:
+            values.append(value)
+            value = backward_parents[value]
+
+        # Relink the nodes with their parent on the path and their cost from the start. Past the meeting value the
+        # forward search may also have reached a value, but not along this path, so its cost comes from the end
+        path = []
+        previous = None
+        for position, value in enumerate(values):
+            if position < middle:
+                current_node = forward_found[value]
+                current_node.cost = forward_costs[value]
+            else:
+                current_node = backward_found[value]
+                current_node.cost = total - backward_costs[value]
+            current_node.parent = previous
+            path.append(current_node)
+            previous = current_node
+        return path
+
+class bidijkstra(biastar):
+
+    """
+    Bidirectional Dijkstra for pathfinding in a graph, a biastar without heuristic.
+    Args:
+        get_neighbors_func (function): A function that returns the neighbors of a given node, with the edge cost as their cost.
+        get_reverse_neighbors_func (function, optional): A function that returns the nodes with an edge into a given node.
+            Defaults to get_neighbors_func (an undirected graph).
+        cache_size (int, optional): The size of the neighbor cache. Disabled if None.
+    """
+
+    def __init__(self, get_neighbors_func, get_reverse_neighbors_func=None, cache_size=None):
+        super().__init__(get_neighbors_func, None, get_reverse_neighbors_func, cache_size)
+
+class bibfs(env):
+
+    """
+    Bidirectional breadth-first search for pathfinding in a graph.
+    The start and end searches grow one level at a time, always on the side
+    with the smaller frontier, and stop at the level where they meet, so each
+    side explores about half the depth of a single breadth-first search.
+    Args:
+        get_neighbors_func (function): A function that returns the neighbors of a given node.
+        get_reverse_neighbors_func (function, optional): A function that returns the nodes with an edge into a given node.
+            Defaults to get_neighbors_func (an undirected graph).
+        cache_size (int, optional): The size of the neighbor cache. Disabled if None.
+    Attributes:
+        nodes (list): The path found by the last search.
+    Methods:
+        path(start_node, end_node): Finds a path with the fewest edges from start_node to end_node.
+    """
+
+    def __init__(self, get_neighbors_func, get_reverse_neighbors_func=None, cache_size=None):
+        super().__init__(get_neighbors_func, cache_size)
+        self.get_reverse_neighbors = get_reverse_neighbors_func
+        if get_reverse_neighbors_func is None and self.graph is not None:
+            self.get_reverse_neighbors = self.graph.reverse_neighbors
+
+    def path(self, start_node=None, end_node=None):
+
+        """
+        Finds a path with the fewest edges between two nodes in the graph.
+        Args:
+            start_node (node): The starting node of the path.
+            end_node (node): The ending node of the path.
+        Returns:
+            list: The path as a list of nodes, or None if no path is found.
+        Raises:
+            TypeError: If start_node or end_node is not an instance of the node class.
+            ValueError: If start_node or end_node is not defined.
+        """
+
+        self._check_nodes(start_node, end_node)
+
+        path, _ = self._search(start_node, end_node, self._buffers())
+        if path is None:
+            return None
+        self.nodes = path
+        return self.nodes
+
+    # Create the search buffers (parents, nodes and depths of each direction), reused across the queries of path_many
+    def _buffers(self):
+        return ({}, {}, {}), ({}, {}, {})
+
+    # Get the nodes with an edge into a node, for the backward search
+    def _expand_reverse(self, current_node):
+        if self.get_reverse_neighbors is None:
+            return self.expand(current_node)
+        return self.get_reverse_neighbors(current_node)
+
+    # Search with the given buffers as a generator of expansion events, returns the path (or None) and the number of expansions
+    def _steps(self, start_node, end_node, buffers):
+
+        for side in buffers:
+            for buffer in side:
+                buffer.clear()
+
+        if start_node.value == end_node.value:
+            return [start_node], 0
+
+        for (parents, found, depths), first_node in zip(buffers, (start_node, end_node)):
+            parents[first_node.value] = None
+            found[first_node.value] = first_node
+            depths[first_node.value] = 0
+
+        levels = [[start_node], [end_node]]
+        expansions = 0
+        limits = self.limits
+
+        while levels[0] and levels[1]:
+
+            # Grow the side with the smaller frontier by one level
+            direction = 0 if len(levels[0]) <= len(levels[1]) else 1
+            parents, found, depths = buffers[direction]
+            other_depths = buffers[1 - direction][2]
+            expand = self.expand if direction == 0 else self._expand_reverse
+            next_level = []
+            best = INF
+            meeting = None
+
+            # The whole level is grown, the first meeting is not always the shortest
+            for current_node in levels[direction]:
+                if limits is not None:
+                    if self._spent(current_node.value, current_node.value if direction == 0 else None, expansions, depths[current_node.value]):
+                        if meeting is not None:
+                            return self._join(meeting, buffers), expansions
+                        self.partial = self._forward(self.closest[1], buffers[0])
+                        return None, expansions
+                    if limits[5] and not expansions % limits[5]:
+                        yield expansions, current_node.value, depths[current_node.value]
+                expansions += 1
+                depth = depths[current_node.value] + 1
+                for neighbor in expand(current_node):
+                    neighbor_value = neighbor.value
+                    if neighbor_value in parents:
+                        continue
+                    parents[neighbor_value] = current_node.value
+                    found[neighbor_value] = neighbor
+                    depths[neighbor_value] = depth
+                    next_level.append(neighbor)
+                    other_depth = other_depths.get(neighbor_value)
+                    if other_depth is not None and depth + other_depth < best:
+                        best = depth + other_depth
+                        meeting = neighbor_value
+
+            if meeting is not None:
+                return self._join(meeting, buffers), expansions
+            levels[direction] = next_level
+        return None, expansions
+
+    # Join the forward and backward halves of the path at the meeting value
+    @staticmethod
+    def _join(meeting, buffers):
+
+        (forward_parents, forward_found, _), (backward_parents, backward_found, _) = buffers
+
+        values = []
+        value = meeting
+        while value is not None:
+            values.append(value)
+            value = forward_parents[value]
+        values.reverse()
+        value = backward_parents[meeting]
+        while value is not None:
+            values.append(value)
+            value = backward_parents[value]
+
+        path = []
+        previous = None
+        for value in values:
+            current_node = forward_found[value] if value in forward_found else backward_found[value]
+            current_node.parent = previous
+            path.append(current_node)
+            previous = current_node
+        return path
+
+    # Get the path from the start to a value reached by the forward search
+    @staticmethod
+    def _forward(value, side):
+        if value is None:
+            return None
+        parents, found, _ = side
+        path = []
+        while value is not None:
+            path.append(found[value])
+            value = parents[value]
+        path.reverse()
+        previous = None
+        for current_node in path:
+            current_node.parent = previous
+            previous = current_node
+        return path
+
+class dstarlite(env):
+
+    """
+    D* Lite, an incremental planner that repairs its last search when edge costs change.
+    The search runs backward from the end node and keeps its state between
+    calls. After the map changes, update() marks the changed node values and
+    the next path() call only repairs the part of the search they affect.
+    The start node may move between calls (e.g. as the robot drives).
+    As in dijkstra, the cost of every neighbor returned by get_neighbors_func
+    is the cost of the edge to it, and get_neighbors_func must reflect the
+    current map.
+    Args:
+        get_neighbors_func (function): A function that returns the neighbors of a given node.
+        heuristic (function, optional): A consistent estimate heuristic(value_a, value_b) of the cost between two node values.
+        get_reverse_neighbors_func (function, optional): A function that returns the nodes with an edge into a given node,
+            with the cost of that edge as their cost. Defaults to get_neighbors_func (an undirected graph).
+        cache_size (int, optional): The size of the neighbor cache. Disabled if None. update() invalidates it.
+    Attributes:
+        nodes (list): The path found by the last search.
+        expansions (int): The number of expansions of the last path() call.
+    Methods:
+        path(start_node, end_node): Finds or repairs the shortest path from start_node to end_node.
+        update(values): Marks the node values whose edges changed.
+        reset(): Forgets the search state.
+    """
+
+    def __init__(self, get_neighbors_func, heuristic=None, get_reverse_neighbors_func=None, cache_size=None):
+        super().__init__(get_neighbors_func, cache_size)
+        self.heuristic = heuristic
+        self.get_reverse_neighbors = get_reverse_neighbors_func
+        if get_reverse_neighbors_func is None and self.graph is not None:
+            self.get_reverse_neighbors = self.graph.reverse_neighbors
+        self.expansions = 0
+        self.reset()
+
+    # Forget the search state
+    def reset(self):
+
+        """
+        Forgets the search state, the next path() call searches from scratch.
+        """
+
+        self.start = None
+        self.last = None
+        self.goal = None
+        self.km = 0
+        self.g = {}
+        self.rhs = {}
+        self.found = {}
+        self.open = frontier()
+
+    def path(self, start_node=None, end_node=None):
+
+        """
+        Finds the shortest path between two nodes, reusing the previous search for the same end node.
+        Args:
+            start_node (node): The starting node of the path.
+            end_node (node): The ending node of the path.
+        Returns:
+            list: The shortest path as a list of nodes, with the cost from the start as their cost.
+                Returns None if no path is found.
+        Raises:
+            TypeError: If start_node or end_node is not an instance of the node class.
+            ValueError: If start_node or end_node is not defined.
+        """
+
+        self._check_nodes(start_node, end_node)
+
+        path, self.expansions = self._search(start_node, end_node, self._buffers())
+        if path is None:
+            return None
+        self.nodes = path
+        return self.nodes
+
+    # The search state is kept between queries, no buffers are shared
+    def _buffers(self):
         return None
+
+    # Repair the search for a query as a generator of expansion events, returns the path (or None) and the number of expansions
+    # A search stopped by its budget leaves the queue consistent, the next query carries on from it
+    def _steps(self, start_node, end_node, buffers):
+
+        if self.goal is None or end_node.value != self.goal:
+            self.reset()
+            self.start = self.last = start_node.value
+            self.goal = end_node.value
+            self.found[self.goal] = end_node
+            self.rhs[self.goal] = 0
+            self.open.push(self.goal, self._key(self.goal))
+        elif start_node.value != self.start:
+            # Keys already queued stay valid lower bounds by adding how far the start moved
+            self.km += self._h(self.last, start_node.value)
+            self.start = self.last = start_node.value
+        self.found[self.start] = start_node
+
+        expansions = yield from self._compute()
+        if self.limits is not None and self.exceeded:
+            return None, expansions
+        return self._extract(), expansions
+
+    def update(self, values):
+
+        """
+        Marks the node values whose edges changed, e.g. the cells of a map that changed.
+        The values, their neighbors and the nodes with an edge into them are made
+        consistent again on the next path() call.
+        Args:
+            values (iterable): The changed node values.
+        Returns:
+            None
+        """
+
+        values = list(values)
+        if self.cache_size is not None:
+            self.invalidate(values)
+
+        affected = set(values)
+        for value in values:
+            affected.update(neighbor for neighbor, _ in self._successors(value))
+            affected.update(neighbor for neighbor, _ in self._predecessors(value))
+        if self.cache_size is not None:
+            self.invalidate(affected)
+
+        if self.goal is None:
+            return
+        for value in affected:
+            if value != self.goal:
+                self.rhs[value] = self._lookahead(value)
+            self._update_vertex(value)
+
+    # Get the heuristic between two node values
+    def _h(self, a, b):
+        return self.heuristic(a, b) if self.heuristic is not None else 0
+
+    # Get the queue key of a node value
+    def _key(self, value):
+        best = min(self.g.get(value, INF), self.rhs.get(value, INF))
+        return (best + self._h(self.start, value) + self.km, best)
+
+    # Get a node object for a node value
+    def _node(self, value):
+        current_node = self.found.get(value)
+        if current_node is None:
+            current_node = self.found[value] = pathnode(value=value, name=str(value))
+        return current_node
+
+    # Get the (value, edge cost) pairs of the successors of a node value
+    def _successors(self, value):
+        found = self.found
+        pairs = []
+        for neighbor in self.expand(self._node(value)):
+            if neighbor.value not in found:
+                found[neighbor.value] = neighbor
+            pairs.append((neighbor.value, neighbor.cost))
+        return pairs
+
+    # Get the (value, edge cost) pairs of the predecessors of a node value
+    def _predecessors(self, value):
+        if self.get_reverse_neighbors is None:
+            return self._successors(value)
+        found = self.found
+        pairs = []
+        for neighbor in self.get_reverse_neighbors(self._node(value)):
+            if neighbor.value not in found:
+                found[neighbor.value] = neighbor
+            pairs.append((neighbor.value, neighbor.cost))
+        return pairs
+
+    # Get the best cost to the goal through the successors of a node value
+    def _lookahead(self, value):
+        g = self.g
+        best = INF
+        for neighbor, cost in self._successors(value):
+            total = cost + g.get(neighbor, INF)
+            if total < best:
+                best = total
+        return best
+
+    # Queue a node value if it is inconsistent, remove it otherwise
+    def _update_vertex(self, value):
+        if self.g.get(value, INF) != self.rhs.get(value, INF):
+            self.open.update(value, self._key(value))
+        else:
+            self.open.remove(value)
+
+    # Make the search consistent up to the start as a generator of expansion events, returns the number of expansions
+    def _compute(self):
+
+        g = self.g
+        rhs = self.rhs
+        unvisited = self.open
+        goal = self.goal
+        start = self.start
+        expansions = 0
+        limits = self.limits
+
+        while unvisited:
+            value, _, key = unvisited.peek()
+            if key >= self._key(start) and rhs.get(start, INF) <= g.get(start, INF):
+                break
+
+            new_key = self._key(value)
+            if key < new_key:
+                unvisited.update(value, new_key)
+                continue
+
+            # The search runs backward, so its nodes are no partial path from the start
+            if limits is not None:
+                if self._spent(value, None, expansions, new_key[1]):
+                    break
+                if limits[5] and not expansions % limits[5]:
+                    yield expansions, value, new_key[1]
+            expansions += 1
+            old_g = g.get(value, INF)
+            value_rhs = rhs.get(value, INF)
+            if old_g > value_rhs:
+                # Overconsistent, settle it and relax its predecessors
+                g[value] = value_rhs
+                unvisited.remove(value)
+                for neighbor, cost in self._predecessors(value):
+                    if neighbor != goal and cost + value_rhs < rhs.get(neighbor, INF):
+                        rhs[neighbor] = cost + value_rhs
+                    self._update_vertex(neighbor)
+            else:
+                # Underconsistent, raise it and recompute the nodes that relied on it
+                g[value] = INF
+                for neighbor, cost in self._predecessors(value):
+                    if neighbor != goal and rhs.get(neighbor, INF) == cost + old_g:
+                        rhs[neighbor] = self._lookahead(neighbor)
+                    self._update_vertex(neighbor)
+                if value != goal:
+                    rhs[value] = self._lookahead(value)
+                self._update_vertex(value)
+        return expansions
+
+    # Follow the best successors from the start to the goal
+    def _extract(self):
+
+        g = self.g
+        value = self.start
+        if self.rhs.get(value, INF) == INF:
+            return None
+
+        path = []
+        previous = None
+        cost = 0
+        seen = set()
+        while True:
+            source = self.found.get(value)
+            current_node = pathnode(value=value, parent=previous, cost=cost, name=source.name if source is not None else None)
+            path.append(current_node)
+            if value == self.goal:
+                return path
+            seen.add(value)
+
+            best = INF
+            best_value = None
+            best_cost = 0
+            for neighbor, edge_cost in self._successors(value):
+                total = edge_cost + g.get(neighbor, INF)
+                if total < best:
+                    best, best_value, best_cost = total, neighbor, edge_cost
+            if best_value is None or best_value in seen:
+                return None
+            previous = current_node
+            value = best_value
+            cost += best_cost
+
+class searchresult:
+
+    """
+    The result of a bounded search, returned by search().
+    Attributes:
+        status (str): 'found' if a path was found, 'exhausted' if every reachable node was expanded without
+            reaching the end, or 'budget' if the search stopped at its expansion, cost or time budget.
+            A bidirectional or anytime search stopped by its budget after it had joined a path reports 'found',
+            with the best path it had, which may not be the shortest.
+        path (list): The path found, or None.
+        partial (list): If the budget ran out, the path to the expanded node closest to the end by the heuristic,
+            or None without a heuristic.
+        cost (float): The cost of the path, or None if no path was found.
+        expansions (int): The number of expansions.
+        time (float): The wall-clock time of the search in seconds.
+    Methods:
+        __bool__(): Checks if a path was found.
+    """
+
+    def __init__(self, status, path, partial, expansions, elapsed):
+        self.status = status
+        self.path = path
+        self.partial = partial
+        self.cost = path[-1].cost if path else None
+        self.expansions = expansions
+        self.time = elapsed
+
+    # Check if a path was found
+    def __bool__(self):
+        return self.status == 'found'
+
+    def __repr__(self):
+        return "searchresult(status='{}', length={}, expansions={}, time={:.6f})".format(
+            self.status, len(self.path if self.path is not None else self.partial or ()), self.expansions, self.time)
+
+class searchprofile:
+
+    """
+    The instrumentation counters of one query, recorded by a planner after env.instrument() is called.
+    Attributes:
+        planner (str): The class name of the planner.
+        found (bool): Whether a path was found.
+        expansions (int): The number of expansions.
+        closed (int): The number of different node values expanded, the size of the closed set.
+        reopens (int): The number of expansions of a node value already expanded in the query.
+            Planners that expand nodes again (idastar, smastar, arastar, dfs modes) count them here,
+            and so do nodes expanded from both sides by the bidirectional planners.
+        frontier_peak (int): The largest open set before an expansion, or None if the planner does not keep one.
+        neighbor_calls (int): The number of calls to get_neighbors and get_reverse_neighbors.
+        heuristic_calls (int): The number of calls to the heuristic.
+        time (float): The wall-clock time of the query in seconds.
+        phases (dict): The time spent in 'neighbors' (get_neighbors and get_reverse_neighbors), in 'heuristic',
+            and in 'search': everything else, including the queue, the path and the instrumentation.
+    Methods:
+        as_dict(): Returns the counters as a dictionary.
+    """
+
+    def __init__(self, planner, found, expansions, closed, reopens, frontier_peak, neighbor_calls, heuristic_calls, elapsed, phases):
+        self.planner = planner
+        self.found = found
+        self.expansions = expansions
+        self.closed = closed
+        self.reopens = reopens
+        self.frontier_peak = frontier_peak
+        self.neighbor_calls = neighbor_calls
+        self.heuristic_calls = heuristic_calls
+        self.time = elapsed
+        self.phases = phases
+
+    # Get the counters as a dictionary, e.g. to log them
+    def as_dict(self):
+        return {
+            'planner': self.planner,
+            'found': self.found,
+            'expansions': self.expansions,
+            'closed': self.closed,
+            'reopens': self.reopens,
+            'frontier_peak': self.frontier_peak,
+            'neighbor_calls': self.neighbor_calls,
+            'heuristic_calls': self.heuristic_calls,
+            'time': self.time,
+            'phases': dict(self.phases),
+        }
+
+    # Print the profile
+    def __repr__(self):
+        return "searchprofile(planner='{}', found={}, expansions={}, frontier_peak={}, time={:.6f})".format(
+            self.planner, self.found, self.expansions, self.frontier_peak, self.time)
+
+class pathtree:
+
+    """
+    A shortest path tree built by dijkstra.tree.
+    Every settled node keeps its parent, so a path is extracted by walking from
+    the goal back to the root.
+    Attributes:
+        root (node): The root of the tree.
+        settled (dict): The settled nodes, keyed by node value.
+    Methods:
+        __len__(): Returns the number of settled nodes.
+        __contains__(goal): Checks if a node or node value is in the tree.
+        cost_to(goal): Returns the cost from the root to a node or node value.
+        path_to(goal): Returns the path from the root to a node or node value.
+    """
+
+    def __init__(self, root, settled):
+        self.root = root
+        self.settled = settled
+
+    # Get the number of settled nodes
+    def __len__(self):
+        return len(self.settled)
+
+    # Check if a node or node value is in the tree
+    def __contains__(self, goal):
+        return self._key(goal) in self.settled
+
+    # Get the node value of a goal
+    @staticmethod
+    def _key(goal):
+        return goal.value if isinstance(goal, node) else goal
+
+    # Get the cost from the root to a goal
+    def cost_to(self, goal):
+
+        """
+        Returns the cost from the root to a goal.
+        Args:
+            goal (node or value): The goal node or its value.
+        Returns:
+            float: The cost of the shortest path, or None if the goal is not in the tree.
+        """
+
+        settled_node = self.settled.get(self._key(goal))
+        return settled_node.cost if settled_node is not None else None
+
+    # Get the path from the root to a goal
+    def path_to(self, goal):
+
+        """
+        Returns the shortest path from the root to a goal.
+        Args:
+            goal (node or value): The goal node or its value.
+        Returns:
+            list: The path as a list of nodes, or None if the goal is not in the tree.
+        """
+
+        current_node = self.settled.get(self._key(goal))
+        if current_node is None:
+            return None
+        path = []
+        while current_node:
+            path.append(current_node)
+            current_node = current_node.parent
+        return path[::-1]
+
+class gridtree:
+
+    """
+    A shortest path tree built by gridenv.tree, stored in flat arrays.
+    Attributes:
+        distances (numpy.ndarray): The cost from the root to every cell, np.inf if the cell is not settled.
+        parents (numpy.ndarray): The flat index of the parent of every cell, -1 for the root and unsettled cells.
+    Methods:
+        __contains__(goal): Checks if a cell is in the tree.
+        cost_to(goal): Returns the cost from the root to a cell.
+        path_to(goal): Returns the path from the root to a cell.
+    """
+
+    def __init__(self, environment, distances, parents):
+        self.environment = environment
+        self.distances = distances
+        self.parents = parents
+
+    # Check if a cell is in the tree
+    def __contains__(self, goal):
+        return self.cost_to(goal) is not None
+
+    # Get the cost from the root to a cell
+    def cost_to(self, goal):
+
+        """
+        Returns the cost from the root to a cell.
+        Args:
+            goal (node or tuple): The goal cell.
+        Returns:
+            float: The cost of the shortest path, or None if the cell is not in the tree.
+        """
+
+        index = self.environment._index(goal, "goal")
+        cost = self.distances.flat[index]
+        return float(cost) if cost != INF else None
+
+    # Get the path from the root to a cell
+    def path_to(self, goal):
+
+        """
+        Returns the shortest path from the root to a cell.
+        Args:
+            goal (node or tuple): The goal cell.
+        Returns:
+            list: The path as a list of nodes, or None if the cell is not in the tree.
+        """
+
+        index = self.environment._index(goal, "goal")
+        if self.distances.flat[index] == INF:
+            return None
+        return self.environment._build_path(index, self.parents, self.distances.reshape(-1))
+
+class gridenv(env):
+
+    """
+    A grid environment that plans directly over a 2D cost array.
+    Cells are addressed by flat integer indices and the search state is kept in
+    flat buffers, so no node objects are created until the final path is built.
+    A C-contiguous float64 grid is used in place without a copy, so it can live
+    in shared memory or a memory-mapped file.
+    Args:
+        grid (array-like): A 2D array with the cost of entering every cell. Non-finite cells are blocked.
+        connectivity (int, optional): 4 or 8 connected moves. Defaults to 4.
+    Attributes:
+        grid (numpy.ndarray): The cost grid.
+        connectivity (int): The number of moves from every cell.
+        nodes (list): The last path found.
+    Methods:
+        free_space_costs(free_space_grid, base=0.1): Converts a free space grid into a cost grid.
+        neighbors(parent_node): Returns the neighbor nodes of a cell node.
+        reverse_neighbors(child_node): Returns the nodes with an edge into a cell node.
+        path(start_node, end_node, algorithm='astar'): Finds a path with 'astar', 'dijkstra', 'bfs' or 'jps'.
+        path_many(pairs, algorithm='astar', raw=False): Finds the paths of a batch of (start, end) pairs.
+        search(start_node, end_node, algorithm='astar', max_expansions=None, max_cost=None, max_time=None): Finds a path within a budget.
+        iter_search(start_node, end_node, algorithm='astar', every=1, ...): Runs a search step by step, as a generator.
+        tree(start_node, max_cost=None, algorithm='dijkstra'): Builds the shortest path tree of a start cell, or its hop counts with 'bfs'.
+    """
+
+    def __init__(self, grid, connectivity=4):
+
+        grid = np.asarray(grid, dtype=np.float64)
+        if grid.ndim != 2:
+            raise ValueError("grid must be a 2D array. Got {} dimensions instead".format(grid.ndim))
+        if connectivity not in (4, 8):
+            raise ValueError("connectivity must be 4 or 8. Got '{}' instead".format(connectivity))
+        if np.any(grid < 0):
+            raise ValueError("grid costs must be non-negative")
+
+        # Blocked cells are stored as infinity
+        if np.isnan(grid).any():
+            grid = np.where(np.isnan(grid), np.inf, grid)
+        grid = np.ascontiguousarray(grid)
+
+        finite = grid[np.isfinite(grid)]
+        min_cost = float(finite.min()) if finite.size else 0.0
+        uniform_cost = min_cost if finite.size and finite.max() == min_cost else None
+        self._setup(grid, connectivity, min_cost, uniform_cost)
+
+    # Set up the environment over a validated C-contiguous float64 grid, without scanning it
+    def _setup(self, grid, connectivity, min_cost, uniform_cost):
+
+        self.grid = grid
+        self.connectivity = connectivity
+        self.height, self.width = grid.shape
+
+        # Flat view of the cost grid, indexed without numpy scalar overhead
+        self.costs = memoryview(grid.reshape(-1))
+        self.min_cost = min_cost
+        self.uniform_cost = uniform_cost
+
+        # (row offset, column offset, step length)
+        self.moves = [(-1, 0, 1.0), (1, 0, 1.0), (0, -1, 1.0), (0, 1, 1.0)]
+        if connectivity == 8:
+            self.moves += [(-1, -1, SQRT2), (-1, 1, SQRT2), (1, -1, SQRT2), (1, 1, SQRT2)]
+
+        # Search buffers, allocated on the first query and reused afterwards
+        self.buffers = None
+
+        # Padded walkable flags for jump point search, built on first use
+        self.walkable = None
+
+        super().__init__(self.neighbors)
+
+    # Convert a free space grid (1 is free, 0 is occupied) into a cost grid
+    @staticmethod
+    def free_space_costs(free_space_grid, base=0.1):
+
+        """
+        Converts a free space grid into a cost grid.
+        Args:
+            free_space_grid (array-like): A 2D array where 1 is free and 0 is occupied.
+            base (float, optional): The cost of entering a completely free cell. Defaults to 0.1.
+        Returns:
+            numpy.ndarray: The cost grid, with occupied cells set to infinity.
+        """
+
+        free_space_grid = np.asarray(free_space_grid, dtype=np.float64)
+        return np.where(free_space_grid > 0, base + (1 - free_space_grid), np.inf)
+
+    # Get the neighbor nodes of a cell node
+    def neighbors(self, parent_node):
+
+        """
+        Returns the free neighbors of a cell node.
+        Args:
+            parent_node (node): A node whose value is a (row, column) cell.
+        Returns:
+            list: The neighbor nodes, with the step cost as their cost.
+        """
+
+        x, y = parent_node.value
+        neighbors = []
+        for dx, dy, step in self.moves:
+            nx, ny = x + dx, y + dy
+            if 0 <= nx < self.height and 0 <= ny < self.width and self._passable(x, y, dx, dy):
+                cost = self.costs[nx * self.width + ny] * step
+                neighbors.append(pathnode(value=(nx, ny), parent=parent_node, cost=cost, name="({}, {})".format(nx, ny)))
+        return neighbors
+
+    # Get the nodes with an edge into a cell node
+    def reverse_neighbors(self, child_node):
+
+        """
+        Returns the free cells with an edge into a cell node, for backward searches.
+        Args:
+            child_node (node): A node whose value is a (row, column) cell.
+        Returns:
+            list: The nodes of the cells, with the cost of their edge into child_node as their cost.
+                Empty if the cell is blocked.
+        """
+
+        x, y = child_node.value
+        cost = self.costs[x * self.width + y]
+        if cost == INF:
+            return []
+        neighbors = []
+        for dx, dy, step in self.moves:
+            nx, ny = x + dx, y + dy
+            if 0 <= nx < self.height and 0 <= ny < self.width and self._passable(x, y, dx, dy):
+                neighbors.append(pathnode(value=(nx, ny), cost=cost * step, name="({}, {})".format(nx, ny)))
+        return neighbors
+
+    # Check if a move leaves the cell into a free cell without cutting a blocked corner
+    def _passable(self, x, y, dx, dy):
+        costs = self.costs
+        width = self.width
+        if costs[(x + dx) * width + y + dy] == INF:
+            return False
+        if dx and dy:
+            return costs[(x + dx) * width + y] != INF and costs[x * width + y + dy] != INF
+        return True
+
+    # Get the flat index of a node or a (row, column) cell
+    def _index(self, cell, label):
+        if cell is None:
+            raise ValueError("{} is not defined".format(label))
+        if isinstance(cell, node):
+            cell = cell.value
+        try:
+            x, y = cell
+        except (TypeError, ValueError):
+            raise TypeError("{} must be a node or a (row, column) cell. Got '{}' instead".format(label, type(cell))) from None
+        if not (0 <= x < self.height and 0 <= y < self.width):
+            raise ValueError("{} {} is outside the grid".format(label, (x, y)))
+        return int(x) * self.width + int(y)
+
+    # Get the flat indices of the path ending at a cell from the parent buffer, as (index, searched) pairs
+    # Cells skipped between two jump points are filled in with searched set to False
+    def _trace(self, end, parent):
+        chain = []
+        index = end
+        while index != -1:
+            chain.append(index)
+            index = int(parent[index])
+        chain.reverse()
+
+        width = self.width
+        indices = [(chain[0], True)]
+        for previous, index in zip(chain, chain[1:]):
+            x, y = divmod(previous, width)
+            nx, ny = divmod(index, width)
+            dx = (nx > x) - (nx < x)
+            dy = (ny > y) - (ny < y)
+            while (x + dx, y + dy) != (nx, ny):
+                x += dx
+                y += dy
+                indices.append((x * width + y, False))
+            indices.append((index, True))
+        return indices
+
+    # Build the list of path nodes from the search buffers
+    def _build_path(self, end, parent, g):
+        path = []
+        previous = None
+        cost = 0.0
+        for index, searched in self._trace(end, parent):
+            x, y = divmod(index, self.width)
+            if searched:
+                cost = g[index]
+            else:
+                diagonal = previous.value[0] != x and previous.value[1] != y
+                cost += self.costs[index] * (SQRT2 if diagonal else 1.0)
+            current = pathnode(value=(x, y), parent=previous, cost=cost, name="({}, {})".format(x, y))
+            path.append(current)
+            previous = current
+        return path
+
+    # Build an (n, 2) array of path cells from the search buffers
+    def _build_cells(self, end, parent, g):
+        indices = np.array([index for index, _ in self._trace(end, parent)], dtype=np.int64)
+        cells = np.empty((len(indices), 2), dtype=np.int32)
+        cells[:, 0], cells[:, 1] = np.divmod(indices, self.width)
+        return cells
+
+    def path(self, start_node=None, end_node=None, algorithm='astar'):
+
+        """
+        Finds a path between two cells of the grid.
+        Args:
+            start_node (node or tuple): The starting cell.
+            end_node (node or tuple): The target cell.
+            algorithm (str, optional): 'astar', 'dijkstra', 'bfs' or 'jps'. Defaults to 'astar'.
+        Returns:
+            list: The path as a list of nodes, or None if no path is found.
+                The cost of every node is its cost from the start (hops for 'bfs').
+        Raises:
+            TypeError: If start_node or end_node is not a node or a cell.
+            ValueError: If start_node or end_node is not defined or is outside the grid, or if the algorithm is unknown.
+        """
+
+        search = self._searcher(algorithm)
+        start = self._index(start_node, "start_node")
+        end = self._index(end_node, "end_node")
+
+        path, _, _ = self._run(search, start, end, self._buffers(), self._build_path)
+        if path is None:
+            return None
+        self.nodes = path
+        return self.nodes
+
+    def path_many(self, pairs, algorithm='astar', raw=False):
+
+        """
+        Finds the paths of a batch of (start, end) cell pairs.
+        The search buffers are allocated once and only the cells touched by a
+        query are reset before the next one, so a query costs as much as the
+        area it explores instead of the size of the grid.
+        Args:
+            pairs (iterable): The (start, end) pairs of nodes or cells.
+            algorithm (str, optional): 'astar', 'dijkstra', 'bfs' or 'jps'. Defaults to 'astar'.
+            raw (bool, optional): Return every path as an (n, 2) int32 array of cells instead of nodes. Defaults to False.
+        Returns:
+            list: The path (or None) of every pair, in order. Per-query stats are stored in stats.
+        Raises:
+            TypeError: If a start or end is not a node or a cell.
+            ValueError: If a start or end is not defined or is outside the grid, or if the algorithm is unknown.
+        """
+
+        search = self._searcher(algorithm)
+        build = self._build_cells if raw else self._build_path
+        buffers = self._buffers()
+        results = []
+        self.stats = []
+
+        for start_node, end_node in pairs:
+            start = self._index(start_node, "start_node")
+            end = self._index(end_node, "end_node")
+            started = perf_counter()
+            path, expansions, cost = self._run(search, start, end, buffers, build)
+            self.stats.append(self._query_stats(path, expansions, perf_counter() - started, cost))
+            results.append(path)
+        return results
+
+    def search(self, start_node=None, end_node=None, algorithm='astar', max_expansions=None, max_cost=None, max_time=None):
+
+        """
+        Finds a path between two cells within an expansion, cost and wall-clock budget.
+        Args:
+            start_node (node or tuple): The starting cell.
+            end_node (node or tuple): The target cell.
+            algorithm (str, optional): 'astar', 'dijkstra', 'bfs' or 'jps'. Defaults to 'astar'.
+            max_expansions (int, optional): The most cells to expand. Defaults to None (no limit).
+            max_cost (float, optional): Stop before expanding a cell whose cost from the start (hops for 'bfs')
+                exceeds this bound. Defaults to None (no limit).
+            max_time (float, optional): The wall-clock budget in seconds. Defaults to None (no limit).
+        Returns:
+            searchresult: The status, the path or the partial path to the expanded cell closest to the target,
+                the number of expansions and the time of the search.
+        Raises:
+            TypeError: If start_node or end_node is not a node or a cell.
+            ValueError: If start_node or end_node is not defined or is outside the grid, or if the algorithm is unknown.
+        """
+
+        search = self._searcher(algorithm)
+        start = self._index(start_node, "start_node")
+        end = self._index(end_node, "end_node")
+
+        started = self._bound(max_expansions, max_cost, max_time, self._estimate, end)
+        try:
+            path, expansions, _ = self._run(search, start, end, self._buffers(), self._build_path)
+        finally:
+            self.limits = None
+        return self._result(path, expansions, started)
+
+    def iter_search(self, start_node=None, end_node=None, algorithm='astar', every=1, max_expansions=None, max_cost=None, max_time=None):
+
+        """
+        Runs a search between two cells as a generator, as in env.iter_search.
+        Args:
+            start_node (node or tuple): The starting cell.
+            end_node (node or tuple): The target cell.
+            algorithm (str, optional): 'astar', 'dijkstra', 'bfs' or 'jps'. Defaults to 'astar'.
+            every (int, optional): The number of expansions between two events. Defaults to 1.
+            max_expansions, max_cost, max_time (optional): The budget, as in search().
+        Yields:
+            tuple: An (expansions, (row, column), cost) event before every every-th expansion, starting with the first.
+            searchresult: The result of the search, as the last item.
+        Raises:
+            TypeError: If start_node or end_node is not a node or a cell.
+            ValueError: If start_node or end_node is not defined or is outside the grid, if the algorithm is unknown,
+                or if every is not a positive integer.
+        """
+
+        search = self._searcher(algorithm)
+        start = self._index(start_node, "start_node")
+        end = self._index(end_node, "end_node")
+        if not isinstance(every, int) or every <= 0:
+            raise ValueError("every must be a positive integer. Got '{}' instead".format(every))
+
+        started = self._bound(max_expansions, max_cost, max_time, self._estimate, end, every)
+        try:
+            buffers = self._buffers()
+            steps = self._run_steps(search, start, end, buffers, self._build_path)
+            if self.instrumented:
+                steps = self._observed(steps, buffers)
+            path, expansions, _ = yield from steps
+        finally:
+            self.limits = None
+        yield self._result(path, expansions, started)
+
+    # Get the move distance between two flat indices, ignoring cell costs
+    def _estimate(self, index, end):
+        x, y = divmod(index, self.width)
+        end_x, end_y = divmod(end, self.width)
+        dx = abs(x - end_x)
+        dy = abs(y - end_y)
+        if self.connectivity == 8:
+            return max(dx, dy) + (SQRT2 - 1) * min(dx, dy)
+        return dx + dy
+
+    def tree(self, start_node=None, max_cost=None, algorithm='dijkstra'):
+
+        """
+        Builds the shortest path tree of a start cell.
+        With 'dijkstra' the distances are costs from the start. With 'bfs' they are
+        hop counts, and the tree is built a whole frontier at a time with NumPy,
+        with the same paths as path(start_node, end_node, 'bfs').
+        Args:
+            start_node (node or tuple): The root cell.
+            max_cost (float, optional): Stop once the cost (hops for 'bfs') from the start exceeds this bound. Defaults to None (no bound).
+            algorithm (str, optional): 'dijkstra' or 'bfs'. Defaults to 'dijkstra'.
+        Returns:
+            gridtree: The shortest path tree, with its distances and parents in arrays.
+        Raises:
+            TypeError: If start_node is not a node or a cell.
+            ValueError: If start_node is not defined or is outside the grid, or if the algorithm is unknown.
+        """
+
+        start = self._index(start_node, "start_node")
+        if algorithm == 'bfs':
+            return self._flood(start, INF if max_cost is None else max_cost)
+        if algorithm != 'dijkstra':
+            raise ValueError("algorithm must be 'dijkstra' or 'bfs'. Got '{}' instead".format(algorithm))
+        n = self.width * self.height
+        buffers = (array('d', [INF]) * n, array('q', [-1]) * n, bytearray(n), [])
+        self._drive(self._best_first(start, -1, buffers, heuristic=False, max_cost=INF if max_cost is None else max_cost))
+
+        distances = np.frombuffer(buffers[0], dtype=np.float64).reshape(self.height, self.width)
+        parents = np.frombuffer(buffers[1], dtype=np.int64)
+        settled = np.frombuffer(buffers[2], dtype=np.uint8).reshape(self.height, self.width)
+        distances[settled == 0] = INF
+        return gridtree(self, distances, parents)
+
+    # Level-synchronous breadth-first search from a flat index, returns a gridtree of hop counts
+    # Every level is expanded with array operations over a blocked border, and the new cells are
+    # ordered by (position of their parent in the level, move), the order of the flat bfs queue
+    def _flood(self, start, max_hops):
+
+        height, width = self.height, self.width
+        stride = width + 2
+        walkable = np.zeros((height + 2, stride), dtype=bool)
+        walkable[1:-1, 1:-1] = np.isfinite(self.grid)
+        walkable = walkable.reshape(-1)
+        seen = ~walkable
+
+        hops = np.full(walkable.size, -1, dtype=np.int64)
+        parents = np.full(walkable.size, -1, dtype=np.int64)
+        x, y = divmod(start, width)
+        root = (x + 1) * stride + y + 1
+        level = np.array([root] if walkable[root] else [], dtype=np.int64)
+        seen[level] = True
+        hops[level] = 0
+
+        moves = [(dx * stride + dy, dx * stride if dx and dy else 0, dy if dx and dy else 0) for dx, dy, _ in self.moves]
+        count = len(moves)
+        depth = 0
+        while level.size and depth < max_hops:
+            depth += 1
+            ranks = np.arange(level.size, dtype=np.int64) * count
+            targets, sources, keys = [], [], []
+            for move, (offset, side_x, side_y) in enumerate(moves):
+                reached = level + offset
+                fresh = ~seen[reached]
+                # Diagonal moves may not cut the corner of a blocked cell
+                if side_x:
+                    fresh &= walkable[level + side_x] & walkable[level + side_y]
+                targets.append(reached[fresh])
+                sources.append(level[fresh])
+                keys.append(ranks[fresh] + move)
+
+            targets = np.concatenate(targets)
+            if not targets.size:
+                break
+            order = np.argsort(np.concatenate(keys))
+            targets = targets[order]
+            sources = np.concatenate(sources)[order]
+            # The first parent of every cell in queue order wins
+            _, first = np.unique(targets, return_index=True)
+            first.sort()
+            level = targets[first]
+            seen[level] = True
+            hops[level] = depth
+            parents[level] = sources[first]
+
+        # Back from padded to flat indices
+        hops = hops.reshape(height + 2, stride)[1:-1, 1:-1]
+        parents = parents.reshape(height + 2, stride)[1:-1, 1:-1]
+        parents = np.where(parents >= 0, (parents // stride - 1) * width + parents % stride - 1, -1).reshape(-1)
+        distances = np.where(hops >= 0, hops, INF)
+        return gridtree(self, distances, parents)
+
+    # Get the search function of an algorithm
+    def _searcher(self, algorithm):
+        if algorithm == 'astar':
+            return self._astar
+        if algorithm == 'dijkstra':
+            return self._dijkstra
+        if algorithm == 'bfs':
+            return self._breadth_first
+        if algorithm == 'jps':
+            if self.uniform_cost is None:
+                raise ValueError("jps needs a grid where every free cell has the same cost")
+            return self._jump_point
+        raise ValueError("algorithm must be 'astar', 'dijkstra', 'bfs' or 'jps'. Got '{}' instead".format(algorithm))
+
+    # Get the flat search buffers: g-scores, parents, flags and the list of touched cells
+    def _buffers(self):
+        if self.buffers is None:
+            n = self.width * self.height
+            self.buffers = (array('d', [INF]) * n, array('q', [-1]) * n, bytearray(n), [])
+        return self.buffers
+
+    # Run a search, build its path and reset the cells it touched
+    def _run(self, search, start, end, buffers, build):
+        steps = self._run_steps(search, start, end, buffers, build)
+        if self.instrumented:
+            steps = self._observed(steps, buffers)
+        return self._drive(steps)
+
+    # The open cells are the touched cells not expanded yet
+    def _open_size(self, buffers, closed):
+        return len(buffers[3]) - closed
+
+    # Run a search as a generator of expansion events, build its path and reset the cells it touched
+    def _run_steps(self, search, start, end, buffers, build):
+        g, parent, flags, touched = buffers
+        try:
+            found, expansions = yield from search(start, end, buffers)
+            if not found:
+                # The partial path of a bounded search is built before its cells are reset
+                if self.limits is not None and self.exceeded and self.closest[1] is not None:
+                    self.partial = build(self.closest[1], parent, g)
+                return None, expansions, None
+            return build(end, parent, g), expansions, g[end]
+        finally:
+            for index in touched:
+                g[index] = INF
+                parent[index] = -1
+                flags[index] = 0
+            touched.clear()
+
+    def _astar(self, start, end, buffers):
+        return self._best_first(start, end, buffers, heuristic=True)
+
+    def _dijkstra(self, start, end, buffers):
+        return self._best_first(start, end, buffers, heuristic=False)
+
+    # A* (with heuristic) or Dijkstra (without) over flat indices, returns (found, expansions)
+    # An end of -1 settles every cell up to max_cost
+    def _best_first(self, start, end, buffers, heuristic=True, max_cost=INF):
+
+        costs = self.costs
+        width = self.width
+        height = self.height
+        moves = self.moves
+
+        if costs[start] == INF or (end != -1 and costs[end] == INF):
+            return False, 0
+
+        g, parent, closed, touched = buffers
+        end_x, end_y = divmod(end, width)
+        scale = self.min_cost if heuristic else 0.0
+        octile = self.connectivity == 8
+
+        def h(x, y):
+            if not scale:
+                return 0.0
+            dx = abs(x - end_x)
+            dy = abs(y - end_y)
+            if octile:
+                return scale * (max(dx, dy) + (SQRT2 - 1) * min(dx, dy))
+            return scale * (dx + dy)
+
+        g[start] = 0.0
+        touched.append(start)
+        x, y = divmod(start, width)
+        heap = [(h(x, y), start)]
+        expansions = 0
+        limits = self.limits
+
+        while heap:
+            _, current = heappop(heap)
+            if closed[current]:
+                continue
+            if current == end:
+                return True, expansions
+            current_g = g[current]
+            if current_g > max_cost:
+                return False, expansions
+            if limits is not None:
+                if self._spent(current, current, expansions, current_g):
+                    return False, expansions
+                if limits[5] and not expansions % limits[5]:
+                    yield expansions, divmod(current, width), current_g
+            closed[current] = 1
+            expansions += 1
+
+            x, y = divmod(current, width)
+            for dx, dy, step in moves:
+                nx = x + dx
+                ny = y + dy
+                if nx < 0 or ny < 0 or nx >= height or ny >= width:
+                    continue
+                neighbor = nx * width + ny
+                cost = costs[neighbor]
+                if cost == INF or closed[neighbor]:
+                    continue
+                if dx and dy and (costs[nx * width + y] == INF or costs[x * width + ny] == INF):
+                    continue
+                new_g = current_g + cost * step
+                old_g = g[neighbor]
+                if new_g < old_g:
+                    if old_g == INF:
+                        touched.append(neighbor)
+                    g[neighbor] = new_g
+                    parent[neighbor] = current
+                    heappush(heap, (new_g + h(nx, ny), neighbor))
+        return False, expansions
+
+    # Breadth-first search over flat indices, ignoring cell costs, returns (found, expansions)
+    def _breadth_first(self, start, end, buffers):
+
+        costs = self.costs
+        width = self.width
+        height = self.height
+        moves = self.moves
+
+        if costs[start] == INF or costs[end] == INF:
+            return False, 0
+
+        g, parent, discovered, touched = buffers
+        g[start] = 0
+        discovered[start] = 1
+        touched.append(start)
+        queue = deque([start])
+        expansions = 0
+        limits = self.limits
+
+        while queue:
+            current = queue.popleft()
+            if current == end:
+                return True, expansions
+            if limits is not None:
+                if self._spent(current, current, expansions, g[current]):
+                    return False, expansions
+                if limits[5] and not expansions % limits[5]:
+                    yield expansions, divmod(current, width), g[current]
+            expansions += 1
+            hops = g[current] + 1
+            x, y = divmod(current, width)
+            for dx, dy, _ in moves:
+                nx = x + dx
+                ny = y + dy
+                if nx < 0 or ny < 0 or nx >= height or ny >= width:
+                    continue
+                neighbor = nx * width + ny
+                if discovered[neighbor] or costs[neighbor] == INF:
+                    continue
+                if dx and dy and (costs[nx * width + y] == INF or costs[x * width + ny] == INF):
+                    continue
+                discovered[neighbor] = 1
+                parent[neighbor] = current
+                g[neighbor] = hops
+                touched.append(neighbor)
+                queue.append(neighbor)
+        return False, expansions
+
+    # Get the walkable flags of the grid padded with a blocked border, so jumps need no bounds checks
+    def _padded(self):
+        if self.walkable is None:
+            padded = np.zeros((self.height + 2, self.width + 2), dtype=np.uint8)
+            padded[1:-1, 1:-1] = np.isfinite(self.grid)
+            self.walkable = bytearray(padded.tobytes())
+        return self.walkable
+
+    # Jump from a padded index in a straight direction, returns the padded index of the jump point or -1
+    # step moves along the line and side moves across it
+    def _jump_straight(self, index, step, side, end):
+        walkable = self.walkable
+        across = self.connectivity == 4 and side == 1
+        while True:
+            index += step
+            if not walkable[index]:
+                return -1
+            if index == end:
+                return index
+            # A blocked cell behind a free side cell forces a turn
+            if (walkable[index - side] and not walkable[index - side - step]) or (walkable[index + side] and not walkable[index + side - step]):
+                return index
+            # Without diagonal moves, turning into a row is only found by jumping along it
+            if across and (self._jump_straight(index, 1, side * (self.width + 2), end) != -1 or self._jump_straight(index, -1, side * (self.width + 2), end) != -1):
+                return index
+
+    # Jump from a padded index in a diagonal direction, returns the padded index of the jump point or -1
+    def _jump_diagonal(self, index, dx, dy, end):
+        walkable = self.walkable
+        stride = self.width + 2
+        row_step = dx * stride
+        step = row_step + dy
+        while True:
+            # Diagonal moves never cut a blocked corner
+            if not (walkable[index + row_step] and walkable[index + dy]):
+                return -1
+            index += step
+            if not walkable[index]:
+                return -1
+            if index == end:
+                return index
+            if self._jump_straight(index, row_step, 1, end) != -1 or self._jump_straight(index, dy, stride, end) != -1:
+                return index
+
+    # Get the directions to search from a padded index, pruned by the direction it was entered from
+    def _jump_directions(self, index, dx, dy):
+        walkable = self.walkable
+        stride = self.width + 2
+
+        def free(mx, my):
+            return walkable[index + mx * stride + my]
+
+        if not dx and not dy:
+            return [(mx, my) for mx, my, _ in self.moves if free(mx, my) and (not (mx and my) or (free(mx, 0) and free(0, my)))]
+
+        if self.connectivity == 4:
+            if dy:
+                return [(-1, 0), (1, 0), (0, dy)]
+            return [(0, -1), (0, 1), (dx, 0)]
+
+        if dx and dy:
+            directions = [(dx, 0), (0, dy)]
+            if free(dx, 0) and free(0, dy):
+                directions.append((dx, dy))
+            return directions
+
+        # Moving straight, the side cells open a turn and the cells diagonally ahead of them
+        if dy:
+            ahead, left, right = free(0, dy), free(-1, 0), free(1, 0)
+            sides = ((left, (-1, dy), (-1, 0)), (right, (1, dy), (1, 0)))
+            directions = [(0, dy)] if ahead else []
+        else:
+            ahead, left, right = free(dx, 0), free(0, -1), free(0, 1)
+            sides = ((left, (dx, -1), (0, -1)), (right, (dx, 1), (0, 1)))
+            directions = [(dx, 0)] if ahead else []
+        for side_free, diagonal, turn in sides:
+            if side_free:
+                if ahead:
+                    directions.append(diagonal)
+                directions.append(turn)
+        return directions
+
+    # Jump point search over flat indices on a uniform-cost grid, returns (found, expansions)
+    def _jump_point(self, start, end, buffers):
+
+        costs = self.costs
+        width = self.width
+        stride = width + 2
+
+        if costs[start] == INF or costs[end] == INF:
+            return False, 0
+
+        self._padded()
+        g, parent, closed, touched = buffers
+        cost = self.uniform_cost
+        end_x, end_y = divmod(end, width)
+        padded_end = (end_x + 1) * stride + end_y + 1
+        octile = self.connectivity == 8
+
+        def distance(x, y, nx, ny):
+            dx = abs(x - nx)
+            dy = abs(y - ny)
+            if octile:
+                return cost * (max(dx, dy) + (SQRT2 - 1) * min(dx, dy))
+            return cost * (dx + dy)
+
+        g[start] = 0.0
+        touched.append(start)
+        x, y = divmod(start, width)
+        heap = [(distance(x, y, end_x, end_y), start)]
+        expansions = 0
+        limits = self.limits
+
+        while heap:
+            _, current = heappop(heap)
+            if closed[current]:
+                continue
+            if current == end:
+                return True, expansions
+            if limits is not None:
+                if self._spent(current, current, expansions, g[current]):
+                    return False, expansions
+                if limits[5] and not expansions % limits[5]:
+                    yield expansions, divmod(current, width), g[current]
+            closed[current] = 1
+            expansions += 1
+
+            x, y = divmod(current, width)
+            padded = (x + 1) * stride + y + 1
+            current_g = g[current]
+            dx = dy = 0
+            if parent[current] != -1:
+                px, py = divmod(parent[current], width)
+                dx = (x > px) - (x < px)
+                dy = (y > py) - (y < py)
+
+            for mx, my in self._jump_directions(padded, dx, dy):
+                if mx and my:
+                    jump = self._jump_diagonal(padded, mx, my, padded_end)
+                elif mx:
+                    jump = self._jump_straight(padded, mx * stride, 1, padded_end)
+                else:
+                    jump = self._jump_straight(padded, my, stride, padded_end)
+                if jump == -1:
+                    continue
+                nx, ny = divmod(jump, stride)
+                nx -= 1
+                ny -= 1
+                neighbor = nx * width + ny
+                if closed[neighbor]:
+                    continue
+                new_g = current_g + distance(x, y, nx, ny)
+                old_g = g[neighbor]
+                if new_g < old_g:
+                    if old_g == INF:
+                        touched.append(neighbor)
+                    g[neighbor] = new_g
+                    parent[neighbor] = current
+                    heappush(heap, (new_g + distance(nx, ny, end_x, end_y), neighbor))
+        return False, expansions
@@ -0,0 +1,157 @@
+from array import array
+from heapq import heappush, heappop
+import numpy as np
+from vagabond.systems import node, pathnode
+from vagabond.environmental import gridenv, INF, SQRT2
+
+class flowfield:
+
+    """
+    A flow field that routes every cell of a grid to a shared goal.
+    One backward Dijkstra from the goal builds the integration field (the cost
+    from every cell to the goal) and the next cell of every cell, then the
+    direction field is derived for the whole grid at once with NumPy. Any
+    number of agents then follow the field without searching again: a batch
+    of agents moves one step with a single array lookup.
+    Args:
+        grid (array-like or gridenv): A 2D array with the cost of entering every cell, or a grid environment.
+        goals (tuple or list): The goal cell, or a list of goal cells (e.g. the cells of a dock).
+        connectivity (int, optional): 4 or 8 connected moves, if grid is an array. Defaults to 4.
+    Attributes:
+        environment (gridenv): The grid environment of the cost grid.
+        distances (numpy.ndarray): The (height, width) float64 cost from every cell to the nearest goal, inf if unreachable.
+        directions (numpy.ndarray): The (height, width, 2) int8 (row, column) step of every cell, (0, 0) at goals and unreachable cells.
+        expansions (int): The number of cells settled while building the field.
+    Methods:
+        path(start_node): Returns the path from a cell to the goal.
+        step(cells): Returns the next cell of every cell of an (n, 2) array.
+        cost_to_goal(cell): Returns the cost from a cell to the goal.
+    """
+
+    def __init__(self, grid, goals, connectivity=4):
+
+        self.environment = grid if isinstance(grid, gridenv) else gridenv(grid, connectivity)
+        environment = self.environment
+        if goals is None:
+            raise ValueError("goals is not defined")
+        if isinstance(goals, node) or (len(goals) == 2 and not isinstance(goals[0], (tuple, list, node, np.ndarray))):
+            goals = [goals]
+        self.goals = [environment._index(goal, "goal") for goal in goals]
+
+        n = environment.width * environment.height
+        distances = array('d', [INF]) * n
+        parents = array('q', [-1]) * n
+        self.expansions = self._integrate(distances, parents)
+
+        height, width = environment.height, environment.width
+        self.distances = np.frombuffer(distances, dtype=np.float64).reshape(height, width)
+        self.parents = np.frombuffer(parents, dtype=np.int64)
+
+        # Direction field: the step from every cell to its next cell, in one pass over the grid
+        cells = np.arange(n, dtype=np.int64)
+        has_next = self.parents >= 0
+        rows, columns = np.divmod(cells, width)
+        next_rows, next_columns = np.divmod(np.where(has_next, self.parents, cells), width)
+        self.directions = np.stack([next_rows - rows, next_columns - columns], axis=-1).astype(np.int8).reshape(height, width, 2)
+
+    # Backward Dijkstra from the goals over flat indices, returns the number of expansions
+    def _integrate(self, distances, parents):
+
+        environment = self.environment
+        costs = environment.costs
+        width = environment.width
+        height = environment.height
+        moves = environment.moves
+
+        heap = []
+        for goal in self.goals:
+            if costs[goal] != INF and distances[goal] != 0.0:
+                distances[goal] = 0.0
+                heap.append((0.0, goal))
+        closed = bytearray(width * height)
+        expansions = 0
+
+        while heap:
+            current_cost, current = heappop(heap)
+            if closed[current]:
+                continue
+            closed[current] = 1
+            expansions += 1
+
+            # Moving from a neighbor into this cell costs as much as entering it
+            entering = costs[current]
+            x, y = divmod(current, width)
+            for dx, dy, step in moves:
+                nx = x + dx
+                ny = y + dy
+                if nx < 0 or ny < 0 or nx >= height or ny >= width:
+                    continue
+                neighbor = nx * width + ny
+                if costs[neighbor] == INF or closed[neighbor]:
+                    continue
+                if dx and dy and (costs[nx * width + y] == INF or costs[x * width + ny] == INF):
+                    continue
+                new_cost = current_cost + entering * step
+                if new_cost < distances[neighbor]:
+                    distances[neighbor] = new_cost
+                    parents[neighbor] = current
+                    heappush(heap, (new_cost, neighbor))
+        return expansions
+
+    def cost_to_goal(self, cell):
+
+        """
+        Returns the cost from a cell to the nearest goal.
+        Args:
+            cell (node or tuple): The cell.
+        Returns:
+            float: The cost, or inf if the goal cannot be reached from the cell.
+        """
+
+        index = self.environment._index(cell, "cell")
+        return float(self.distances.flat[index])
+
+    def path(self, start_node=None):
+
+        """
+        Returns the path from a cell to the nearest goal by following the field.
+        Args:
+            start_node (node or tuple): The starting cell.
+        Returns:
+            list: The path as a list of nodes with their cost from the start, or None if no goal can be reached.
+        Raises:
+            TypeError: If start_node is not a node or a cell.
+            ValueError: If start_node is not defined or is outside the grid.
+        """
+
+        environment = self.environment
+        index = environment._index(start_node, "start_node")
+        distances = self.distances.reshape(-1)
+        if distances[index] == INF:
+            return None
+
+        width = environment.width
+        parents = self.parents
+        path = []
+        previous = None
+        total = float(distances[index])
+        while index != -1:
+            x, y = divmod(index, width)
+            current = pathnode(value=(x, y), parent=previous, cost=total - float(distances[index]), name="({}, {})".format(x, y))
+            path.append(current)
+            previous = current
+            index = int(parents[index])
+        return path
+
+    def step(self, cells):
+
+        """
+        Moves a batch of agents one step along the field.
+        Args:
+            cells (array-like): An (n, 2) array of the (row, column) cells of the agents.
+        Returns:
+            numpy.ndarray: The (n, 2) next cells. Agents at a goal or that cannot reach one stay in place.
+        """
+
+        cells = np.asarray(cells, dtype=np.int64).reshape(-1, 2)
+        return cells + self.directions[cells[:, 0], cells[:, 1]]
@@ -0,0 +1,247 @@
+import numpy as np
+from vagabond.systems import node, pathnode
+
+class csrgraph:
+
+    """
+    A directed graph stored in compressed sparse row (CSR) form.
+    The edges leaving node i are targets[offsets[i]:offsets[i + 1]] with the
+    matching weights, in int32 and float32 NumPy arrays, so a graph takes
+    8 bytes per edge and 4 per node instead of a list of node objects per
+    expansion. Every planner of environmental.py takes a csrgraph in place of
+    get_neighbors_func, and uses its reverse edges for backward searches.
+    Args:
+        offsets (array-like): The n + 1 row offsets of the nodes into targets.
+        targets (array-like): The target node id of every edge.
+        weights (array-like): The cost of every edge.
+        values (list, optional): The node value of every node id. Defaults to None (node values are the ids).
+    Attributes:
+        offsets (numpy.ndarray): The int32 row offsets.
+        targets (numpy.ndarray): The int32 edge targets.
+        weights (numpy.ndarray): The float32 edge costs.
+        values (list): The node values, or None if node values are the ids.
+    Methods:
+        from_edges(edges, values=None): Builds a graph from (value_a, value_b, cost) edges.
+        from_neighbors(get_neighbors_func, root_node): Builds a graph by crawling a get_neighbors function.
+        neighbors(parent_node): Returns the neighbor nodes of a node.
+        reverse_neighbors(child_node): Returns the nodes with an edge into a node.
+        reverse(): Returns the graph with every edge reversed.
+        edges(): Yields the (value_a, value_b, cost) edges.
+        id(value): Returns the node id of a node value.
+    """
+
+    def __init__(self, offsets, targets, weights, values=None):
+
+        offsets = np.ascontiguousarray(offsets, dtype=np.int32)
+        targets = np.ascontiguousarray(targets, dtype=np.int32)
+        weights = np.ascontiguousarray(weights, dtype=np.float32)
+        if offsets.ndim != 1 or offsets.size == 0 or offsets[0] != 0 or np.any(np.diff(offsets) < 0):
+            raise ValueError("offsets must be a non-decreasing 1D array starting at 0")
+        if targets.shape != weights.shape or targets.ndim != 1 or offsets[-1] != targets.size:
+            raise ValueError("targets and weights must be 1D arrays of offsets[-1] = {} edges".format(int(offsets[-1])))
+        n = offsets.size - 1
+        if targets.size and (targets.min() < 0 or targets.max() >= n):
+            raise ValueError("edge targets must be node ids between 0 and {}".format(n - 1))
+        if np.any(weights < 0):
+            raise ValueError("edge weights must be non-negative")
+        if values is not None and len(values) != n:
+            raise ValueError("values must have one value per node. Got {} for {} nodes".format(len(values), n))
+
+        self._setup(offsets, targets, weights, list(values) if values is not None else None)
+
+    # Set up the graph over validated contiguous arrays, without scanning them
+    def _setup(self, offsets, targets, weights, values):
+
+        self.offsets = offsets
+        self.targets = targets
+        self.weights = weights
+        self.values = values
+        self.index = {value: i for i, value in enumerate(self.values)} if values is not None else None
+
+        # Flat views of the arrays, indexed without numpy scalar overhead
+        self._offsets = memoryview(offsets)
+        self._targets = memoryview(targets)
+        self._weights = memoryview(weights)
+
+        # Reversed graph for backward searches, built on first use
+        self.reversed = None
+
+    # Get the number of nodes
+    def __len__(self):
+        return len(self._offsets) - 1
+
+    def __repr__(self):
+        return "csrgraph({} nodes, {} edges)".format(len(self), len(self._targets))
+
+    # Build a graph from an edge list
+    @classmethod
+    def from_edges(cls, edges, values=None):
+
+        """
+        Builds a graph from directed edges.
+        Args:
+            edges (iterable): The (value_a, value_b, cost) edges.
+            values (list, optional): The node values in id order. Node values found only in edges are appended.
+                If None and every value is an integer, node values are used as ids directly.
+        Returns:
+            csrgraph: The graph.
+        """
+
+        edges = list(edges)
+        index = {}
+        ordered = []
+        for value in (values or ()):
+            if value not in index:
+                index[value] = len(ordered)
+                ordered.append(value)
+
+        identity = values is None and all(isinstance(a, (int, np.integer)) and isinstance(b, (int, np.integer)) and a >= 0 and b >= 0
+                                          for a, b, _ in edges)
+        if identity:
+            sources = np.array([a for a, _, _ in edges], dtype=np.int64)
+            targets = np.array([b for _, b, _ in edges], dtype=np.int64)
+            n = int(max(sources.max(), targets.max())) + 1 if edges else 0
+            ordered = None
+        else:
+            for a, b, _ in edges:
+                for value in (a, b):
+                    if value not in index:
+                        index[value] = len(ordered)
+                        ordered.append(value)
+            sources = np.array([index[a] for a, _, _ in edges], dtype=np.int64)
+            targets = np.array([index[b] for _, b, _ in edges], dtype=np.int64)
+            n = len(ordered)
+
+        weights = np.array([cost for _, _, cost in edges], dtype=np.float32)
+        order = np.argsort(sources, kind='stable')
+        offsets = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(sources, minlength=n), out=offsets[1:])
+        return cls(offsets, targets[order], weights[order], ordered)
+
+    # Build a graph by crawling a get_neighbors function
+    @classmethod
+    def from_neighbors(cls, get_neighbors_func, root_node):
+
+        """
+        Builds a graph from every node reachable from a root node through a get_neighbors function.
+        As in dijkstra, the cost of every neighbor is the cost of the edge to it.
+        Args:
+            get_neighbors_func (function): A function that returns the neighbors of a given node.
+            root_node (node): The node the crawl starts from.
+        Returns:
+            csrgraph: The graph, with the crawled node values as its values.
+        Raises:
+            TypeError: If root_node is not an instance of the node class.
+        """
+
+        if not isinstance(root_node, node):
+            raise TypeError("root_node must be an instance of the node class. Got '{}' instead".format(type(root_node)))
+
+        values = [root_node.value]
+        seen = {root_node.value}
+        edges = []
+        stack = [root_node]
+        while stack:
+            current_node = stack.pop()
+            for neighbor in get_neighbors_func(current_node):
+                edges.append((current_node.value, neighbor.value, neighbor.cost))
+                if neighbor.value not in seen:
+                    seen.add(neighbor.value)
+                    values.append(neighbor.value)
+                    stack.append(neighbor)
+        return cls.from_edges(edges, values)
+
+    # Get the node id of a node value
+    def id(self, value):
+
+        """
+        Returns the node id of a node value.
+        Raises:
+            KeyError: If the value is not a node of the graph.
+        """
+
+        if self.index is None:
+            if not isinstance(value, (int, np.integer)) or not 0 <= value < len(self):
+                raise KeyError(value)
+            return int(value)
+        return self.index[value]
+
+    # Get the neighbor nodes of a node
+    def neighbors(self, parent_node):
+
+        """
+        Returns the neighbors of a node, as pathnodes with the edge cost as their cost.
+        Nodes whose value is not in the graph have no neighbors.
+        Args:
+            parent_node (node): A node of the graph.
+        Returns:
+            list: The neighbor nodes.
+        """
+
+        value = parent_node.value
+        if self.index is not None:
+            i = self.index.get(value)
+            if i is None:
+                return []
+        elif isinstance(value, (int, np.integer)) and 0 <= value < len(self._offsets) - 1:
+            i = value
+        else:
+            return []
+        start = self._offsets[i]
+        end = self._offsets[i + 1]
+        targets = self._targets[start:end].tolist()
+        if self.values is not None:
+            values = self.values
+            targets = [values[target] for target in targets]
+        return [pathnode(value, parent_node, cost, str(value)) for value, cost in zip(targets, self._weights[start:end].tolist())]
+
+    # Get the nodes with an edge into a node
+    def reverse_neighbors(self, child_node):
+
+        """
+        Returns the nodes with an edge into a node, as pathnodes with the cost of that edge as their cost.
+        Args:
+            child_node (node): A node of the graph.
+        Returns:
+            list: The nodes with an edge into child_node.
+        """
+
+        reversed_graph = self.reversed if self.reversed is not None else self.reverse()
+        return reversed_graph.neighbors(child_node)
+
+    # Get the graph with every edge reversed
+    def reverse(self):
+
+        """
+        Returns the graph with every edge reversed, built once and kept.
+        """
+
+        if self.reversed is None:
+            n = len(self)
+            sources = np.repeat(np.arange(n, dtype=np.int32), np.diff(self.offsets))
+            order = np.argsort(self.targets, kind='stable')
+            offsets = np.zeros(n + 1, dtype=np.int64)
+            np.cumsum(np.bincount(self.targets, minlength=n), out=offsets[1:])
+            self.reversed = csrgraph(offsets, sources[order], self.weights[order])
+            self.reversed.values = self.values
+            self.reversed.index = self.index
+            self.reversed.reversed = self
+        return self.reversed
+
+    # Yield the edges of the graph
+    def edges(self):
+
+        """
+        Yields the (value_a, value_b, cost) edges of the graph, e.g. to build a chgraph.
+        """
+
+        values = self.values
+        offsets = self.offsets.tolist()
+        targets = self.targets.tolist()
+        weights = self.weights.tolist()
+        for i in range(len(self)):
+            for edge in range(offsets[i], offsets[i + 1]):
+                if values is None:
+                    yield i, targets[edge], weights[edge]
+                else:
+                    yield values[i], values[targets[edge]], weights[edge]
@@ -0,0 +1,381 @@
+from heapq import heappush, heappop
+from vagabond.systems import pathnode
+from vagabond.environmental import env, gridenv, INF, SQRT2
+
+# Transitions are placed at both ends of border runs at least this long, in the middle of shorter ones
+WIDE_ENTRANCE = 6
+
+class hpastar(env):
+
+    """
+    Hierarchical pathfinding (HPA*) over a grid split into square clusters.
+    The borders between neighboring clusters are scanned once for entrances and
+    the costs between the entrances of every cluster are precomputed, so a query
+    searches a small abstract graph of entrances and only refines the chosen
+    route cluster by cluster. Paths are near-optimal: they are optimal inside
+    every cluster but may cross a border away from the best crossing cell.
+    Args:
+        grid (array-like): A 2D array with the cost of entering every cell. Non-finite cells are blocked.
+        connectivity (int, optional): 4 or 8 connected moves. Defaults to 4.
+        cluster_size (int, optional): The side of a cluster in cells. Defaults to 32.
+    Attributes:
+        environment (gridenv): The grid environment of the cost grid.
+        grid (numpy.ndarray): The cost grid.
+        nodes (list): The last path found.
+        expansions (int): The abstract and local expansions of the last query.
+    Methods:
+        path(start_node, end_node): Finds a path between two cells.
+        update(cells): Re-abstracts the clusters touched by changed cells.
+        entrances(): Returns the number of entrance cells of the abstract graph.
+    """
+
+    def __init__(self, grid, connectivity=4, cluster_size=32):
+
+        if not isinstance(cluster_size, int) or cluster_size < 2:
+            raise ValueError("cluster_size must be an integer of at least 2. Got '{}' instead".format(cluster_size))
+
+        self.environment = gridenv(grid, connectivity)
+        self.grid = self.environment.grid
+        self.cluster_size = cluster_size
+        self.rows = -(-self.environment.height // cluster_size)
+        self.columns = -(-self.environment.width // cluster_size)
+        self.expansions = 0
+
+        # Border key -> [(cell, cell), ...] transitions, one cell on each side of the border
+        self.borders = {}
+        # Entrance cell -> {neighbor cell: cost} edges across borders
+        self.inter = {}
+        # Cluster -> {entrance cell: [(entrance cell, cost), ...]} edges inside the cluster
+        self.intra = {}
+
+        for cx in range(self.rows):
+            for cy in range(self.columns):
+                for border in self._cluster_borders((cx, cy)):
+                    if border not in self.borders:
+                        self._build_border(border)
+        for cx in range(self.rows):
+            for cy in range(self.columns):
+                self._build_cluster((cx, cy))
+
+        super().__init__(self.environment.neighbors)
+
+    def path(self, start_node=None, end_node=None):
+
+        """
+        Finds a path between two cells with the abstract graph, then refines it inside every cluster.
+        Args:
+            start_node (node or tuple): The starting cell.
+            end_node (node or tuple): The target cell.
+        Returns:
+            list: The path as a list of nodes with their cost from the start, or None if no path is found.
+        Raises:
+            TypeError: If start_node or end_node is not a node or a cell.
+            ValueError: If start_node or end_node is not defined or is outside the grid.
+        """
+
+        path, _ = self._search(start_node, end_node, None)
+        if path is None:
+            return None
+        self.nodes = path
+        return self.nodes
+
+    def update(self, cells):
+
+        """
+        Re-abstracts the clusters touched by changed cells, after the grid was edited in place.
+        The borders of every touched cluster are scanned again, and the entrance costs
+        are recomputed for the touched clusters and the neighbors whose entrances moved.
+        Args:
+            cells (iterable): The (row, column) cells that changed.
+        Returns:
+            None
+        """
+
+        environment = self.environment
+        finite = self.grid[self.grid != INF]
+        environment.min_cost = float(finite.min()) if finite.size else 0.0
+        environment.uniform_cost = environment.min_cost if finite.size and finite.max() == environment.min_cost else None
+        environment.walkable = None
+
+        touched = {self._cluster(environment._index(cell, "cell")) for cell in cells}
+        rebuild = set(touched)
+        for cluster in touched:
+            for border in self._cluster_borders(cluster):
+                if self._build_border(border):
+                    rebuild.update(border[:2])
+        for cluster in rebuild:
+            self._build_cluster(cluster)
+
+    def entrances(self):
+
+        """
+        Returns the number of entrance cells of the abstract graph.
+        """
+
+        return sum(len(edges) for edges in self.intra.values())
+
+    # Searches share no buffers between queries
+    def _buffers(self):
+        return None
+
+    # Find a path on the abstract graph and refine it as a generator of expansion events, returns (path, expansions)
+    def _steps(self, start_node, end_node, buffers):
+
+        environment = self.environment
+        costs = environment.costs
+        start = environment._index(start_node, "start_node")
+        end = environment._index(end_node, "end_node")
+        self.expansions = 0
+        if costs[start] == INF or costs[end] == INF:
+            return None, 0
+
+        # Connect the start and the end to the entrances of their clusters
+        start_cluster = self._cluster(start)
+        end_cluster = self._cluster(end)
+        targets = set(self.intra[start_cluster])
+        targets.add(end)
+        start_costs, _, expansions = self._local(start, start_cluster, targets=targets)
+        self.expansions += expansions
+        end_costs, _, expansions = self._local(end, end_cluster, targets=set(self.intra[end_cluster]), reverse=True)
+        self.expansions += expansions
+
+        route = yield from self._abstract(start, end, start_costs, end_costs)
+        if route is None:
+            return None, self.expansions
+
+        # Refine every abstract edge inside a cluster, edges across a border are single moves
+        indices = [start]
+        for previous, index in zip(route, route[1:]):
+            cluster = self._cluster(previous)
+            if cluster != self._cluster(index):
+                indices.append(index)
+                continue
+            _, parents, expansions = self._local(previous, cluster, goal=index)
+            self.expansions += expansions
+            segment = []
+            while index != previous:
+                segment.append(index)
+                index = parents[index]
+            indices.extend(reversed(segment))
+        return self._build_path(indices), self.expansions
+
+    # A* over the entrance graph with the start and end edges added as a generator of expansion events, returns the route of cells
+    def _abstract(self, start, end, start_costs, end_costs):
+
+        width = self.environment.width
+        end_x, end_y = divmod(end, width)
+        scale = self.environment.min_cost
+        octile = self.environment.connectivity == 8
+
+        def h(index):
+            x, y = divmod(index, width)
+            dx = abs(x - end_x)
+            dy = abs(y - end_y)
+            if octile:
+                return scale * (max(dx, dy) + (SQRT2 - 1) * min(dx, dy))
+            return scale * (dx + dy)
+
+        g = {start: 0.0}
+        parents = {start: None}
+        closed = set()
+        heap = [(h(start), start)]
+
+        while heap:
+            _, current = heappop(heap)
+            if current in closed:
+                continue
+            if current == end:
+                route = []
+                while current is not None:
+                    route.append(current)
+                    current = parents[current]
+                return route[::-1]
+            current_g = g[current]
+            if self.limits is not None:
+                if self._spent(current, None, self.expansions, current_g):
+                    return None
+                if self.limits[5] and not self.expansions % self.limits[5]:
+                    yield self.expansions, divmod(current, width), current_g
+            closed.add(current)
+            self.expansions += 1
+
+            if current == start:
+                edges = list(start_costs.items())
+            else:
+                edges = list(self.intra[self._cluster(current)].get(current, ()))
+                if current in end_costs:
+                    edges.append((end, end_costs[current]))
+            edges.extend(self.inter.get(current, {}).items())
+
+            for neighbor, cost in edges:
+                new_g = current_g + cost
+                if neighbor not in closed and new_g < g.get(neighbor, INF):
+                    g[neighbor] = new_g
+                    parents[neighbor] = current
+                    heappush(heap, (new_g + h(neighbor), neighbor))
+        return None
+
+    # Dijkstra (or A* towards a goal) restricted to a cluster, returns (costs of the targets, parents, expansions)
+    # A reverse search follows the edges backward, so it returns the costs from the targets to the source
+    def _local(self, source, cluster, targets=None, goal=-1, reverse=False):
+
+        environment = self.environment
+        costs = environment.costs
+        width = environment.width
+        moves = environment.moves
+        top = cluster[0] * self.cluster_size
+        left = cluster[1] * self.cluster_size
+        bottom = min(top + self.cluster_size, environment.height)
+        right = min(left + self.cluster_size, environment.width)
+
+        goal_x, goal_y = divmod(goal, width)
+        scale = environment.min_cost if goal != -1 else 0.0
+        octile = environment.connectivity == 8
+
+        def h(x, y):
+            if not scale:
+                return 0.0
+            dx = abs(x - goal_x)
+            dy = abs(y - goal_y)
+            if octile:
+                return scale * (max(dx, dy) + (SQRT2 - 1) * min(dx, dy))
+            return scale * (dx + dy)
+
+        g = {source: 0.0}
+        parents = {source: -1}
+        closed = set()
+        found = {}
+        remaining = len(targets) if targets is not None else 0
+        x, y = divmod(source, width)
+        heap = [(h(x, y), source)]
+        expansions = 0
+
+        while heap:
+            _, current = heappop(heap)
+            if current in closed:
+                continue
+            if current == goal:
+                break
+            closed.add(current)
+            if targets is not None and current in targets:
+                found[current] = g[current]
+                remaining -= 1
+                if not remaining:
+                    break
+            expansions += 1
+
+            current_g = g[current]
+            entering = costs[current]
+            x, y = divmod(current, width)
+            for dx, dy, step in moves:
+                nx = x + dx
+                ny = y + dy
+                if nx < top or ny < left or nx >= bottom or ny >= right:
+                    continue
+                neighbor = nx * width + ny
+                if costs[neighbor] == INF or neighbor in closed:
+                    continue
+                if dx and dy and (costs[nx * width + y] == INF or costs[x * width + ny] == INF):
+                    continue
+                new_g = current_g + (entering if reverse else costs[neighbor]) * step
+                if new_g < g.get(neighbor, INF):
+                    g[neighbor] = new_g
+                    parents[neighbor] = current
+                    heappush(heap, (new_g + h(nx, ny), neighbor))
+        return found, parents, expansions
+
+    # Get the cluster of a flat index
+    def _cluster(self, index):
+        x, y = divmod(index, self.environment.width)
+        return x // self.cluster_size, y // self.cluster_size
+
+    # Get the keys of the borders of a cluster, as (cluster, neighbor cluster, vertical) tuples
+    def _cluster_borders(self, cluster):
+        cx, cy = cluster
+        borders = []
+        if cx > 0:
+            borders.append(((cx - 1, cy), cluster, False))
+        if cx + 1 < self.rows:
+            borders.append((cluster, (cx + 1, cy), False))
+        if cy > 0:
+            borders.append(((cx, cy - 1), cluster, True))
+        if cy + 1 < self.columns:
+            borders.append((cluster, (cx, cy + 1), True))
+        return borders
+
+    # Scan a border for entrances and replace its transitions, returns True if the transitions changed
+    def _build_border(self, border):
+
+        environment = self.environment
+        costs = environment.costs
+        width = environment.width
+        first, _, vertical = border
+        size = self.cluster_size
+
+        # The pairs of cells facing each other across the border
+        if vertical:
+            y = (first[1] + 1) * size - 1
+            span = range(first[0] * size, min((first[0] + 1) * size, environment.height))
+            pairs = [(x * width + y, x * width + y + 1) for x in span]
+        else:
+            x = (first[0] + 1) * size - 1
+            span = range(first[1] * size, min((first[1] + 1) * size, environment.width))
+            pairs = [(x * width + y, (x + 1) * width + y) for y in span]
+
+        # Maximal runs of pairs that are free on both sides
+        transitions = []
+        run = []
+        for a, b in pairs + [(None, None)]:
+            if a is not None and costs[a] != INF and costs[b] != INF:
+                run.append((a, b))
+                continue
+            if len(run) >= WIDE_ENTRANCE:
+                transitions += [run[0], run[-1]]
+            elif run:
+                transitions.append(run[len(run) // 2])
+            run = []
+
+        old = self.borders.get(border, [])
+        for a, b in old:
+            del self.inter[a][b]
+            del self.inter[b][a]
+        for a, b in transitions:
+            self.inter.setdefault(a, {})[b] = costs[b]
+            self.inter.setdefault(b, {})[a] = costs[a]
+        for a, b in old:
+            if a in self.inter and not self.inter[a]:
+                del self.inter[a]
+            if b in self.inter and not self.inter[b]:
+                del self.inter[b]
+        self.borders[border] = transitions
+        return transitions != old
+
+    # Compute the costs between the entrances of a cluster
+    def _build_cluster(self, cluster):
+        entrances = set()
+        for first, second, vertical in self._cluster_borders(cluster):
+            for a, b in self.borders[(first, second, vertical)]:
+                entrances.add(a if cluster == first else b)
+
+        edges = {}
+        for entrance in entrances:
+            found, _, _ = self._local(entrance, cluster, targets=entrances)
+            edges[entrance] = [(other, cost) for other, cost in found.items() if other != entrance]
+        self.intra[cluster] = edges
+
+    # Build the list of path nodes from the flat indices of the cells
+    def _build_path(self, indices):
+        costs = self.environment.costs
+        width = self.environment.width
+        path = []
+        previous = None
+        cost = 0.0
+        for index in indices:
+            x, y = divmod(index, width)
+            if previous is not None:
+                diagonal = previous.value[0] != x and previous.value[1] != y
+                cost += costs[index] * (SQRT2 if diagonal else 1.0)
+            current = pathnode(value=(x, y), parent=previous, cost=cost, name="({}, {})".format(x, y))
+            path.append(current)
+            previous = current
+        return path
@@ -0,0 +1,185 @@
+import numpy as np
+from vagabond.systems import node, frontier
+
+INF = float('inf')
+
+class landmarks:
+
+    """
+    An ALT (A*, landmarks and the triangle inequality) heuristic.
+    The shortest path costs from and to a few landmark nodes are precomputed
+    for every node reachable from a root node. By the triangle inequality,
+    d(L, b) - d(L, a) and d(a, L) - d(b, L) are lower bounds on the cost from
+    a to b for every landmark L, so their maximum is an admissible and
+    consistent heuristic that follows walls and corridors, unlike a distance
+    between coordinates. The object is called as heuristic(value_a, value_b)
+    and plugs into astar, biastar and dstarlite.
+    As in dijkstra, the cost of every neighbor is the cost of the edge to it.
+    Args:
+        get_neighbors_func (function): A function that returns the neighbors of a given node.
+        root_node (node): A node from which every node of interest is reachable.
+        count (int, optional): The number of landmarks. Defaults to 8.
+        get_reverse_neighbors_func (function, optional): A function that returns the nodes with an edge into a given node,
+            with the cost of that edge as their cost. Defaults to get_neighbors_func (an undirected graph).
+        landmark_nodes (list, optional): The landmark nodes to use instead of picking them. Defaults to None.
+    Attributes:
+        values (list): The node values of the tables, in column order.
+        landmarks (list): The node values of the landmarks.
+        forward (numpy.ndarray): A (landmarks, nodes) float64 array of the costs from every landmark to every node.
+        backward (numpy.ndarray): A (landmarks, nodes) float64 array of the costs from every node to every landmark.
+    Methods:
+        __call__(value_a, value_b): Returns the lower bound on the cost from value_a to value_b.
+        save(filename): Saves the tables to a .npz file.
+        load(filename): Loads tables saved with save().
+    """
+
+    def __init__(self, get_neighbors_func, root_node, count=8, get_reverse_neighbors_func=None, landmark_nodes=None):
+
+        if not isinstance(root_node, node):
+            raise TypeError("root_node must be an instance of the node class. Got '{}' instead".format(type(root_node)))
+        if landmark_nodes is None and (not isinstance(count, int) or count <= 0):
+            raise ValueError("count must be a positive integer. Got '{}' instead".format(count))
+
+        self.get_neighbors = get_neighbors_func
+        self.get_reverse_neighbors = get_reverse_neighbors_func or get_neighbors_func
+
+        # The nodes reachable from the root define the columns of the tables
+        distances, found = self._costs(root_node, self.get_neighbors)
+        values = list(distances)
+        self.index = {value: column for column, value in enumerate(values)}
+        self.values = values
+
+        picked = None
+        if landmark_nodes is not None:
+            picked = [landmark.value for landmark in landmark_nodes]
+            found.update((landmark.value, landmark) for landmark in landmark_nodes)
+
+        chosen = []
+        forward = []
+        backward = []
+        # Without given landmarks, every new landmark is the node farthest from the ones picked so far
+        nearest = np.array([distances[value] for value in values], dtype=np.float64)
+        for i in range(len(picked) if picked is not None else min(count, len(values))):
+            if picked is not None:
+                landmark = picked[i]
+            else:
+                landmark = values[int(np.argmax(np.where(np.isfinite(nearest), nearest, -1)))]
+            chosen.append(landmark)
+            forward.append(self._row(found[landmark], self.get_neighbors))
+            backward.append(self._row(found[landmark], self.get_reverse_neighbors))
+            nearest = np.minimum(nearest, forward[-1])
+
+        self.landmarks = chosen
+        self.forward = np.array(forward, dtype=np.float64).reshape(len(chosen), len(values))
+        self.backward = np.array(backward, dtype=np.float64).reshape(len(chosen), len(values))
+        self._columns = None
+
+    def __call__(self, value_a, value_b):
+
+        """
+        Returns a lower bound on the cost from value_a to value_b.
+        Args:
+            value_a: The node value the cost is estimated from.
+            value_b: The node value the cost is estimated to.
+        Returns:
+            float: The lower bound, 0 if either value is not in the tables,
+                or infinity if the tables prove that value_b cannot be reached.
+        """
+
+        # Node-major flat views of the tables, read without numpy scalar overhead
+        columns = self._columns
+        if columns is None:
+            columns = self._columns = (memoryview(np.ascontiguousarray(self.forward.T).reshape(-1)),
+                                       memoryview(np.ascontiguousarray(self.backward.T).reshape(-1)))
+        a = self.index.get(value_a)
+        b = self.index.get(value_b)
+        if a is None or b is None:
+            return 0.0
+
+        forward, backward = columns
+        size = len(self.landmarks)
+        a *= size
+        b *= size
+        best = 0.0
+        for i in range(size):
+            from_a = forward[a + i]
+            if from_a != INF:
+                bound = forward[b + i] - from_a
+                if bound > best:
+                    best = bound
+            to_b = backward[b + i]
+            if to_b != INF:
+                bound = backward[a + i] - to_b
+                if bound > best:
+                    best = bound
+        return best
+
+    def save(self, filename):
+
+        """
+        Saves the tables to a .npz file.
+        Node values are stored as a pickled object array, so only load files you trust.
+        Args:
+            filename (str): The path of the file.
+        Returns:
+            None
+        """
+
+        values = np.empty(len(self.values), dtype=object)
+        values[:] = self.values
+        chosen = np.empty(len(self.landmarks), dtype=object)
+        chosen[:] = self.landmarks
+        np.savez(filename, values=values, landmarks=chosen, forward=self.forward, backward=self.backward)
+
+    @classmethod
+    def load(cls, filename):
+
+        """
+        Loads tables saved with save().
+        The loaded heuristic does not keep the neighbor functions, so it cannot be rebuilt.
+        Args:
+            filename (str): The path of the file.
+        Returns:
+            landmarks: The heuristic.
+        """
+
+        with np.load(filename, allow_pickle=True) as data:
+            heuristic = cls.__new__(cls)
+            heuristic.get_neighbors = None
+            heuristic.get_reverse_neighbors = None
+            heuristic.values = data['values'].tolist()
+            heuristic.landmarks = data['landmarks'].tolist()
+            heuristic.forward = data['forward']
+            heuristic.backward = data['backward']
+        heuristic.index = {value: column for column, value in enumerate(heuristic.values)}
+        heuristic._columns = None
+        return heuristic
+
+    # Get the costs of a landmark to or from every node of the tables
+    def _row(self, landmark_node, get_neighbors):
+        distances, _ = self._costs(landmark_node, get_neighbors)
+        row = np.full(len(self.values), INF)
+        index = self.index
+        for value, cost in distances.items():
+            column = index.get(value)
+            if column is not None:
+                row[column] = cost
+        return row
+
+    # Dijkstra from a node, returns the costs of the reached node values and their node objects
+    @staticmethod
+    def _costs(source_node, get_neighbors):
+        unvisited = frontier()
+        distances = {}
+        found = {source_node.value: source_node}
+        unvisited.push(source_node.value, 0, source_node)
+
+        while unvisited:
+            value, current_node, cost = unvisited.pop()
+            distances[value] = cost
+            for neighbor in get_neighbors(current_node):
+                if neighbor.value in distances:
+                    continue
+                if unvisited.push(neighbor.value, cost + neighbor.cost, neighbor):
+                    found.setdefault(neighbor.value, neighbor)
+        return distances, found
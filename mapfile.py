@@ -0,0 +1,155 @@
+import json
+import struct
+import numpy as np
+from vagabond.environmental import gridenv
+from vagabond.graph import csrgraph
+from vagabond.landmarks import landmarks
+
+#! Map file format -----------------------------------------------------
+# A map file is a fixed prelude, a JSON header and the raw arrays:
+#   8 bytes   magic b'VAGABOND'
+#   uint32    format version
+#   uint32    reserved, 0
+#   uint64    header length in bytes
+#   header    UTF-8 JSON: {"kind": ..., "arrays": {name: {"dtype", "shape", "offset"}}, "meta": {...}}
+#   arrays    C-contiguous little-endian arrays, every one aligned to ALIGNMENT bytes,
+#             at "offset" bytes from the first aligned byte after the header
+# Arrays are opened with numpy.memmap, so loading a file reads only the header and
+# processes that open the same file share its pages through the OS cache.
+
+MAGIC = b'VAGABOND'
+VERSION = 1
+ALIGNMENT = 64
+PRELUDE = struct.Struct('<8sIIQ')
+
+# Round a byte count up to the alignment
+def _align(size):
+    return -(-size // ALIGNMENT) * ALIGNMENT
+
+# Encode node values for the JSON header, tuples become lists
+def _encode(values):
+    if values is None:
+        return None
+    encoded = []
+    for value in values:
+        if isinstance(value, np.integer):
+            value = int(value)
+        if not isinstance(value, (str, int, float, tuple, list)):
+            raise TypeError("node values must be strings, numbers or tuples of them to be saved. Got '{}' instead".format(type(value)))
+        encoded.append(value)
+    return encoded
+
+# Decode node values from the JSON header, lists become tuples
+def _decode(values):
+    if values is None:
+        return None
+    def value(item):
+        return tuple(value(element) for element in item) if isinstance(item, list) else item
+    return [value(item) for item in values]
+
+def save(filename, item):
+
+    """
+    Saves a grid environment, a CSR graph or a landmark heuristic to a map file.
+    Args:
+        filename (str): The path of the file.
+        item (gridenv, csrgraph or landmarks): The item to save.
+    Returns:
+        None
+    Raises:
+        TypeError: If the item cannot be saved, or if its node values are not strings, numbers or tuples.
+    """
+
+    if isinstance(item, gridenv):
+        kind = 'grid'
+        arrays = {'grid': item.grid}
+        meta = {'connectivity': item.connectivity, 'min_cost': item.min_cost, 'uniform_cost': item.uniform_cost}
+    elif isinstance(item, csrgraph):
+        kind = 'graph'
+        arrays = {'offsets': item.offsets, 'targets': item.targets, 'weights': item.weights}
+        meta = {'values': _encode(item.values)}
+    elif isinstance(item, landmarks):
+        # Node-major tables, so the heuristic reads them in place
+        kind = 'landmarks'
+        arrays = {'forward': item.forward.T, 'backward': item.backward.T}
+        meta = {'values': _encode(item.values), 'landmarks': _encode(item.landmarks)}
+    else:
+        raise TypeError("item must be a gridenv, a csrgraph or landmarks. Got '{}' instead".format(type(item)))
+
+    arrays = {name: np.ascontiguousarray(array, dtype=np.dtype(array.dtype).newbyteorder('<')) for name, array in arrays.items()}
+    specs = {}
+    offset = 0
+    for name, array in arrays.items():
+        specs[name] = {'dtype': array.dtype.str, 'shape': list(array.shape), 'offset': offset}
+        offset = _align(offset + array.nbytes)
+
+    header = json.dumps({'kind': kind, 'arrays': specs, 'meta': meta}).encode('utf-8')
+    start = _align(PRELUDE.size + len(header))
+    with open(filename, 'wb') as file:
+        file.write(PRELUDE.pack(MAGIC, VERSION, 0, len(header)))
+        file.write(header)
+        for name, array in arrays.items():
+            file.seek(start + specs[name]['offset'])
+            file.write(array.tobytes())
+        file.truncate(start + offset)
+
+def load(filename, mode='r'):
+
+    """
+    Opens a map file with its arrays memory-mapped, without reading or validating them.
+    Args:
+        filename (str): The path of the file.
+        mode (str, optional): The numpy.memmap mode: 'r' (read-only), 'r+' (edit the file in place)
+            or 'c' (copy-on-write). Defaults to 'r'.
+    Returns:
+        gridenv, csrgraph or landmarks: The saved item, backed by the file.
+    Raises:
+        ValueError: If the file is not a map file, its version is not supported, or the mode is invalid.
+    """
+
+    if mode not in ('r', 'r+', 'c'):
+        raise ValueError("mode must be 'r', 'r+' or 'c'. Got '{}' instead".format(mode))
+
+    with open(filename, 'rb') as file:
+        prelude = file.read(PRELUDE.size)
+        if len(prelude) != PRELUDE.size:
+            raise ValueError("{} is not a map file".format(filename))
+        magic, version, _, length = PRELUDE.unpack(prelude)
+        if magic != MAGIC:
+            raise ValueError("{} is not a map file".format(filename))
+        if version != VERSION:
+            raise ValueError("{} has map file version {}, only version {} is supported".format(filename, version, VERSION))
+        header = json.loads(file.read(length).decode('utf-8'))
+
+    # One mapping of the whole file, every array is a view into it
+    start = _align(PRELUDE.size + length)
+    mapping = np.memmap(filename, dtype=np.uint8, mode=mode)
+    arrays = {}
+    for name, spec in header['arrays'].items():
+        dtype = np.dtype(spec['dtype'])
+        shape = tuple(spec['shape'])
+        count = int(np.prod(shape))
+        offset = start + spec['offset']
+        arrays[name] = mapping[offset:offset + count * dtype.itemsize].view(dtype).reshape(shape)
+
+    kind = header['kind']
+    meta = header['meta']
+    if kind == 'grid':
+        item = gridenv.__new__(gridenv)
+        item._setup(arrays['grid'], meta['connectivity'], meta['min_cost'], meta['uniform_cost'])
+    elif kind == 'graph':
+        item = csrgraph.__new__(csrgraph)
+        item._setup(arrays['offsets'], arrays['targets'], arrays['weights'], _decode(meta['values']))
+    elif kind == 'landmarks':
+        item = landmarks.__new__(landmarks)
+        item.get_neighbors = None
+        item.get_reverse_neighbors = None
+        item.values = _decode(meta['values'])
+        item.landmarks = _decode(meta['landmarks'])
+        item.index = {value: column for column, value in enumerate(item.values)}
+        item.forward = arrays['forward'].T
+        item.backward = arrays['backward'].T
+        item._columns = None
+    else:
+        raise ValueError("{} has an unknown kind '{}'".format(filename, kind))
+    return item
@@ -0,0 +1,109 @@
+from multiprocessing import get_context, shared_memory
+import os
+import numpy as np
+from vagabond.environmental import gridenv
+
+# Grid environment of a worker process, attached to the shared cost grid
+_worker = None
+
+# Attach a worker process to the shared cost grid
+def _attach(name, shape, connectivity):
+    global _worker
+    memory = shared_memory.SharedMemory(name=name)
+    grid = np.ndarray(shape, dtype=np.float64, buffer=memory.buf)
+    _worker = (memory, gridenv(grid, connectivity))
+
+# Plan a chunk of queries in a worker process
+def _plan(chunk):
+    algorithm, pairs = chunk
+    environment = _worker[1]
+    paths = environment.path_many(pairs, algorithm, raw=True)
+    return paths, environment.stats
+
+class gridpool:
+
+    """
+    A process pool that plans batches of grid queries in parallel.
+    The cost grid is copied once into shared memory and every worker plans over
+    it in place with its own gridenv, so the grid is never pickled per task and
+    paths come back as compact (n, 2) int32 arrays of cells.
+    Args:
+        grid (array-like): A 2D array with the cost of entering every cell. Non-finite cells are blocked.
+        connectivity (int, optional): 4 or 8 connected moves. Defaults to 4.
+        processes (int, optional): The number of worker processes. Defaults to the number of CPUs.
+    Attributes:
+        grid (numpy.ndarray): The cost grid, backed by shared memory.
+        stats (list): The stats of every query of the last path_many call.
+    Methods:
+        path_many(pairs, algorithm='astar', chunksize=None): Finds the paths of a batch of (start, end) pairs.
+        close(): Stops the workers and releases the shared memory.
+    """
+
+    def __init__(self, grid, connectivity=4, processes=None):
+
+        # Validate the grid once in the parent process
+        environment = gridenv(grid, connectivity)
+
+        self.memory = shared_memory.SharedMemory(create=True, size=max(environment.grid.nbytes, 1))
+        self.grid = np.ndarray(environment.grid.shape, dtype=np.float64, buffer=self.memory.buf)
+        self.grid[:] = environment.grid
+        self.connectivity = connectivity
+        self.stats = []
+
+        context = get_context()
+        self.pool = context.Pool(processes, initializer=_attach, initargs=(self.memory.name, self.grid.shape, connectivity))
+        self.processes = processes or os.cpu_count() or 1
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def path_many(self, pairs, algorithm='astar', chunksize=None):
+
+        """
+        Finds the paths of a batch of (start, end) cell pairs across the worker processes.
+        Args:
+            pairs (iterable): The (start, end) cell pairs.
+            algorithm (str, optional): 'astar', 'dijkstra', 'bfs' or 'jps'. Defaults to 'astar'.
+            chunksize (int, optional): The number of queries sent to a worker at a time.
+                Defaults to spreading the batch over four chunks per worker.
+        Returns:
+            list: The path of every pair as an (n, 2) int32 array of cells (or None), in order.
+        Raises:
+            ValueError: If the pool is closed, or if the chunksize or the algorithm is invalid.
+        """
+
+        if self.pool is None:
+            raise ValueError("gridpool is closed")
+        if algorithm not in ('astar', 'dijkstra', 'bfs', 'jps'):
+            raise ValueError("algorithm must be 'astar', 'dijkstra', 'bfs' or 'jps'. Got '{}' instead".format(algorithm))
+
+        pairs = [(tuple(start), tuple(end)) for start, end in pairs]
+        if chunksize is None:
+            chunksize = max(1, -(-len(pairs) // (self.processes * 4)))
+        elif chunksize <= 0:
+            raise ValueError("chunksize must be a positive integer. Got '{}' instead".format(chunksize))
+
+        chunks = [(algorithm, pairs[i:i + chunksize]) for i in range(0, len(pairs), chunksize)]
+        results = []
+        self.stats = []
+        for paths, stats in self.pool.map(_plan, chunks, chunksize=1):
+            results.extend(paths)
+            self.stats.extend(stats)
+        return results
+
+    def close(self):
+
+        """
+        Stops the workers and releases the shared memory.
+        """
+
+        if self.pool is not None:
+            self.pool.close()
+            self.pool.join()
+            self.pool = None
+            del self.grid
+            self.memory.close()
+            self.memory.unlink()
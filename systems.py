@@ -1,7 +1,13 @@
+from heapq import heappush, heappop
+from itertools import count
+
 class node:
 
     """
     A class representing a node in a tree structure.
+    Nodes use __slots__ so they carry no per-instance __dict__. The memory
+    target is 128 bytes per node on 64-bit CPython: 72 bytes for the node and
+    56 bytes for its own empty child list (see Benchmarks/node_memory.py).
 
     Attributes:
     - value: The value associated with the node.
@@ -11,7 +17,7 @@ class node:
     - name: The name of the node.
 
     Methods:
-    - __init__(self, value=None, childs=[], parent=None, cost=0, name=None): Initializes a node object.
+    - __init__(self, value=None, childs=None, parent=None, cost=0, name=None): Initializes a node object.
     - __repr__(self) -> str: Returns a string representation of the node.
     - __eq__(self, o: object) -> bool: Checks if two nodes are equal.
     - __add__(self, b): Adds a node as a child to the current node.
@@ -33,26 +39,22 @@ class node:
     - set_value(self, value): Sets the value of the node.
     """
 
-    childs = []
-    parent = None
-    cost = 0
-    name = ""
-    value = None
+    __slots__ = ('value', 'childs', 'parent', 'cost', 'name')
 
     #Constructor
-    def __init__(self, value=None, childs=[], parent=None, cost=0, name=None):
+    def __init__(self, value=None, childs=None, parent=None, cost=0, name=None):
 
         """
         Initialize a Vagabond system object.
         Parameters:
         - value (optional): The value of the system.
-        - childs (optional): A list of child systems.
+        - childs (optional): A list of child systems. Every node gets its own new list by default.
         - parent (optional): The parent system.
         - cost (optional): The cost of the system.
         - name (optional): The name of the system.
         """
 
-        self.childs = childs
+        self.childs = [] if childs is None else childs
         self.value = value
         self.name = name
         self.parent = parent
@@ -379,3 +381,240 @@ class node:
         """
         
         self.value = value
+
+class pathnode(node):
+
+    """
+    A lightweight node that only records a path (value, parent, cost and name).
+    It shares an empty tuple instead of allocating a child list, so the memory
+    target is 72 bytes per node on 64-bit CPython. Use it when nodes are created
+    by the million and never get children, e.g. in get_neighbors functions.
+
+    Methods:
+    - __init__(self, value=None, parent=None, cost=0, name=None): Initializes a path node.
+    - __add__(self, b): Raises a TypeError, path nodes cannot have children.
+    - __sub__(self, b): Raises a TypeError, path nodes cannot have children.
+    - add_child(self, child): Raises a TypeError, path nodes cannot have children.
+    - remove_child(self, child): Raises a TypeError, path nodes cannot have children.
+    - clear(self): Does nothing, path nodes have no children.
+    """
+
+    __slots__ = ()
+
+    #Constructor
+    def __init__(self, value=None, parent=None, cost=0, name=None):
+
+        """
+        Initialize a path node.
+        Parameters:
+        - value (optional): The value of the node.
+        - parent (optional): The parent node.
+        - cost (optional): The cost of the node.
+        - name (optional): The name of the node.
+        """
+
+        self.childs = ()
+        self.value = value
+        self.name = name
+        self.parent = parent
+        self.cost = cost
+
+    # Path nodes cannot have children
+    def __add__(self, b):
+        raise TypeError("pathnode '{}' cannot have children".format(self))
+
+    # Path nodes cannot have children
+    def __sub__(self, b):
+        raise TypeError("pathnode '{}' cannot have children".format(self))
+
+    # Path nodes cannot have children
+    def add_child(self, child):
+        raise TypeError("pathnode '{}' cannot have children".format(self))
+
+    # Path nodes cannot have children
+    def remove_child(self, child):
+        raise TypeError("pathnode '{}' cannot have children".format(self))
+
+    # Nothing to clear
+    def clear(self):
+        pass
+
+class frontier:
+
+    """
+    A priority queue used as the open set of the search algorithms.
+
+    Entries are kept in a binary heap. Decreasing the priority of a key pushes
+    a new entry and the outdated one is skipped when it reaches the top of the
+    heap (lazy deletion), so both push and pop cost O(log n).
+
+    Attributes:
+    - heap: The binary heap of (priority, order, key, item) entries.
+    - best: A dictionary mapping every queued key to its current (priority, order) entry.
+
+    Methods:
+    - __init__(self): Initializes an empty frontier.
+    - __len__(self) -> int: Returns the number of queued keys.
+    - __bool__(self) -> bool: Checks if the frontier has queued keys.
+    - __contains__(self, key) -> bool: Checks if a key is queued.
+    - push(self, key, priority, item=None): Queues a key or lowers its priority.
+    - update(self, key, priority, item=None): Queues a key with a new priority, higher or lower.
+    - remove(self, key): Removes a key from the frontier.
+    - pop(self): Removes and returns the (key, item, priority) with the lowest priority.
+    - peek(self): Returns the (key, item, priority) with the lowest priority without removing it.
+    - priority(self, key): Returns the current priority of a queued key.
+    - clear(self): Removes every entry from the frontier.
+    """
+
+    #Constructor
+    def __init__(self):
+
+        """
+        Initialize an empty frontier.
+        """
+
+        self.heap = []
+        self.best = {}
+        self.order = count()
+
+    # Get the number of queued keys
+    def __len__(self):
+        return len(self.best)
+
+    # Check if the frontier has queued keys
+    def __bool__(self):
+        return bool(self.best)
+
+    # Check if a key is queued
+    def __contains__(self, key):
+        return key in self.best
+
+    # Queue a key or lower its priority
+    def push(self, key, priority, item=None):
+
+        """
+        Queues a key with the given priority.
+        If the key is already queued with a lower or equal priority, nothing is changed.
+
+        Parameters:
+        - key: A hashable key identifying the entry.
+        - priority: The priority of the entry. Lower priorities are popped first.
+        - item (optional): The object returned with the key when it is popped.
+
+        Returns:
+        - bool: True if the key was queued or its priority lowered, False otherwise.
+        """
+
+        entry = self.best.get(key)
+        if entry is not None and entry[0] <= priority:
+            return False
+        order = next(self.order)
+        self.best[key] = (priority, order)
+        heappush(self.heap, (priority, order, key, item))
+        return True
+
+    # Set the priority of a key, even if it is higher than its current one
+    def update(self, key, priority, item=None):
+
+        """
+        Queues a key with the given priority, replacing its current priority.
+
+        Parameters:
+        - key: A hashable key identifying the entry.
+        - priority: The new priority of the entry.
+        - item (optional): The object returned with the key when it is popped.
+
+        Returns:
+        - None
+        """
+
+        order = next(self.order)
+        self.best[key] = (priority, order)
+        heappush(self.heap, (priority, order, key, item))
+
+    # Remove a key from the frontier
+    def remove(self, key):
+
+        """
+        Removes a key from the frontier. Its heap entry is discarded when it reaches the top.
+
+        Parameters:
+        - key: The key to remove.
+
+        Returns:
+        - bool: True if the key was queued, False otherwise.
+        """
+
+        return self.best.pop(key, None) is not None
+
+    # Pop the entry with the lowest priority
+    def pop(self):
+
+        """
+        Removes and returns the entry with the lowest priority.
+        Outdated heap entries are discarded on the way.
+
+        Returns:
+        - tuple: The (key, item, priority) of the removed entry.
+
+        Raises:
+        - IndexError: If the frontier is empty.
+        """
+
+        heap = self.heap
+        best = self.best
+        while heap:
+            priority, order, key, item = heappop(heap)
+            entry = best.get(key)
+            if entry is not None and entry[1] == order:
+                del best[key]
+                return key, item, priority
+        raise IndexError("pop from an empty frontier")
+
+    # Look at the entry with the lowest priority
+    def peek(self):
+
+        """
+        Returns the entry with the lowest priority without removing it.
+        Outdated heap entries are discarded on the way.
+
+        Returns:
+        - tuple: The (key, item, priority) of the entry, or None if the frontier is empty.
+        """
+
+        heap = self.heap
+        best = self.best
+        while heap:
+            priority, order, key, item = heap[0]
+            entry = best.get(key)
+            if entry is not None and entry[1] == order:
+                return key, item, priority
+            heappop(heap)
+        return None
+
+    # Get the priority of a queued key
+    def priority(self, key):
+
+        """
+        Returns the current priority of a queued key.
+
+        Parameters:
+        - key: The queued key.
+
+        Returns:
+        - The priority of the key, or None if the key is not queued.
+        """
+
+        entry = self.best.get(key)
+        return entry[0] if entry is not None else None
+
+    # Clear the frontier
+    def clear(self):
+
+        """
+        Removes every entry from the frontier.
+        """
+
+        self.heap = []
+        self.best = {}
+        self.order = count()
@@ -0,0 +1,11 @@
+import os
+import sys
+import importlib.util
+
+# Import the repository as the vagabond package when it is not installed
+if importlib.util.find_spec('vagabond') is None:
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    spec = importlib.util.spec_from_file_location('vagabond', os.path.join(root, '__init__.py'), submodule_search_locations=[root])
+    package = importlib.util.module_from_spec(spec)
+    sys.modules['vagabond'] = package
+    spec.loader.exec_module(package)
@@ -0,0 +1,72 @@
+import numpy as np
+import pytest
+from vagabond.systems import pathnode
+from vagabond.environmental import gridenv, dijkstra, bfs, biastar, bidijkstra, bibfs
+
+# An octile distance that never overestimates a grid with costs of at least 1
+def octile(a, b):
+    dx, dy = abs(a[0] - b[0]), abs(a[1] - b[1])
+    return max(dx, dy) + 0.41421356 * min(dx, dy)
+
+def random_grid(seed, side=8):
+    rng = np.random.default_rng(seed)
+    costs = rng.uniform(1, 3, (side, side))
+    costs[rng.random((side, side)) < 0.2] = np.inf
+    return costs
+
+def planners(grid):
+    return [bidijkstra(grid.neighbors, grid.reverse_neighbors), biastar(grid.neighbors, octile, grid.reverse_neighbors)]
+
+# Past the meeting value the forward search can reach path nodes along another, costlier path
+@pytest.mark.parametrize('seed', range(20))
+def test_node_costs_match_dijkstra(seed):
+    grid = gridenv(random_grid(seed), connectivity=8)
+    free = [tuple(cell) for cell in np.argwhere(np.isfinite(grid.grid))]
+    start, end = free[0], free[-1]
+    expected = dijkstra(grid.neighbors).path(pathnode(value=start), pathnode(value=end))
+    for planner in planners(grid):
+        path = planner.path(pathnode(value=start), pathnode(value=end))
+        if expected is None:
+            assert path is None
+            continue
+        assert path[0].value == start and path[-1].value == end
+        assert path[-1].cost == pytest.approx(expected[-1].cost)
+
+        # Every node holds the cost of the path up to it
+        total = 0.0
+        for previous, current in zip(path, path[1:]):
+            assert current.parent is previous
+            total += next(neighbor.cost for neighbor in grid.neighbors(previous) if neighbor.value == current.value)
+            assert current.cost == pytest.approx(total)
+
+# A random directed graph as get_neighbors and get_reverse_neighbors functions over a dict of edges
+def directed_graph(seed, n=25):
+    rng = np.random.default_rng(seed)
+    edges = {}
+    for a, b, cost in zip(rng.integers(0, n, 3 * n).tolist(), rng.integers(0, n, 3 * n).tolist(), rng.uniform(1, 5, 3 * n).tolist()):
+        edges[(a, b)] = cost
+
+    def neighbors(current_node):
+        return [pathnode(value=b, parent=current_node, cost=cost) for (a, b), cost in edges.items() if a == current_node.value]
+
+    def reverse_neighbors(current_node):
+        return [pathnode(value=a, parent=current_node, cost=cost) for (a, b), cost in edges.items() if b == current_node.value]
+
+    return n, neighbors, reverse_neighbors
+
+@pytest.mark.parametrize('seed', range(10))
+def test_directed_graphs(seed):
+    n, neighbors, reverse_neighbors = directed_graph(seed)
+    for end in range(n):
+        expected = dijkstra(neighbors).path(pathnode(value=0), pathnode(value=end))
+        fewest = bfs(neighbors).path(pathnode(value=0), pathnode(value=end))
+        path = bidijkstra(neighbors, reverse_neighbors).path(pathnode(value=0), pathnode(value=end))
+        hops = bibfs(neighbors, reverse_neighbors).path(pathnode(value=0), pathnode(value=end))
+        if expected is None:
+            assert path is None and hops is None
+            continue
+        assert path[-1].cost == pytest.approx(expected[-1].cost)
+        assert hops[0].value == 0 and hops[-1].value == end
+        assert len(hops) == len(fewest)
+        for previous, current in zip(hops, hops[1:]):
+            assert current.value in [neighbor.value for neighbor in neighbors(previous)]
@@ -0,0 +1,88 @@
+import numpy as np
+import pytest
+from vagabond.systems import pathnode
+from vagabond.environmental import gridenv, dijkstra
+from vagabond.contraction import chgraph
+
+def random_edges(seed, n=40):
+    rng = np.random.default_rng(seed)
+    sources, targets, costs = rng.integers(0, n, 4 * n).tolist(), rng.integers(0, n, 4 * n).tolist(), rng.uniform(1, 10, 4 * n).tolist()
+    return list(zip(sources, targets, costs)), n
+
+def neighbors_of(edges):
+    adjacency = {}
+    for a, b, cost in edges:
+        adjacency.setdefault(a, []).append((b, cost))
+    return lambda current_node: [pathnode(value=b, parent=current_node, cost=cost) for b, cost in adjacency.get(current_node.value, [])]
+
+# Check that a path follows the edges, with the cost from the start on every node, and return its cost
+def check_path(edges, path, start, end):
+    cheapest = {}
+    for a, b, cost in edges:
+        cheapest[(a, b)] = min(cost, cheapest.get((a, b), np.inf))
+    assert path[0].value == start and path[-1].value == end
+    total = 0.0
+    for previous, current in zip(path, path[1:]):
+        total += cheapest[(previous.value, current.value)]
+        assert current.cost == pytest.approx(total)
+    return total
+
+@pytest.mark.parametrize('seed', range(5))
+def test_costs_match_dijkstra(seed):
+    edges, n = random_edges(seed)
+    hierarchy = chgraph(edges=edges)
+    reference = dijkstra(neighbors_of(edges))
+    for start in range(0, n, 7):
+        for end in range(n):
+            expected = reference.path(pathnode(value=start), pathnode(value=end))
+            path = hierarchy.path(pathnode(value=start), pathnode(value=end))
+            if expected is None:
+                assert path is None
+            else:
+                assert check_path(edges, path, start, end) == pytest.approx(expected[-1].cost)
+
+# A start equal to the end is its own path, even for a node without edges or missing from the hierarchy
+def test_start_is_end():
+    edges, n = random_edges(29)
+    hierarchy = chgraph(edges=edges + [(n, n + 1, 1.0)])
+    for value in (36, n + 1, n + 5):
+        path = hierarchy.path(pathnode(value=value), pathnode(value=value))
+        assert [node.value for node in path] == [value] and path[0].cost == 0
+    assert [[node.value for node in path] for path in hierarchy.path_many([(pathnode(value=n + 5), pathnode(value=n + 5))])] == [[n + 5]]
+    assert hierarchy.path(pathnode(value=n + 5), pathnode(value=0)) is None
+
+def test_grid_explored_from_a_root():
+    rng = np.random.default_rng(0)
+    costs = rng.uniform(1, 3, (10, 10))
+    costs[rng.random((10, 10)) < 0.2] = np.inf
+    costs[0, 0] = 1
+    grid = gridenv(costs, connectivity=8)
+    hierarchy = chgraph(grid.neighbors, pathnode(value=(0, 0)))
+    tree = dijkstra(grid.neighbors).tree(pathnode(value=(0, 0)))
+    ends = [tuple(cell) for cell in np.argwhere(np.isfinite(costs)).tolist()]
+    paths = hierarchy.path_many([(pathnode(value=(0, 0)), pathnode(value=end)) for end in ends])
+    for end, path, stats in zip(ends, paths, hierarchy.stats):
+        expected = tree.cost_to(end)
+        if expected is None:
+            assert path is None and not stats['found']
+        else:
+            assert path[-1].cost == pytest.approx(expected) == stats['cost']
+
+def test_save_and_load(tmp_path):
+    edges, n = random_edges(0)
+    hierarchy = chgraph(edges=edges)
+    filename = str(tmp_path / 'hierarchy.npz')
+    hierarchy.save(filename)
+    loaded = chgraph.load(filename)
+    for end in range(n):
+        path = hierarchy.path(pathnode(value=0), pathnode(value=end))
+        reloaded = loaded.path(pathnode(value=0), pathnode(value=end))
+        assert (path is None and reloaded is None) or [node.value for node in path] == [node.value for node in reloaded]
+
+def test_invalid_arguments():
+    with pytest.raises(ValueError):
+        chgraph(edges=[(0, 1, -1.0)])
+    with pytest.raises(ValueError):
+        chgraph(edges=[(0, 1, 1.0)], witness_limit=0)
+    with pytest.raises(ValueError):
+        chgraph()
@@ -0,0 +1,284 @@
+import numpy as np
+import pytest
+from vagabond.systems import node, pathnode
+from vagabond.environmental import gridenv, astar, arastar, idastar, smastar, dijkstra, bfs, dfs, dstarlite
+
+def manhattan(a, b):
+    return abs(a[0] - b[0]) + abs(a[1] - b[1])
+
+def random_costs(seed, side=8):
+    rng = np.random.default_rng(seed)
+    costs = rng.uniform(1, 3, (side, side))
+    costs[rng.random((side, side)) < 0.25] = np.inf
+    costs[0, 0] = 1
+    return costs
+
+# The cost from the start to every cell, entering a cell costs its value, by relaxing the 4-connected edges until nothing changes
+def bellman_ford(costs, start):
+    side = len(costs)
+    distances = np.full((side, side), np.inf)
+    distances[start] = 0
+    changed = True
+    while changed:
+        changed = False
+        for x in range(side):
+            for y in range(side):
+                for cell in ((x - 1, y), (x + 1, y), (x, y - 1), (x, y + 1)):
+                    if 0 <= cell[0] < side and 0 <= cell[1] < side and distances[x, y] + costs[cell] < distances[cell]:
+                        distances[cell] = distances[x, y] + costs[cell]
+                        changed = True
+    return distances
+
+# A 4-connected callback as in the Examples: with a heuristic the cost of a neighbor is its priority, the cost from the start plus the estimate
+def grid_neighbors(costs, end, heuristic=None):
+    side = len(costs)
+    def neighbors(current_node):
+        x, y = current_node.value
+        g = current_node.cost - heuristic(current_node.value, end) if heuristic else 0
+        result = []
+        for cell in ((x - 1, y), (x + 1, y), (x, y - 1), (x, y + 1)):
+            if 0 <= cell[0] < side and 0 <= cell[1] < side and np.isfinite(costs[cell]):
+                cost = g + costs[cell] + heuristic(cell, end) if heuristic else costs[cell]
+                result.append(node(value=cell, parent=current_node, cost=cost))
+        return result
+    return neighbors
+
+@pytest.mark.parametrize('seed', range(5))
+def test_frontier_planners_match_bellman_ford(seed):
+    costs = random_costs(seed)
+    distances = bellman_ford(costs, (0, 0))
+    for end in np.ndindex(costs.shape):
+        astar_path = astar(grid_neighbors(costs, end, manhattan)).path(node(value=(0, 0), cost=manhattan((0, 0), end)), node(value=end))
+        dijkstra_path = dijkstra(grid_neighbors(costs, end)).path(node(value=(0, 0)), node(value=end))
+        if np.isinf(distances[end]):
+            assert astar_path is None and dijkstra_path is None
+            continue
+        for path in (astar_path, dijkstra_path):
+            assert path[0].value == (0, 0) and path[-1].value == end
+            assert all(manhattan(previous.value, current.value) == 1 for previous, current in zip(path, path[1:]))
+            assert sum(costs[current.value] for current in path[1:]) == pytest.approx(distances[end])
+            assert path[-1].cost == pytest.approx(distances[end])
+
+# An octile distance that never overestimates a grid with costs of at least 1
+def octile(a, b):
+    dx, dy = abs(a[0] - b[0]), abs(a[1] - b[1])
+    return max(dx, dy) + 0.41421356 * min(dx, dy)
+
+def random_grid(seed, side=10):
+    rng = np.random.default_rng(seed)
+    costs = rng.uniform(1, 3, (side, side))
+    costs[rng.random((side, side)) < 0.25] = np.inf
+    costs[0, 0] = costs[side - 1, side - 1] = 1
+    return gridenv(costs, connectivity=8)
+
+def random_pairs(grid, seed, count=4):
+    rng = np.random.default_rng(seed)
+    free = [tuple(int(i) for i in cell) for cell in np.argwhere(np.isfinite(grid.grid))]
+    return [(free[a], free[b]) for a, b in rng.integers(0, len(free), (count, 2))]
+
+def reference_cost(grid, start, end):
+    path = dijkstra(grid.neighbors).path(pathnode(value=start), pathnode(value=end))
+    return path[-1].cost if path is not None else None
+
+# The cost of a path, or None, after checking that it joins start and end along edges of the grid
+def path_cost(grid, path, start, end):
+    if path is None:
+        return None
+    assert path[0].value == start and path[-1].value == end
+    total = 0.0
+    for previous, current in zip(path, path[1:]):
+        total += next(neighbor.cost for neighbor in grid.neighbors(previous) if neighbor.value == current.value)
+    return total
+
+def assert_same_cost(cost, expected):
+    if expected is None:
+        assert cost is None
+    else:
+        assert cost == pytest.approx(expected)
+
+@pytest.mark.parametrize('seed', range(5))
+def test_cached_planners_match_uncached(seed):
+    grid = random_grid(seed)
+    for cache_size in (16, 100):
+        planner = dijkstra(grid.neighbors, cache_size=cache_size)
+        for start, end in random_pairs(grid, seed) * 2:
+            path = planner.path(pathnode(value=start), pathnode(value=end))
+            assert_same_cost(path_cost(grid, path, start, end), reference_cost(grid, start, end))
+        info = planner.cache_info()
+        assert info['size'] <= cache_size == info['maxsize']
+        assert planner.invalidate() == info['size'] and planner.cache_info()['size'] == 0
+
+def test_cache_serves_repeated_expansions():
+    grid = random_grid(0)
+    planner = dijkstra(grid.neighbors, cache_size=100)
+    start, end = pathnode(value=(0, 0)), pathnode(value=(9, 9))
+    planner.path(start, end)
+    misses = planner.cache_info()['misses']
+    planner.path(start, end)
+    assert planner.cache_info() == {'hits': misses, 'misses': misses, 'size': misses, 'maxsize': 100}
+
+def test_invalid_cache_size():
+    for cache_size in (0, -1, 1.5):
+        with pytest.raises(ValueError):
+            dijkstra(lambda current_node: [], cache_size=cache_size)
+
+@pytest.mark.parametrize('planner', [lambda grid: dijkstra(grid.neighbors), lambda grid: astar(grid.neighbors, heuristic=octile)])
+def test_path_many_matches_path(planner):
+    grid = random_grid(1)
+    pairs = random_pairs(grid, 1, count=8)
+    environment = planner(grid)
+    paths = environment.path_many([(pathnode(value=start), pathnode(value=end)) for start, end in pairs])
+    assert len(paths) == len(environment.stats) == len(pairs)
+    for (start, end), path, stats in zip(pairs, paths, environment.stats):
+        expected = reference_cost(grid, start, end)
+        assert_same_cost(path_cost(grid, path, start, end), expected)
+        assert stats['found'] == (path is not None)
+        assert_same_cost(stats['cost'], expected)
+
+def test_dijkstra_tree_matches_dijkstra():
+    grid = random_grid(2)
+    tree = dijkstra(grid.neighbors).tree(pathnode(value=(0, 0)))
+    bounded = dijkstra(grid.neighbors).tree(pathnode(value=(0, 0)), max_cost=5.0)
+    assert (0, 0) in tree and len(bounded) < len(tree)
+    for cell in map(tuple, np.argwhere(np.isfinite(grid.grid)).tolist()):
+        expected = reference_cost(grid, (0, 0), cell)
+        assert_same_cost(tree.cost_to(cell), expected)
+        assert_same_cost(path_cost(grid, tree.path_to(cell), (0, 0), cell), expected)
+        if expected is not None and expected < 5.0:
+            assert bounded.cost_to(cell) == pytest.approx(expected)
+
+def test_dstarlite_repairs_after_changes():
+    grid = random_grid(3)
+    planner = dstarlite(grid.neighbors, octile, grid.reverse_neighbors)
+    start, end = (0, 0), (9, 9)
+    path = planner.path(pathnode(value=start), pathnode(value=end))
+    assert_same_cost(path_cost(grid, path, start, end), reference_cost(grid, start, end))
+
+    rng = np.random.default_rng(3)
+    for _ in range(5):
+        # Block or reopen cells along the current path, then move the start one step along it
+        changed = [path[len(path) // 2].value] if path is not None else []
+        changed += [tuple(cell) for cell in rng.integers(0, 10, (3, 2)).tolist() if tuple(cell) not in (start, end)]
+        for cell in changed:
+            grid.grid[cell] = np.inf if np.isfinite(grid.grid[cell]) else 1.5
+        planner.update(changed)
+        if path is not None and len(path) > 2 and np.isfinite(grid.grid[path[1].value]):
+            start = path[1].value
+        path = planner.path(pathnode(value=start), pathnode(value=end))
+        assert_same_cost(path_cost(grid, path, start, end), reference_cost(grid, start, end))
+
+@pytest.mark.parametrize('seed', range(4))
+def test_arastar_converges_to_the_optimal_cost(seed):
+    grid = random_grid(seed)
+    for start, end in random_pairs(grid, seed):
+        expected = reference_cost(grid, start, end)
+        planner = arastar(grid.neighbors, octile, weight=3.0, weight_step=1.0)
+        costs = []
+        for path, bound in planner.improve(pathnode(value=start), pathnode(value=end)):
+            costs.append(path_cost(grid, path, start, end))
+            assert path[-1].cost == pytest.approx(costs[-1])
+            assert costs[-1] <= bound * expected + 1e-9
+        if expected is None:
+            assert not costs
+            continue
+        assert costs == sorted(costs, reverse=True) and costs[-1] == pytest.approx(expected)
+        path = planner.path(pathnode(value=start), pathnode(value=end))
+        assert planner.bound == 1 and path[-1].cost == pytest.approx(expected)
+
+def test_arastar_invalid_arguments():
+    grid = random_grid(0)
+    with pytest.raises(ValueError):
+        arastar(grid.neighbors, None)
+    with pytest.raises(ValueError):
+        arastar(grid.neighbors, octile, weight=0.5)
+    with pytest.raises(ValueError):
+        arastar(grid.neighbors, octile, weight_step=0)
+
+# idastar repeats its depth-first searches for every new bound, so it runs on small grids
+@pytest.mark.parametrize('seed', range(4))
+def test_idastar_matches_dijkstra(seed):
+    grid = random_grid(seed, side=6)
+    for start, end in random_pairs(grid, seed):
+        planner = idastar(grid.neighbors, octile)
+        result = planner.search(pathnode(value=start), pathnode(value=end), max_expansions=200000)
+        expected = reference_cost(grid, start, end)
+        if expected is None:
+            assert result.status in ('exhausted', 'budget')
+            continue
+        assert result.status == 'found' and planner.iterations >= 1
+        assert path_cost(grid, result.path, start, end) == pytest.approx(expected) == result.cost
+
+@pytest.mark.parametrize('seed', range(4))
+def test_smastar_matches_dijkstra(seed):
+    grid = random_grid(seed)
+    for start, end in random_pairs(grid, seed):
+        expected = reference_cost(grid, start, end)
+        roomy = smastar(grid.neighbors, octile)
+        path = roomy.path(pathnode(value=start), pathnode(value=end))
+        assert_same_cost(path_cost(grid, path, start, end), expected)
+        assert roomy.forgotten == 0
+
+        # With little memory the path is still optimal when one is found
+        tight = smastar(grid.neighbors, octile, max_nodes=30)
+        result = tight.search(pathnode(value=start), pathnode(value=end), max_expansions=20000)
+        assert tight.peak <= 30
+        if result.path is not None:
+            assert path_cost(grid, result.path, start, end) == pytest.approx(expected) == result.cost
+
+def test_smastar_invalid_memory():
+    with pytest.raises(ValueError):
+        smastar(lambda current_node: [], max_nodes=1)
+
+@pytest.mark.parametrize('seed', range(4))
+def test_bfs_and_dfs_expand_every_cell_once(seed):
+    grid = random_grid(seed)
+    reachable = len(dijkstra(grid.neighbors).tree(pathnode(value=(0, 0))))
+    for planner in (bfs(grid.neighbors), dfs(grid.neighbors)):
+        # The search for a blocked cell expands every reachable cell
+        result = planner.search(pathnode(value=(0, 0)), pathnode(value=(-1, -1)))
+        assert result.status == 'exhausted' and result.expansions == reachable
+    for start, end in random_pairs(grid, seed):
+        fewest = grid.path(start, end, 'bfs')
+        path = bfs(grid.neighbors).path(pathnode(value=start), pathnode(value=end))
+        deep = dfs(grid.neighbors).path(pathnode(value=start), pathnode(value=end))
+        if fewest is None:
+            assert path is None and deep is None
+            continue
+        assert len(path) == len(fewest)
+        path_cost(grid, path, start, end)
+        path_cost(grid, deep, start, end)
+
+# Depth-limited searches expand a cell once per path to it, so they run on small 4-connected grids
+@pytest.mark.parametrize('seed', range(4))
+def test_dfs_depth_limits(seed):
+    rng = np.random.default_rng(seed)
+    costs = np.ones((5, 5))
+    costs[rng.random((5, 5)) < 0.3] = np.inf
+    costs[0, 0] = 1
+    grid = gridenv(costs)
+    for end in map(tuple, np.argwhere(np.isfinite(costs)).tolist()):
+        fewest = grid.path((0, 0), end, 'bfs')
+        hops = len(fewest) - 1 if fewest is not None else None
+
+        planner = dfs(grid.neighbors, iterative=True)
+        path = planner.path(pathnode(value=(0, 0)), pathnode(value=end))
+        if hops is None:
+            assert path is None
+            continue
+        path_cost(grid, path, (0, 0), end)
+        assert len(path) - 1 == hops and planner.iterations == hops + 1
+        assert len(planner.depth_expansions) <= hops + 1
+
+        # A limit under the fewest moves finds nothing, a limit at it finds a path with the fewest moves
+        if hops > 0:
+            assert dfs(grid.neighbors, max_depth=hops - 1).path(pathnode(value=(0, 0)), pathnode(value=end)) is None
+        path = dfs(grid.neighbors, max_depth=hops).path(pathnode(value=(0, 0)), pathnode(value=end))
+        assert len(path) - 1 == hops
+
+def test_dfs_invalid_depth():
+    for max_depth in (-1, 1.5):
+        with pytest.raises(ValueError):
+            dfs(lambda current_node: [], max_depth=max_depth)
+    for iterative in (None, 1, 'yes'):
+        with pytest.raises(ValueError):
+            dfs(lambda current_node: [], iterative=iterative)
@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+from vagabond.systems import pathnode
+from vagabond.environmental import gridenv, dijkstra
+from vagabond.flowfield import flowfield
+
+def random_grid(seed, side=12):
+    rng = np.random.default_rng(seed)
+    costs = rng.uniform(1, 3, (side, side))
+    costs[rng.random((side, side)) < 0.25] = np.inf
+    costs[side // 2, side // 2] = costs[0, side - 1] = 1
+    return gridenv(costs, connectivity=8)
+
+# The cost from a cell to the nearest goal by dijkstra, inf if no goal can be reached
+def reference_cost(grid, cell, goals):
+    tree = dijkstra(grid.neighbors).tree(pathnode(value=cell))
+    costs = [tree.cost_to(goal) for goal in goals if goal in tree]
+    return min(costs) if costs else np.inf
+
+@pytest.mark.parametrize('seed', range(3))
+@pytest.mark.parametrize('goals', [(6, 6), [(6, 6), (0, 11)]])
+def test_field_matches_dijkstra(seed, goals):
+    grid = random_grid(seed)
+    field = flowfield(grid, goals)
+    targets = goals if isinstance(goals, list) else [goals]
+    free = [tuple(cell) for cell in np.argwhere(np.isfinite(grid.grid)).tolist()]
+    for cell in free:
+        expected = reference_cost(grid, cell, targets)
+        assert field.cost_to_goal(cell) == pytest.approx(expected)
+        path = field.path(cell)
+        if expected == np.inf:
+            assert path is None
+            continue
+        assert path[0].value == cell and path[-1].value in targets
+        assert path[-1].cost == pytest.approx(expected)
+
+    # A step moves every agent to the next cell of its path
+    cells = np.array(free)
+    moved = field.step(cells)
+    for cell, next_cell in zip(free, moved.tolist()):
+        path = field.path(cell)
+        assert tuple(next_cell) == (path[1].value if path is not None and len(path) > 1 else cell)
+
+def test_invalid_goals():
+    grid = random_grid(0)
+    with pytest.raises(ValueError):
+        flowfield(grid, None)
+    with pytest.raises(ValueError):
+        flowfield(grid, (12, 0))
@@ -0,0 +1,99 @@
+import numpy as np
+import pytest
+from vagabond.systems import pathnode
+from vagabond.environmental import astar, dijkstra, bfs, dfs, bidijkstra, bibfs, biastar, idastar, smastar, dstarlite
+from vagabond.graph import csrgraph
+
+def random_graph(seed, n=30):
+    rng = np.random.default_rng(seed)
+    edges = [(int(a), int(b), float(w)) for a, b, w in zip(rng.integers(0, n, 4 * n), rng.integers(0, n, 4 * n), rng.uniform(1, 10, 4 * n))]
+    return csrgraph.from_edges(edges)
+
+def test_astar_without_heuristic_adds_up_edge_costs():
+    graph = csrgraph.from_edges([(0, 2, .4), (2, 4, .4), (4, 3, .4), (0, 1, .5), (1, 3, .5)])
+    for cache_size in (None, 16):
+        path = astar(graph, cache_size=cache_size).path(pathnode(value=0), pathnode(value=3))
+        assert [node.value for node in path] == [0, 1, 3]
+        assert path[-1].cost == pytest.approx(1.0)
+
+@pytest.mark.parametrize('seed', range(10))
+def test_astar_matches_dijkstra(seed):
+    graph = random_graph(seed)
+    for end in range(1, len(graph)):
+        expected = dijkstra(graph).path(pathnode(value=0), pathnode(value=end))
+        for cache_size in (None, 64):
+            path = astar(graph, cache_size=cache_size).path(pathnode(value=0), pathnode(value=end))
+            if expected is None:
+                assert path is None
+            else:
+                assert path[-1].cost == pytest.approx(expected[-1].cost, rel=1e-6)
+
+def test_path_nodes_are_named():
+    graph = csrgraph.from_edges([(('a', 1), ('b', 2), 1.0), (('b', 2), ('c', 3), 1.0)])
+    assert [node.name for node in graph.neighbors(pathnode(value=('a', 1)))] == [str(('b', 2))]
+    for planner in (dijkstra(graph), dijkstra(graph, cache_size=8), astar(graph)):
+        path = planner.path(pathnode(value=('a', 1), name='a'), pathnode(value=('c', 3)))
+        assert [node.name for node in path[1:]] == [str(('b', 2)), str(('c', 3))]
+
+# The reference searches go through graph.neighbors as a plain function, so they take the generic node-based path
+@pytest.mark.parametrize('seed', range(5))
+@pytest.mark.parametrize('cache_size', [None, 64])
+def test_planners_match_the_generic_search(seed, cache_size):
+    graph = random_graph(seed)
+    for end in range(len(graph)):
+        start_node, end_node = pathnode(value=0), pathnode(value=end)
+        expected = dijkstra(graph.neighbors).path(start_node, end_node)
+        fewest = bfs(graph.neighbors).path(start_node, end_node)
+        for planner in (dijkstra(graph, cache_size), bidijkstra(graph, cache_size=cache_size)):
+            path = planner.path(pathnode(value=0), pathnode(value=end))
+            if expected is None:
+                assert path is None
+            else:
+                assert path[-1].cost == pytest.approx(expected[-1].cost, rel=1e-6)
+        for planner in (bfs(graph, cache_size), bibfs(graph, cache_size=cache_size), dfs(graph, cache_size)):
+            path = planner.path(pathnode(value=0), pathnode(value=end))
+            if expected is None:
+                assert path is None
+                continue
+            assert path[0].value == 0 and path[-1].value == end
+            for previous, current in zip(path, path[1:]):
+                assert current.value in [neighbor.value for neighbor in graph.neighbors(previous)]
+            if not isinstance(planner, dfs):
+                assert len(path) == len(fewest)
+
+# A start equal to the end is its own path for every planner, even for a node without edges or missing from the graph
+def test_start_is_end():
+    graph = csrgraph.from_edges([(0, 1, 1.0), (1, 2, 1.0)], values=[0, 1, 2, 3])
+    heuristic = lambda value_a, value_b: 0.0
+    for cache_size in (None, 8):
+        planners = (astar(graph, cache_size=cache_size), astar(graph, cache_size, heuristic), dijkstra(graph, cache_size), bfs(graph, cache_size), dfs(graph, cache_size),
+                    biastar(graph, heuristic, cache_size=cache_size), bidijkstra(graph, cache_size=cache_size), bibfs(graph, cache_size=cache_size),
+                    idastar(graph, heuristic, cache_size), smastar(graph, heuristic, cache_size=cache_size), dstarlite(graph, heuristic, cache_size=cache_size))
+        for planner in planners:
+            for value in (3, 9):
+                assert [node.value for node in planner.path(pathnode(value=value), pathnode(value=value))] == [value]
+                assert [node.value for node in planner.search(pathnode(value=value), pathnode(value=value)).path] == [value]
+            assert planner.path(pathnode(value=9), pathnode(value=0)) is None
+
+def test_edges_and_reverse():
+    edges = [('a', 'b', 1.0), ('b', 'c', 2.0), ('a', 'c', 4.0), ('c', 'a', 0.5)]
+    graph = csrgraph.from_edges(edges)
+    assert sorted(graph.edges()) == sorted(edges)
+    assert sorted(graph.reverse().edges()) == sorted((b, a, cost) for a, b, cost in edges)
+    assert sorted((node.value, node.cost) for node in graph.reverse_neighbors(pathnode(value='c'))) == [('a', 4.0), ('b', 2.0)]
+    assert graph.neighbors(pathnode(value='d')) == [] and graph.id('b') == 1
+    with pytest.raises(KeyError):
+        graph.id('d')
+
+@pytest.mark.parametrize('offsets, targets, weights, values', [
+    ([1, 2], [0], [1.0], None),
+    ([0, 2, 1], [0, 1], [1.0, 1.0], None),
+    ([0, 1], [0, 1], [1.0], None),
+    ([0, 1], [0], [1.0, 2.0], None),
+    ([0, 1, 1], [2], [1.0], None),
+    ([0, 1, 1], [1], [-1.0], None),
+    ([0, 1, 1], [1], [1.0], ['a']),
+])
+def test_invalid_arrays(offsets, targets, weights, values):
+    with pytest.raises(ValueError):
+        csrgraph(offsets, targets, weights, values)
@@ -0,0 +1,140 @@
+import numpy as np
+import pytest
+from vagabond.systems import pathnode
+from vagabond.environmental import gridenv, dijkstra, bfs
+
+def random_grid(seed, side=12, uniform=False):
+    rng = np.random.default_rng(seed)
+    costs = np.ones((side, side)) if uniform else rng.uniform(1, 3, (side, side))
+    costs[rng.random((side, side)) < 0.25] = np.inf
+    return costs
+
+def random_pairs(grid, seed, count=5):
+    rng = np.random.default_rng(seed)
+    free = [tuple(int(i) for i in cell) for cell in np.argwhere(np.isfinite(grid.grid))]
+    return [(free[a], free[b]) for a, b in rng.integers(0, len(free), (count, 2))]
+
+# The cost of the shortest path by dijkstra over the neighbors of the grid, or None
+def reference_cost(grid, start, end):
+    path = dijkstra(grid.neighbors).path(pathnode(value=start), pathnode(value=end))
+    return path[-1].cost if path is not None else None
+
+# The fewest moves from start to end by bfs over the neighbors of the grid, or None
+def reference_hops(grid, start, end):
+    path = bfs(grid.neighbors).path(pathnode(value=start), pathnode(value=end))
+    return len(path) - 1 if path is not None else None
+
+def check_path(grid, path, start, end):
+    assert path[0].value == start and path[-1].value == end
+    for previous, current in zip(path, path[1:]):
+        assert current.parent is previous
+        assert max(abs(current.value[0] - previous.value[0]), abs(current.value[1] - previous.value[1])) == 1
+        assert np.isfinite(grid.grid[current.value])
+
+@pytest.mark.parametrize('connectivity', [4, 8])
+@pytest.mark.parametrize('seed', range(5))
+@pytest.mark.parametrize('algorithm', ['astar', 'dijkstra'])
+def test_costs_match_dijkstra(algorithm, seed, connectivity):
+    grid = gridenv(random_grid(seed), connectivity)
+    for start, end in random_pairs(grid, seed):
+        expected = reference_cost(grid, start, end)
+        path = grid.path(start, end, algorithm)
+        if expected is None:
+            assert path is None
+            continue
+        check_path(grid, path, start, end)
+        assert path[-1].cost == pytest.approx(expected)
+
+@pytest.mark.parametrize('connectivity', [4, 8])
+@pytest.mark.parametrize('seed', range(5))
+def test_bfs_has_the_fewest_moves(seed, connectivity):
+    grid = gridenv(random_grid(seed), connectivity)
+    for start, end in random_pairs(grid, seed):
+        expected = reference_hops(grid, start, end)
+        path = grid.path(start, end, 'bfs')
+        if expected is None:
+            assert path is None
+            continue
+        check_path(grid, path, start, end)
+        assert len(path) - 1 == expected == path[-1].cost
+
+def test_invalid_arguments():
+    with pytest.raises(ValueError):
+        gridenv(np.ones((2, 2, 2)))
+    with pytest.raises(ValueError):
+        gridenv(np.ones((3, 3)), connectivity=6)
+    with pytest.raises(ValueError):
+        gridenv(-np.ones((3, 3)))
+    grid = gridenv(np.ones((3, 3)))
+    with pytest.raises(ValueError):
+        grid.path((0, 0), (3, 0))
+    with pytest.raises(ValueError):
+        grid.path((0, 0), (2, 2), 'greedy')
+
+@pytest.mark.parametrize('algorithm', ['astar', 'dijkstra', 'bfs'])
+def test_path_many_matches_path(algorithm):
+    grid = gridenv(random_grid(3), connectivity=8)
+    pairs = random_pairs(grid, 3, count=10)
+    paths = grid.path_many(pairs, algorithm)
+    cells = grid.path_many(pairs, algorithm, raw=True)
+    for (start, end), path, raw, stats in zip(pairs, paths, cells, grid.stats):
+        single = grid.path(start, end, algorithm)
+        if single is None:
+            assert path is None and raw is None and not stats['found']
+            continue
+        assert [node.value for node in path] == [node.value for node in single]
+        assert raw.dtype == np.int32 and [tuple(cell) for cell in raw.tolist()] == [node.value for node in single]
+        assert stats['cost'] == pytest.approx(single[-1].cost)
+
+@pytest.mark.parametrize('connectivity', [4, 8])
+def test_tree_matches_dijkstra(connectivity):
+    grid = gridenv(random_grid(4), connectivity)
+    root = random_pairs(grid, 4, count=1)[0][0]
+    tree = grid.tree(root)
+    bounded = grid.tree(root, max_cost=6.0)
+    for cell in map(tuple, np.argwhere(np.isfinite(grid.grid)).tolist()):
+        expected = reference_cost(grid, root, cell)
+        if expected is None:
+            assert cell not in tree and tree.path_to(cell) is None
+            continue
+        assert tree.cost_to(cell) == pytest.approx(expected)
+        path = tree.path_to(cell)
+        check_path(grid, path, root, cell)
+        assert path[-1].cost == pytest.approx(expected)
+        if expected < 6.0:
+            assert bounded.cost_to(cell) == pytest.approx(expected)
+
+@pytest.mark.parametrize('connectivity', [4, 8])
+@pytest.mark.parametrize('seed', range(5))
+def test_jps_costs_match_dijkstra(seed, connectivity):
+    grid = gridenv(random_grid(seed, side=16, uniform=True) * 2, connectivity)
+    for start, end in random_pairs(grid, seed, count=8):
+        expected = reference_cost(grid, start, end)
+        path = grid.path(start, end, 'jps')
+        if expected is None:
+            assert path is None
+            continue
+        check_path(grid, path, start, end)
+        assert path[-1].cost == pytest.approx(expected)
+
+def test_jps_needs_uniform_costs():
+    with pytest.raises(ValueError):
+        gridenv(random_grid(0)).path((0, 0), (1, 1), 'jps')
+
+@pytest.mark.parametrize('connectivity', [4, 8])
+@pytest.mark.parametrize('seed', range(3))
+def test_bfs_tree_matches_bfs(seed, connectivity):
+    grid = gridenv(random_grid(seed), connectivity)
+    root = random_pairs(grid, seed, count=1)[0][0]
+    tree = grid.tree(root, algorithm='bfs')
+    bounded = grid.tree(root, max_cost=3, algorithm='bfs')
+    for cell in map(tuple, np.argwhere(np.isfinite(grid.grid)).tolist()):
+        expected = reference_hops(grid, root, cell)
+        if expected is None:
+            assert tree.cost_to(cell) is None and bounded.cost_to(cell) is None
+            continue
+        assert tree.cost_to(cell) == expected
+        path = tree.path_to(cell)
+        check_path(grid, path, root, cell)
+        assert len(path) - 1 == expected
+        assert bounded.cost_to(cell) == (expected if expected <= 3 else None)
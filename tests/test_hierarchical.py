@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+from vagabond.systems import pathnode
+from vagabond.environmental import gridenv, dijkstra
+from vagabond.hierarchical import hpastar
+
+def random_grid(seed, side=16):
+    rng = np.random.default_rng(seed)
+    costs = rng.uniform(1, 3, (side, side))
+    costs[rng.random((side, side)) < 0.2] = np.inf
+    return costs
+
+def reference_cost(grid, start, end):
+    path = dijkstra(grid.neighbors).path(pathnode(value=start), pathnode(value=end))
+    return path[-1].cost if path is not None else None
+
+# Check that a path joins start and end along edges of the grid, with the cost from the start on every node
+def check_path(grid, path, start, end):
+    assert path[0].value == start and path[-1].value == end
+    total = 0.0
+    for previous, current in zip(path, path[1:]):
+        total += next(neighbor.cost for neighbor in grid.neighbors(previous) if neighbor.value == current.value)
+        assert current.cost == pytest.approx(total)
+
+def check_queries(planner, seed):
+    grid = gridenv(planner.grid, planner.environment.connectivity)
+    rng = np.random.default_rng(seed)
+    free = [tuple(int(i) for i in cell) for cell in np.argwhere(np.isfinite(grid.grid))]
+    for a, b in rng.integers(0, len(free), (10, 2)):
+        start, end = free[a], free[b]
+        expected = reference_cost(grid, start, end)
+        path = planner.path(start, end)
+        if expected is None:
+            assert path is None
+            continue
+        check_path(grid, path, start, end)
+        assert path[-1].cost >= expected - 1e-9
+
+@pytest.mark.parametrize('connectivity', [4, 8])
+@pytest.mark.parametrize('seed', range(5))
+def test_paths_are_valid_and_near_optimal(seed, connectivity):
+    check_queries(hpastar(random_grid(seed), connectivity, cluster_size=4), seed)
+
+def test_update_after_changes():
+    planner = hpastar(random_grid(0), 8, cluster_size=4)
+    changed = [(5, 5), (6, 9), (12, 3), (0, 15)]
+    for cell in changed:
+        planner.grid[cell] = np.inf if np.isfinite(planner.grid[cell]) else 1.0
+    planner.update(changed)
+    check_queries(planner, 1)
+
+def test_invalid_cluster_size():
+    with pytest.raises(ValueError):
+        hpastar(np.ones((4, 4)), cluster_size=1)
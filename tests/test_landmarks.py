@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+from vagabond.systems import pathnode
+from vagabond.environmental import gridenv, astar, dijkstra, biastar
+from vagabond.landmarks import landmarks
+
+def random_grid(seed, side=12):
+    rng = np.random.default_rng(seed)
+    costs = rng.uniform(1, 3, (side, side))
+    costs[rng.random((side, side)) < 0.25] = np.inf
+    costs[0, 0] = 1
+    return gridenv(costs, connectivity=8)
+
+@pytest.fixture(scope='module')
+def grid():
+    return random_grid(0)
+
+@pytest.fixture(scope='module')
+def heuristic(grid):
+    return landmarks(grid.neighbors, pathnode(value=(0, 0)), count=4, get_reverse_neighbors_func=grid.reverse_neighbors)
+
+def free_pairs(grid, seed, count=10):
+    rng = np.random.default_rng(seed)
+    free = [tuple(int(i) for i in cell) for cell in np.argwhere(np.isfinite(grid.grid))]
+    return [(free[a], free[b]) for a, b in rng.integers(0, len(free), (count, 2))]
+
+def test_heuristic_is_admissible(grid, heuristic):
+    tree = dijkstra(grid.neighbors).tree(pathnode(value=(0, 0)))
+    for value in heuristic.values:
+        assert heuristic((0, 0), value) <= tree.cost_to(value) + 1e-9
+    assert heuristic((0, 0), (0, 0)) == 0.0
+    assert heuristic((0, 0), (-1, -1)) == 0.0
+
+@pytest.mark.parametrize('seed', range(3))
+def test_searches_match_dijkstra(grid, heuristic, seed):
+    for start, end in free_pairs(grid, seed):
+        expected = dijkstra(grid.neighbors).path(pathnode(value=start), pathnode(value=end))
+        for planner in (astar(grid.neighbors, heuristic=heuristic), biastar(grid.neighbors, heuristic, grid.reverse_neighbors)):
+            path = planner.path(pathnode(value=start), pathnode(value=end))
+            if expected is None:
+                assert path is None
+            else:
+                assert path[-1].cost == pytest.approx(expected[-1].cost)
+
+def test_save_and_load(grid, heuristic, tmp_path):
+    filename = str(tmp_path / 'landmarks.npz')
+    heuristic.save(filename)
+    loaded = landmarks.load(filename)
+    assert loaded.values == heuristic.values and loaded.landmarks == heuristic.landmarks
+    for start, end in free_pairs(grid, 0):
+        assert loaded(start, end) == heuristic(start, end)
+
+def test_invalid_arguments(grid):
+    with pytest.raises(TypeError):
+        landmarks(grid.neighbors, (0, 0))
+    with pytest.raises(ValueError):
+        landmarks(grid.neighbors, pathnode(value=(0, 0)), count=0)
@@ -0,0 +1,67 @@
+import numpy as np
+import pytest
+from vagabond.systems import pathnode
+from vagabond.environmental import gridenv, dijkstra
+from vagabond.graph import csrgraph
+from vagabond.landmarks import landmarks
+from vagabond import mapfile
+
+def random_grid(seed=0, side=10):
+    rng = np.random.default_rng(seed)
+    costs = rng.uniform(1, 3, (side, side))
+    costs[rng.random((side, side)) < 0.2] = np.inf
+    costs[0, 0] = costs[side - 1, side - 1] = 1
+    return gridenv(costs, connectivity=8)
+
+def test_grid_round_trip(tmp_path):
+    grid = random_grid()
+    filename = str(tmp_path / 'grid.map')
+    mapfile.save(filename, grid)
+    loaded = mapfile.load(filename)
+    assert isinstance(loaded, gridenv) and loaded.connectivity == 8
+    assert np.array_equal(loaded.grid, grid.grid)
+    for algorithm in ('astar', 'dijkstra', 'bfs'):
+        path, expected = loaded.path((0, 0), (9, 9), algorithm), grid.path((0, 0), (9, 9), algorithm)
+        assert [node.value for node in path] == [node.value for node in expected]
+
+def test_graph_round_trip(tmp_path):
+    graph = csrgraph.from_edges([((0, 'a'), (1, 'b'), 1.5), ((1, 'b'), (2, 'c'), 2.5), ((0, 'a'), (2, 'c'), 5.0)])
+    filename = str(tmp_path / 'graph.map')
+    mapfile.save(filename, graph)
+    loaded = mapfile.load(filename)
+    assert loaded.values == graph.values
+    assert sorted(loaded.edges()) == sorted(graph.edges())
+    path = dijkstra(loaded).path(pathnode(value=(0, 'a')), pathnode(value=(2, 'c')))
+    assert [node.value for node in path] == [(0, 'a'), (1, 'b'), (2, 'c')] and path[-1].cost == pytest.approx(4.0)
+
+def test_landmarks_round_trip(tmp_path):
+    grid = random_grid()
+    heuristic = landmarks(grid.neighbors, pathnode(value=(0, 0)), count=3)
+    filename = str(tmp_path / 'landmarks.map')
+    mapfile.save(filename, heuristic)
+    loaded = mapfile.load(filename)
+    assert loaded.landmarks == heuristic.landmarks
+    for value in heuristic.values:
+        assert loaded((0, 0), value) == heuristic((0, 0), value)
+
+def test_invalid_files(tmp_path):
+    filename = str(tmp_path / 'grid.map')
+    mapfile.save(filename, random_grid())
+    with pytest.raises(ValueError):
+        mapfile.load(filename, mode='w')
+
+    # A file written by a later format version
+    with open(filename, 'r+b') as file:
+        magic, _, reserved, length = mapfile.PRELUDE.unpack(file.read(mapfile.PRELUDE.size))
+        file.seek(0)
+        file.write(mapfile.PRELUDE.pack(magic, mapfile.VERSION + 1, reserved, length))
+    with pytest.raises(ValueError, match='version'):
+        mapfile.load(filename)
+
+    other = str(tmp_path / 'other.map')
+    with open(other, 'wb') as file:
+        file.write(b'not a map file at all')
+    with pytest.raises(ValueError):
+        mapfile.load(other)
+    with pytest.raises(TypeError):
+        mapfile.save(other, [[1, 2], [3, 4]])
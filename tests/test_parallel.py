@@ -0,0 +1,28 @@
+import numpy as np
+import pytest
+from vagabond.environmental import gridenv
+from vagabond.parallel import gridpool
+
+def test_paths_match_gridenv():
+    rng = np.random.default_rng(0)
+    costs = rng.uniform(1, 3, (16, 16))
+    costs[rng.random((16, 16)) < 0.25] = np.inf
+    grid = gridenv(costs, connectivity=8)
+    free = [tuple(int(i) for i in cell) for cell in np.argwhere(np.isfinite(costs))]
+    pairs = [(free[a], free[b]) for a, b in rng.integers(0, len(free), (12, 2))]
+
+    with gridpool(costs, connectivity=8, processes=2) as pool:
+        for algorithm in ('astar', 'bfs'):
+            paths = pool.path_many(pairs, algorithm, chunksize=5)
+            expected = grid.path_many(pairs, algorithm, raw=True)
+            assert len(paths) == len(pool.stats) == len(pairs)
+            for path, cells, stats, single in zip(paths, expected, pool.stats, grid.stats):
+                if cells is None:
+                    assert path is None
+                else:
+                    assert np.array_equal(path, cells)
+                    assert stats['cost'] == pytest.approx(single['cost'])
+        with pytest.raises(ValueError):
+            pool.path_many(pairs, 'greedy')
+    with pytest.raises(ValueError):
+        pool.path_many(pairs)
@@ -0,0 +1,159 @@
+import numpy as np
+import pytest
+from vagabond.systems import pathnode
+from vagabond.environmental import gridenv, astar, dijkstra, bfs, dfs, biastar, bidijkstra, bibfs, smastar, dstarlite, searchresult
+from vagabond.graph import csrgraph
+
+SIDE = 12
+
+def octile(a, b):
+    dx, dy = abs(a[0] - b[0]), abs(a[1] - b[1])
+    return max(dx, dy) + 0.41421356 * min(dx, dy)
+
+# A random grid with a path between its corners, and a copy with the far corner walled off
+def grids():
+    rng = np.random.default_rng(0)
+    costs = rng.uniform(1, 3, (SIDE, SIDE))
+    costs[rng.random((SIDE, SIDE)) < 0.1] = np.inf
+    costs[0, 0] = costs[SIDE - 1, SIDE - 1] = 1
+    walled = costs.copy()
+    walled[SIDE - 2:, SIDE - 2] = np.inf
+    walled[SIDE - 2, SIDE - 2:] = np.inf
+    walled[SIDE - 1, SIDE - 1] = 1
+    return gridenv(costs, connectivity=8), gridenv(walled, connectivity=8)
+
+# idastar repeats its searches too often for this grid, it is tested on a smaller one
+PLANNERS = {
+    'astar': lambda grid: astar(grid.neighbors, heuristic=octile),
+    'dijkstra': lambda grid: dijkstra(grid.neighbors),
+    'bfs': lambda grid: bfs(grid.neighbors),
+    'dfs': lambda grid: dfs(grid.neighbors),
+    'biastar': lambda grid: biastar(grid.neighbors, octile, grid.reverse_neighbors),
+    'bidijkstra': lambda grid: bidijkstra(grid.neighbors, grid.reverse_neighbors),
+    'bibfs': lambda grid: bibfs(grid.neighbors, grid.reverse_neighbors),
+    'smastar': lambda grid: smastar(grid.neighbors, octile, max_nodes=1000),
+    'dstarlite': lambda grid: dstarlite(grid.neighbors, octile, grid.reverse_neighbors),
+}
+
+# Planners whose costs are the costs from the start along the grid, not hops or queue priorities
+WEIGHTED = ['astar', 'dijkstra', 'biastar', 'bidijkstra', 'smastar', 'dstarlite']
+
+def query():
+    return pathnode(value=(0, 0)), pathnode(value=(SIDE - 1, SIDE - 1))
+
+@pytest.mark.parametrize('name', sorted(PLANNERS))
+def test_statuses(name):
+    grid, walled = grids()
+    expected = dijkstra(grid.neighbors).path(*query())[-1].cost
+
+    result = PLANNERS[name](grid).search(*query())
+    assert isinstance(result, searchresult) and result.status == 'found' and result
+    assert result.path[0].value == (0, 0) and result.path[-1].value == (SIDE - 1, SIDE - 1)
+    if name in WEIGHTED:
+        assert result.cost == pytest.approx(expected)
+
+    result = PLANNERS[name](grid).search(*query(), max_expansions=3)
+    assert result.status == 'budget' and not result and result.path is None and result.cost is None
+    assert result.expansions <= 3
+
+    result = PLANNERS[name](grid).search(*query(), max_time=0)
+    assert result.status == 'budget'
+
+    result = PLANNERS[name](walled).search(*query())
+    assert result.status == 'exhausted' and result.path is None and result.partial is None
+
+@pytest.mark.parametrize('name', ['astar', 'dijkstra', 'bidijkstra'])
+def test_cost_budget(name):
+    grid, _ = grids()
+    expected = dijkstra(grid.neighbors).path(*query())[-1].cost
+    assert PLANNERS[name](grid).search(*query(), max_cost=expected / 3).status == 'budget'
+    assert PLANNERS[name](grid).search(*query(), max_cost=expected + 1e-6).status == 'found'
+
+def test_partial_path_heads_for_the_end():
+    _, walled = grids()
+    result = PLANNERS['astar'](walled).search(*query(), max_expansions=20)
+    assert result.status == 'budget' and result.partial[0].value == (0, 0)
+    result = PLANNERS['dijkstra'](walled).search(*query(), max_expansions=20, heuristic=octile)
+    assert result.partial[0].value == (0, 0) and len(result.partial) > 1
+    assert PLANNERS['dijkstra'](walled).search(*query(), max_expansions=20).partial is None
+
+@pytest.mark.parametrize('algorithm', ['astar', 'dijkstra', 'bfs'])
+def test_gridenv_statuses(algorithm):
+    grid, walled = grids()
+    assert grid.search((0, 0), (SIDE - 1, SIDE - 1), algorithm).status == 'found'
+    assert grid.search((0, 0), (SIDE - 1, SIDE - 1), algorithm, max_expansions=3).status == 'budget'
+    assert walled.search((0, 0), (SIDE - 1, SIDE - 1), algorithm).status == 'exhausted'
+    result = walled.search((0, 0), (SIDE - 1, SIDE - 1), algorithm, max_expansions=20)
+    assert result.status == 'budget' and result.partial[0].value == (0, 0)
+
+@pytest.mark.parametrize('name', sorted(PLANNERS))
+def test_iter_search_matches_search(name):
+    grid, _ = grids()
+    expected = PLANNERS[name](grid).search(*query())
+    planner = PLANNERS[name](grid)
+    items = list(planner.iter_search(*query(), every=5))
+    result = items.pop()
+    assert isinstance(result, searchresult) and result.status == expected.status
+    assert result.cost == expected.cost and result.expansions == expected.expansions
+    assert items and [expansions for expansions, _, _ in items] == list(range(0, 5 * len(items), 5))
+
+def test_iter_search_can_be_closed():
+    grid, _ = grids()
+    planner = PLANNERS['astar'](grid)
+    steps = planner.iter_search(*query())
+    for _ in range(3):
+        expansions, value, cost = next(steps)
+    steps.close()
+    assert planner.limits is None
+    assert planner.search(*query()).status == 'found'
+    with pytest.raises(ValueError):
+        next(planner.iter_search(*query(), every=0))
+
+@pytest.mark.parametrize('algorithm', ['astar', 'dijkstra', 'bfs'])
+def test_gridenv_iter_search(algorithm):
+    grid, _ = grids()
+    expected = grid.search((0, 0), (SIDE - 1, SIDE - 1), algorithm)
+    items = list(grid.iter_search((0, 0), (SIDE - 1, SIDE - 1), algorithm, every=3, max_expansions=expected.expansions))
+    result = items.pop()
+    assert result.status == 'found' and result.cost == pytest.approx(expected.cost)
+    assert all(0 <= row < SIDE and 0 <= column < SIDE for _, (row, column), _ in items)
+    assert [expansions for expansions, _, _ in items] == list(range(0, 3 * len(items), 3))
+
+@pytest.mark.parametrize('name', sorted(PLANNERS))
+def test_instrumented_queries_match(name):
+    grid, _ = grids()
+    expected = PLANNERS[name](grid).search(*query())
+    planner = PLANNERS[name](grid)
+    profiles = []
+    planner.instrument(callback=profiles.append)
+    result = planner.search(*query())
+    assert result.status == expected.status and result.cost == expected.cost and result.expansions == expected.expansions
+
+    profile = planner.profile
+    assert profiles == [profile] and profile.planner == name and profile.found
+    assert profile.expansions == result.expansions == profile.closed + profile.reopens
+    assert profile.neighbor_calls >= profile.closed
+    assert (profile.heuristic_calls > 0) == (name in ('astar', 'biastar', 'smastar', 'dstarlite'))
+    assert set(profile.as_dict()['phases']) == {'neighbors', 'heuristic', 'search'}
+
+    planner.path_many([query(), query()])
+    assert len(profiles) == 3
+    planner.instrument(False)
+    planner.path(*query())
+    assert planner.profile is None and len(profiles) == 3
+
+def test_instrumented_gridenv():
+    grid, _ = grids()
+    expected = grid.search((0, 0), (SIDE - 1, SIDE - 1))
+    grid.instrument()
+    result = grid.search((0, 0), (SIDE - 1, SIDE - 1))
+    assert result.cost == expected.cost and grid.profile.planner == 'gridenv'
+    assert grid.profile.expansions == result.expansions and grid.profile.frontier_peak > 0
+
+def test_instrumented_csrgraph():
+    graph = csrgraph.from_edges([(0, 1, 1.0), (1, 2, 1.0), (0, 2, 3.0)])
+    for planner, peak in ((astar(graph), None), (astar(graph, cache_size=8), 1)):
+        planner.instrument()
+        path = planner.path(pathnode(value=0), pathnode(value=2))
+        assert path[-1].cost == pytest.approx(2.0)
+        assert planner.profile.expansions == 2 and planner.profile.frontier_peak == peak
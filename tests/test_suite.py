@@ -0,0 +1,41 @@
+import os
+import json
+import importlib.util
+import numpy as np
+import pytest
+from vagabond.systems import pathnode
+from vagabond.environmental import gridenv, dijkstra
+
+# The suite is a script in Benchmarks, not a module of the package
+spec = importlib.util.spec_from_file_location('suite', os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'Benchmarks', 'suite.py'))
+suite = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(suite)
+
+def row(planner, status='found', time=1.0, expansions=100, peak_bytes=1 << 20):
+    return {'map': 'random', 'cells': 100, 'planner': planner, 'status': status, 'cost': 1.0,
+            'expansions': expansions, 'time': time, 'peak_bytes': peak_bytes}
+
+def write(path, rows):
+    with open(path, 'w') as file:
+        json.dump({'meta': {'commit': None}, 'results': rows}, file)
+    return str(path)
+
+def test_compare_flags_regressions(tmp_path, capsys):
+    old = write(tmp_path / 'old.json', [row('same'), row('slower'), row('memory'), row('status'), row('budget', 'budget', expansions=1000)])
+    new = write(tmp_path / 'new.json', [row('same', time=1.1), row('slower', time=2.0), row('memory', peak_bytes=4 << 20),
+                                        row('status', 'budget'), row('budget', 'budget', expansions=500), row('added')])
+    assert suite.compare(old, new, 1.25) == 4
+    # The flags of a row follow its memory ratio, the last column ending in 'x'
+    flags = {line.split()[2]: line.rsplit('x', 1)[1].strip() for line in capsys.readouterr().out.splitlines()[2:-1]}
+    assert flags == {'same': '', 'slower': 'slower', 'memory': 'more memory', 'status': 'found -> budget', 'budget': 'slower'}
+    assert suite.compare(old, old, 1.25) == 0
+
+@pytest.mark.parametrize('make', [suite.maze_grid, suite.open_grid, suite.corridor_grid])
+def test_maps_connect_start_and_end(make):
+    costs, start, end = make(21, np.random.default_rng(0))
+    assert gridenv(costs, connectivity=8).path(start, end, 'bfs') is not None
+
+def test_random_graph_reaches_the_last_node():
+    graph, start, end = suite.random_graph(100, np.random.default_rng(0))
+    assert len(graph) == 100 and (start, end) == (0, 99)
+    assert dijkstra(graph).search(pathnode(value=start), pathnode(value=end)).status == 'found'
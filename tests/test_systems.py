@@ -0,0 +1,26 @@
+import pytest
+from vagabond.systems import node, pathnode, frontier
+
+def test_pathnode_cannot_have_children():
+    parent, child = pathnode(value=1), node(value=2)
+    for operation in (lambda: parent + child, lambda: parent - child, lambda: parent.add_child(child), lambda: parent.remove_child(child)):
+        with pytest.raises(TypeError):
+            operation()
+    parent.clear()
+    assert parent.childs == ()
+
+def test_pathnode_can_be_a_child():
+    parent, child = node(value=1), pathnode(value=2)
+    parent.add_child(child)
+    parent.remove_child(child)
+    assert parent.childs == []
+
+def test_frontier_pops_the_lowest_priority():
+    queue = frontier()
+    queue.push('a', 3.0)
+    queue.push('b', 1.0)
+    queue.push('a', 0.5)
+    queue.push('b', 2.0)
+    assert len(queue) == 2
+    assert [queue.pop()[0] for _ in range(2)] == ['a', 'b']
+    assert not queue